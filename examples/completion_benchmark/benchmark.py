@@ -0,0 +1,127 @@
+"""Measure end-to-end shell completion latency for a CLI with 500 options.
+
+Run with `python benchmark.py [ITERATIONS]` from this directory.
+
+- dynamic: A fresh `python cli.py --completion complete` process per completion, as
+  run by the `--completion generate` script on every keypress.
+- static: The `--completion generate-static` bash script, which only calls back into
+  `cli.py` for args with a custom completion function (i.e. `--name`).
+- in-process: A `cappa.parser.complete` call per completion, from an already collected
+  command. This isolates the parser's own share of the latency.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import cappa
+from cappa.output import Output
+from cappa.parser import complete
+
+HERE = Path(__file__).parent
+
+# Each case is the command line up to the cursor.
+CASES = {
+    "subcommands": ["cli", ""],
+    "options (all)": ["cli", "sub-0", "--"],
+    "options (prefix)": ["cli", "sub-0", "--option_0_1"],
+    "choices": ["cli", "sub-0", "--mode", ""],
+    "custom": ["cli", "sub-0", "--name", ""],
+}
+
+
+def measure(fn: Callable[[], object], iterations: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def dynamic(words: list[str]) -> None:
+    env = {
+        **os.environ,
+        "COMPLETION_LINE": " ".join(words),
+        "COMPLETION_LOCATION": str(len(words)),
+    }
+    subprocess.run(  # noqa: S603
+        [sys.executable, str(HERE / "cli.py"), "--completion", "complete"],
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def static(bash: str, script: Path, words: list[str]) -> None:
+    quoted = " ".join(f"'{w}'" for w in words)
+    driver = f"""
+        compopt() {{ :; }}
+        source {script}
+        COMP_WORDS=({quoted})
+        COMP_CWORD={len(words) - 1}
+        _cli_completion cli
+    """
+    env = {**os.environ, "PATH": f"{script.parent}{os.pathsep}{os.environ['PATH']}"}
+    subprocess.run([bash, "-c", driver], env=env, check=True)  # noqa: S603
+
+
+def generate_static(directory: Path) -> Path:
+    # The static script calls back into `cli` (by name) for custom completions.
+    executable = directory / "cli"
+    executable.write_text(f'#!/bin/sh\nexec {sys.executable} {HERE / "cli.py"} "$@"\n')
+    executable.chmod(0o755)
+
+    script = directory / "completion.bash"
+    with script.open("w") as f:
+        subprocess.run(  # noqa: S603
+            [str(executable), "--completion", "generate-static"],
+            env={**os.environ, "SHELL": "bash"},
+            check=True,
+            stdout=f,
+        )
+    return script
+
+
+def main(iterations: int = 10) -> None:
+    sys.path.insert(0, str(HERE))
+    from cli import Cli
+
+    command = cappa.collect(Cli, backend=cappa.backend)
+    output = Output()
+
+    results: dict[str, list[float]] = {}
+    for name, words in CASES.items():
+        results[f"dynamic: {name}"] = measure(lambda: dynamic(words), iterations)
+
+    bash = shutil.which("bash")
+    if bash:
+        with tempfile.TemporaryDirectory() as directory:
+            script = generate_static(Path(directory))
+            for name, words in CASES.items():
+                results[f"static: {name}"] = measure(
+                    lambda: static(bash, script, words), iterations
+                )
+
+    for name, words in CASES.items():
+        results[f"in-process: {name}"] = measure(
+            lambda: complete(command, words[1:], output), iterations
+        )
+
+    for name, timings in results.items():
+        sys.stdout.write(
+            f"{name:<32} mean {statistics.mean(timings) * 1000:8.2f}ms"
+            f"  median {statistics.median(timings) * 1000:8.2f}ms\n"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,64 @@
+"""A CLI with 500 options (across a few subcommands), completed by `benchmark.py`."""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Any, Optional, Union
+
+from typing_extensions import Annotated, Literal
+
+import cappa
+
+OPTIONS = 500
+SUBCOMMANDS = 5
+
+
+def complete_names(partial: str) -> list[cappa.Completion]:
+    names = ["alice", "bob", "carol"]
+    return [cappa.Completion(n) for n in names if n.startswith(partial)]
+
+
+def make_subcommand(index: int) -> type:
+    fields: list[tuple[str, Any, Any]] = [
+        (
+            f"option_{index}_{i}",
+            Annotated[
+                Optional[str],
+                cappa.Arg(long=True, help=f"The **{i}th** option of `sub-{index}`."),
+            ],
+            None,
+        )
+        for i in range(OPTIONS // SUBCOMMANDS)
+    ]
+    fields.append(
+        (
+            "name",
+            Annotated[Optional[str], cappa.Arg(long=True, completion=complete_names)],
+            None,
+        )
+    )
+    fields.append(
+        (
+            "mode",
+            Annotated[Literal["fast", "slow"], cappa.Arg(long=True)],
+            "fast",
+        )
+    )
+    cls: type = dataclasses.make_dataclass(f"Sub{index}", fields)
+    return cappa.command(cls, name=f"sub-{index}")  # pyright: ignore
+
+
+Subcommand = Union[tuple(make_subcommand(i) for i in range(SUBCOMMANDS))]  # type: ignore
+
+
+@dataclasses.dataclass
+class Cli:
+    command: cappa.Subcommands[Subcommand]  # type: ignore
+
+
+def main():
+    cappa.parse(Cli, backend=cappa.backend)
+
+
+if __name__ == "__main__":
+    main()
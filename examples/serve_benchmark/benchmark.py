@@ -0,0 +1,95 @@
+"""Compare per-invocation latency of a cold start, `cappa.serve`, and its fork-server mode.
+
+Run with `python benchmark.py [ITERATIONS]` from this directory.
+
+- cold: A fresh `python cli.py ...` process per invocation.
+- server/fork: A fresh client process per invocation, running the standalone script
+  written by `cappa.serve.write_client` (i.e. including the client's own interpreter
+  startup, but not importing cappa).
+- server/fork (-m cappa.serve): The same, through `python -m cappa.serve`, which first
+  imports cappa (and rich).
+- server/fork (in-process): A `cappa.serve_client.request` call per invocation, from an
+  already running process. This isolates the server-side latency.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+from cappa.serve import write_client
+from cappa.serve_client import request
+
+HERE = Path(__file__).parent
+ARGV = ["greet", "world", "--shout"]
+
+
+def measure(fn: Callable[[], object], iterations: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+@contextlib.contextmanager
+def server(mode: str) -> Iterator[str]:
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, "cli.sock")
+        process = subprocess.Popen(  # noqa: S603
+            [sys.executable, str(HERE / "cli.py"), "--serve", socket_path, mode]
+        )
+        try:
+            while not os.path.exists(socket_path):
+                time.sleep(0.01)
+            yield socket_path
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def run(*command: str) -> None:
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)  # noqa: S603
+
+
+def main(iterations: int = 20) -> None:
+    results: dict[str, list[float]] = {}
+
+    results["cold"] = measure(
+        lambda: run(sys.executable, str(HERE / "cli.py"), *ARGV), iterations
+    )
+
+    with open(os.devnull, "w") as devnull, tempfile.TemporaryDirectory() as directory:
+        for mode in ("inline", "fork"):
+            with server(mode) as socket_path:
+                client = str(write_client(Path(directory) / mode, socket_path))
+                results[f"{mode} server"] = measure(
+                    lambda: run(client, *ARGV), iterations
+                )
+                results[f"{mode} server (-m cappa.serve)"] = measure(
+                    lambda: run(
+                        sys.executable, "-m", "cappa.serve", socket_path, *ARGV
+                    ),
+                    iterations,
+                )
+                results[f"{mode} server (in-process)"] = measure(
+                    lambda: request(socket_path, ARGV, stdout=devnull), iterations
+                )
+
+    for name, timings in results.items():
+        sys.stdout.write(
+            f"{name:<32} mean {statistics.mean(timings) * 1000:8.2f}ms"
+            f"  median {statistics.median(timings) * 1000:8.2f}ms\n"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,48 @@
+"""A small CLI with a non-trivial import cost, served by `benchmark.py`."""
+
+from __future__ import annotations
+
+# Stand-ins for the heavier imports a real CLI tends to accumulate.
+import asyncio  # noqa: F401
+import decimal  # noqa: F401
+import email.mime.multipart  # noqa: F401
+import http.client  # noqa: F401
+import sys
+import xml.etree.ElementTree  # noqa: F401
+from dataclasses import dataclass
+
+from typing_extensions import Annotated
+
+import cappa
+
+
+@dataclass
+class Greet:
+    name: str
+    shout: Annotated[bool, cappa.Arg(long=True)] = False
+
+    def __call__(self, output: cappa.Output):
+        message = f"hello {self.name}"
+        output(message.upper() if self.shout else message)
+
+
+@dataclass
+class Cli:
+    command: cappa.Subcommands[Greet]
+
+
+def main():
+    cappa.invoke(Cli)
+
+
+def serve(socket_path: str, fork: bool):
+    import cappa.serve
+
+    cappa.serve.serve(Cli, socket_path, fork=fork)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        serve(sys.argv[2], fork=sys.argv[3] == "fork")
+    else:
+        main()
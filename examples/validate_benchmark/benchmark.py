@@ -0,0 +1,58 @@
+"""Measure `cappa.validate_many` throughput, in command lines per second.
+
+Run with `python benchmark.py [LINES]` from this directory.
+
+Each command line is 4 tokens (e.x. `add name-1 --count 1`), one in ten of which is
+invalid. Throughput is measured in a single process, and across a pool of `jobs` worker
+processes, for each `jobs` up to the CPU count.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import cappa
+
+HERE = Path(__file__).parent
+
+
+def argvs(lines: int) -> list[list[str]]:
+    result: list[list[str]] = []
+    for i in range(lines):
+        if i % 10 == 9:
+            result.append(["add", f"name-{i}", "--count", "nope"])
+        elif i % 2:
+            result.append(["remove", f"name-{i}", f"other-{i}", "-f"])
+        else:
+            result.append(["add", f"name-{i}", "--count", str(i)])
+    return result
+
+
+def measure(lines: list[list[str]], jobs: int) -> float:
+    from cli import Cli
+
+    start = time.perf_counter()
+    invalid = sum(
+        not result.ok for result in cappa.validate_many(Cli, lines, jobs=jobs)
+    )
+    elapsed = time.perf_counter() - start
+
+    assert invalid == len(lines) // 10
+    return len(lines) / elapsed
+
+
+def main(lines: int = 200_000) -> None:
+    sys.path.insert(0, str(HERE))
+
+    vectors = argvs(lines)
+    cpus = os.cpu_count() or 1
+    for jobs in sorted({1, *range(2, cpus + 1, 2), cpus}):
+        rate = measure(vectors, jobs)
+        sys.stdout.write(f"jobs={jobs:<3} {rate:12,.0f} lines/s\n")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,29 @@
+"""The CLI whose generated command lines are validated by `benchmark.py`."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Union
+
+from typing_extensions import Annotated
+
+import cappa
+
+
+@dataclass
+class Add:
+    name: str
+    count: Annotated[int, cappa.Arg(short=True, long=True)] = 1
+    tags: Annotated[List[str], cappa.Arg(long=True)] = field(default_factory=lambda: [])
+
+
+@dataclass
+class Remove:
+    names: List[str]
+    force: Annotated[bool, cappa.Arg(short=True, long=True)] = False
+
+
+@dataclass
+class Cli:
+    command: cappa.Subcommands[Union[Add, Remove]]
+    verbose: Annotated[int, cappa.Arg(short=True, count=True)] = 0
@@ -1,7 +1,18 @@
 from cappa.base import collect, command, invoke, invoke_async, parse, parse_async
+from cappa.cache import CompletionCache, DiskCache
 from cappa.command import Alias, Command, FinalCommand
 from cappa.completion.types import Completion
-from cappa.default import Confirm, Default, Env, Prompt, ValueFrom
+from cappa.default import (
+    AsyncConfirm,
+    AsyncPrompt,
+    Config,
+    ConfigSource,
+    Confirm,
+    Default,
+    Env,
+    Prompt,
+    ValueFrom,
+)
 from cappa.file_io import FileMode
 from cappa.help import HelpFormattable, HelpFormatter
 from cappa.invoke.types import Dep, Self
@@ -19,16 +30,29 @@ from cappa.destructure import Destructured
 from cappa import argparse
 from cappa.parser import backend
 
+# isort: split
+from cappa.batch import BatchResult, invoke_many
+from cappa.repl import shell
+from cappa.validate import Diagnostic, ValidationResult, validate, validate_many
+
 __all__ = [
     "Alias",
     "Arg",
     "ArgAction",
+    "AsyncConfirm",
+    "AsyncPrompt",
+    "BatchResult",
     "Command",
     "Completion",
+    "CompletionCache",
+    "Config",
+    "ConfigSource",
     "Confirm",
     "Default",
     "Dep",
     "Destructured",
+    "Diagnostic",
+    "DiskCache",
     "Empty",
     "EmptyType",
     "Env",
@@ -48,6 +72,7 @@ __all__ = [
     "State",
     "Subcommand",
     "Subcommands",
+    "ValidationResult",
     "ValueFrom",
     "argparse",
     "backend",
@@ -56,7 +81,11 @@ __all__ = [
     "default_parse",
     "invoke",
     "invoke_async",
+    "invoke_many",
     "parse",
     "parse_async",
+    "shell",
     "unpack_arguments",
+    "validate",
+    "validate_many",
 ]
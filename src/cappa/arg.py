@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import dataclasses
 import enum
+import inspect
 from functools import cached_property
 from typing import (
     TYPE_CHECKING,
     Any,
+    Awaitable,
     Callable,
     Generic,
     Iterable,
@@ -21,10 +23,20 @@ from typing import (
 
 from typing_extensions import TypeAlias
 
+from cappa.cache import CompletionCache
 from cappa.class_inspect import Field, extract_dataclass_metadata
 from cappa.completion.completers import complete_choices
 from cappa.completion.types import Completion
-from cappa.default import Default, DefaultFormatter, ValueFrom
+from cappa.default import (
+    Config,
+    ConfigSource,
+    Default,
+    DefaultFormatter,
+    DefaultSources,
+    Env,
+    LazyDefault,
+    ValueFrom,
+)
 from cappa.invoke.types import Resolved
 from cappa.parse import (
     Parser,
@@ -84,19 +96,23 @@ class ArgAction(enum.Enum):
 
     @classmethod
     def is_non_value_consuming(cls, action: ArgAction | Callable[..., Any] | None):
-        return action in {
-            ArgAction.store_true,
-            ArgAction.store_false,
-            ArgAction.count,
-            ArgAction.version,
-            ArgAction.help,
-        }
+        return action in _non_value_consuming_actions
 
     @property
     def is_bool_action(self):
         return self in {self.store_true, self.store_false}
 
 
+_non_value_consuming_actions = frozenset(
+    {
+        ArgAction.store_true,
+        ArgAction.store_false,
+        ArgAction.count,
+        ArgAction.version,
+        ArgAction.help,
+    }
+)
+
 ArgActionType: TypeAlias = Union[ArgAction, Callable[..., Any]]
 
 
@@ -368,7 +384,10 @@ class Arg(Generic[T]):
             override the default.
         completion: Used to provide custom completions. If specified, should be a function
             which accepts a partial string value and returns a list of
-            [cappa.Completion](cappa.Completion) objects.
+            [cappa.Completion](cappa.Completion) objects. May be an `async` function.
+        completion_cache: Persist the results of the `completion` function across
+            completion requests, for the given number of seconds (or as configured by a
+            [cappa.CompletionCache](cappa.CompletionCache)).
         required: Defaults to automatically inferring requiredness, based on whether the
             class's value has a default. By setting this, you can force a particular value.
         field_name: The name of the class field to populate with this arg. In most usecases,
@@ -385,6 +404,14 @@ class Arg(Generic[T]):
             of an `Arg` for which it is false.
         propagate: Specifies that an argument can be matched to all child. Global arguments only
             propagate down. When used at the top-level, in effect it creates a "global" argument.
+        lazy_default: When `True`, an unsupplied argument's default is not evaluated (nor
+            parsed) until the field is first accessed on the command instance. Any error
+            produced by the default is consequently raised at that point, rather than
+            during parsing. Requires the command to be a (non-slots) dataclass.
+        fanout: When `True` (on a sequence argument), the command is invoked once per
+            value, concurrently, and a `-j/--jobs` option is added to the command to
+            control the concurrency. Each invocation's instance holds a single-element
+            sequence for the field. See [Fanout](./invoke.md#fanout).
     """
 
     def __hash__(self):
@@ -405,12 +432,17 @@ class Arg(Generic[T]):
     action: ArgActionType | None = None
     num_args: int | NumArgs | None = None
     choices: list[str] | None = None
-    completion: Callable[..., list[Completion]] | None = None
+    completion: Callable[..., list[Completion] | Awaitable[list[Completion]]] | None = (
+        None
+    )
+    completion_cache: float | CompletionCache | None = None
     required: bool | None = None
     field_name: str | EmptyType = Empty
     deprecated: bool | str = False
     show_default: bool | str | DefaultFormatter = True
     propagate: bool = False
+    lazy_default: bool = False
+    fanout: bool = False
 
     destructure: Destructure | bool | None = None
     has_value: bool | None = None
@@ -426,6 +458,8 @@ class Arg(Generic[T]):
         default_short: bool = False,
         default_long: bool = False,
         state: State[Any] | None = None,
+        env_prefix: str | None = None,
+        config: ConfigSource | None = None,
     ) -> list[FinalArg[Any] | FinalDestructure[Any]]:
         args: list[Arg[Any]] = find_annotations(type_view, cls) or [Arg()]
 
@@ -463,6 +497,8 @@ class Arg(Generic[T]):
                 state=state,
                 destructure=destructure_annotation,
                 show_default=arg.show_default if i == len(args) else False,
+                env_prefix=env_prefix,
+                config=config,
             )
 
             if normalized_arg.destructure:
@@ -485,6 +521,8 @@ class Arg(Generic[T]):
         state: State[Any] | None = None,
         destructure: Destructure | bool | None = None,
         show_default: bool | str | DefaultFormatter | None = None,
+        env_prefix: str | None = None,
+        config: ConfigSource | None = None,
     ) -> FinalArg[Any]:
         if type_view is None:
             type_view = TypeView(Any)
@@ -502,6 +540,20 @@ class Arg(Generic[T]):
         )
 
         required = infer_required(self.required, num_args, self.num_args, default)
+        default = infer_env_default(
+            default,
+            field_name,
+            env_prefix,
+            action=action,
+            is_option=bool(short or long),
+        )
+        default = infer_config_default(
+            default,
+            field_name,
+            config,
+            action=action,
+            is_option=bool(short or long),
+        )
 
         parse = infer_parse(self, type_view, state=state)
         help = infer_help(self, fallback_help)
@@ -512,6 +564,9 @@ class Arg(Generic[T]):
         value_name = infer_value_name(self, field_name, num_args)
         has_value = infer_has_value(self, action)
 
+        if self.fanout and num_args.n in (0, 1) and action is not ArgAction.append:
+            raise ValueError("`Arg.fanout` requires a sequence argument.")
+
         if self.propagate and not short and not long:
             raise ValueError(
                 "`Arg.propagate` requires a non-positional named option (`short` or `long`)."
@@ -528,6 +583,8 @@ class Arg(Generic[T]):
             type_view,
             default_short=default_short,
             default_long=default_long,
+            env_prefix=env_prefix,
+            config=config,
         )
         result: FinalArg[Any] = FinalArg(
             # preserved from self
@@ -535,6 +592,8 @@ class Arg(Generic[T]):
             hidden=self.hidden,
             deprecated=self.deprecated,
             propagate=self.propagate,
+            lazy_default=self.lazy_default,
+            fanout=self.fanout,
             parse_inference=self.parse_inference,
             # computed/narrowed
             value_name=value_name,
@@ -548,6 +607,7 @@ class Arg(Generic[T]):
             num_args=num_args,
             choices=choices,
             completion=completion,
+            completion_cache=infer_completion_cache(self),
             required=required,
             field_name=field_name,
             show_default=default_formatter,
@@ -588,6 +648,7 @@ class FinalArg(Arg[T]):
     parse: Callable[..., Any] = dataclasses.field(default=parse_value)
     show_default: DefaultFormatter = dataclasses.field(default_factory=DefaultFormatter)
     destructure: FinalDestructure[Any] | None = None
+    completion_cache: CompletionCache | None = None
 
     def map_result(
         self,
@@ -595,14 +656,37 @@ class FinalArg(Arg[T]):
         parsed_args: dict[str, Any],
         state: State[Any] | None = None,
         input: TextIO | None = None,
+        sources: DefaultSources | None = None,
     ) -> Resolved[T]:
         field_name = self.field_name
         if field_name in parsed_args:
             is_parsed, value = False, parsed_args[field_name]
+        elif self.lazy_default:
+
+            def resolve() -> Any:
+                is_parsed, value = self.default(
+                    state=state, input=input, sources=sources
+                )
+                handler = parse_handler(self.parse, prog, value, self.names_str())
+                result = handler(value, is_parsed)
+                if inspect.iscoroutine(result):
+                    for coroutine in (result, value):
+                        if inspect.iscoroutine(coroutine):
+                            coroutine.close()
+                    raise ValueError(
+                        f"`Arg.lazy_default` on `{field_name}` does not support async defaults or parsers."
+                    )
+                return result
+
+            return Resolved(cast(Callable[..., T], LazyDefault), args=(resolve,))
         else:
-            is_parsed, value = self.default(state=state, input=input)
+            is_parsed, value = self.default(state=state, input=input, sources=sources)
         handler = parse_handler(self.parse, prog, value, self.names_str())
-        return Resolved(handler, args=(value, is_parsed))
+
+        # Async values (defaults/parsers) are independent of one another, and so can be
+        # resolved concurrently.
+        concurrent = inspect.iscoroutinefunction(handler)
+        return Resolved(handler, args=(value, is_parsed), concurrent=concurrent)
 
     def names(self, *, n: int = 0) -> list[str]:
         result = (self.short or []) + (self.long or [])
@@ -747,6 +831,67 @@ def infer_required(
     return False
 
 
+def infer_env_default(
+    default: Default,
+    field_name: str,
+    env_prefix: str | None,
+    *,
+    action: ArgActionType,
+    is_option: bool,
+) -> Default:
+    """Prepend a `{env_prefix}{FIELD_NAME}` environment variable to an option's default.
+
+    Options which already explicitly declare an `Env` default are left untouched.
+    """
+    if env_prefix is None or not is_option:
+        return default
+
+    if isinstance(action, ArgAction) and action in ArgAction.meta_actions():
+        return default
+
+    if default.env_vars:
+        return default
+
+    env = Env(f"{env_prefix}{field_name.upper()}")
+    return Default(env).fallback_to(default)
+
+
+def infer_config_default(
+    default: Default,
+    field_name: str,
+    config: ConfigSource | None,
+    *,
+    action: ArgActionType,
+    is_option: bool,
+) -> Default:
+    """Insert a `Config` lookup of `field_name` into an option's default.
+
+    The lookup is placed after any leading `Env` defaults, such that environment
+    variables take precedence over the config file, which in turn takes precedence
+    over any remaining (static, prompt, etc) defaults.
+    """
+    if config is None or not is_option:
+        return default
+
+    if isinstance(action, ArgAction) and action in ArgAction.meta_actions():
+        return default
+
+    if any(isinstance(d, Config) for d in default.sequence):
+        return default
+
+    sequence = default.sequence
+    index = 0
+    while index < len(sequence) and isinstance(sequence[index], Env):
+        index += 1
+
+    return Default(
+        *sequence[:index],
+        config.key(field_name),
+        *sequence[index:],
+        default=default.default,
+    )
+
+
 def infer_short(
     arg: Arg[Any], name: str, default: bool = False
 ) -> list[str] | Literal[False]:
@@ -881,7 +1026,7 @@ def infer_help(arg: Arg[Any], fallback_help: str | None) -> str | None:
 
 def infer_completion(
     arg: Arg[Any], choices: list[str] | None
-) -> Callable[[str], list[Completion]] | None:
+) -> Callable[..., list[Completion] | Awaitable[list[Completion]]] | None:
     if arg.completion:
         return arg.completion
 
@@ -891,6 +1036,13 @@ def infer_completion(
     return None
 
 
+def infer_completion_cache(arg: Arg[Any]) -> CompletionCache | None:
+    if arg.completion_cache is None:
+        return None
+
+    return CompletionCache.coerce(arg.completion_cache)
+
+
 def infer_value_name(arg: Arg[Any], field_name: str, num_args: NumArgs) -> str:
     if arg.value_name is not Empty:
         return arg.value_name
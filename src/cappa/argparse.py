@@ -147,6 +147,11 @@ def backend(
     prog: str,
     provide_completions: bool = False,
 ) -> tuple[Any, Command[T], dict[str, Any]]:
+    if command.chain is not None:
+        raise ValueError(
+            "`Command.chain` is only supported by the native cappa parser."
+        )
+
     parser = create_parser(command, output=output, prog=prog)
 
     try:
@@ -184,7 +189,7 @@ def create_parser(
         output=output,
         prog=prog,
         description=join_help(command.help, command.description),
-        allow_abbrev=False,
+        allow_abbrev=command.allow_abbrev,
         add_help=False,
         **kwargs,
     )
@@ -259,8 +264,11 @@ def add_argument(
         "default": argparse.SUPPRESS,
     }
 
-    if not is_positional and arg.required and arg.num_args.n >= 0:
-        kwargs["required"] = arg.required
+    # Required options can still be fulfilled by an environment variable or config file,
+    # which is checked once their defaults are evaluated (see `FinalCommand.map_result`).
+    is_required = arg.required and not arg.default.has_external_source
+    if not is_positional and is_required and arg.num_args.n >= 0:
+        kwargs["required"] = is_required
 
     is_optional_value = not is_positional and not arg.num_args.required
 
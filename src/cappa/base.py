@@ -3,10 +3,14 @@ from __future__ import annotations
 import contextlib
 import dataclasses
 import inspect
+import sys
 from typing import (
     TYPE_CHECKING,
     Any,
+    AsyncGenerator,
+    Coroutine,
     Hashable,
+    Sequence,
     TextIO,
     cast,
     overload,
@@ -18,11 +22,15 @@ from typing_extensions import dataclass_transform
 from cappa import argparse, parser
 from cappa.class_inspect import detect
 from cappa.command import Alias, Command, FinalCommand
+from cappa.default import ConfigSource
+from cappa.fanout import Fanout
 from cappa.help import HelpFormattable, HelpFormatter
 from cappa.invoke.base import resolve_callable
-from cappa.invoke.types import DepTypes, InvokeCallableSpec
-from cappa.output import Output
+from cappa.invoke.executor import Executors, ExecutorType
+from cappa.invoke.types import DepTypes, InvokeCallableSpec, Resolved
+from cappa.output import Exit, Output
 from cappa.state import S, State
+from cappa.type_view import Empty
 from cappa.types import Backend, CappaCapable, FuncOrClassDecorator, ParseResult, T, U
 
 if TYPE_CHECKING:
@@ -91,7 +99,7 @@ def create_completion_arg(
     if isinstance(completion, bool):
         completion = Arg(
             long=["--completion"],
-            choices=["generate", "complete"],
+            choices=["generate", "generate-static", "complete"],
             group=Group(2, "Help", section=2),
             help="Use `--completion generate` to print shell-specific completion source.",
             action=ArgAction.completion,
@@ -104,6 +112,23 @@ def create_completion_arg(
     )
 
 
+def create_jobs_arg() -> FinalArg[int]:
+    from cappa.arg import Arg, Group
+    from cappa.fanout import jobs_field_name, parse_jobs
+    from cappa.type_view import TypeView
+
+    jobs: Arg[int] = Arg(
+        value_name="JOBS",
+        short=["-j"],
+        long=["--jobs"],
+        default=1,
+        parse=parse_jobs,
+        help="The number of values to process concurrently (0 for one per CPU).",
+        group=Group(3, "Help", section=2),
+    )
+    return jobs.normalize(type_view=TypeView(int), field_name=jobs_field_name)
+
+
 def parse(
     obj: CappaCapable[T],
     *,
@@ -319,32 +344,97 @@ def invoke(
         help_formatter=help_formatter,
         state=state,
     )
+    return invoke_parse_result(parse_result, deps=deps, exit_stack=exit_stack)
 
-    def _invoke_with_stack(stack: contextlib.ExitStack):
-        instance = stack.enter_context(
-            parse_result.instance.get(output=parse_result.output)
-        )
+
+def invoke_parse_result(
+    parse_result: ParseResult[Any, Any],
+    *,
+    deps: DepTypes = None,
+    exit_stack: contextlib.ExitStack | None = None,
+    shared_deps: dict[Hashable, Any] | None = None,
+    shared_stack: contextlib.ExitStack | None = None,
+) -> Any:
+    """Invoke the command selected by an already parsed `ParseResult`.
+
+    This is the second half of `invoke`, split out so that callers which have already
+    collected and parsed a command (e.x. `cappa.serve`) can invoke it directly.
+
+    `shared_deps` and `shared_stack` allow many invocations (e.x. the lines of a
+    `cappa.shell` session) to share `Dep` values: `shared_deps` seeds (and is updated
+    with) the `Dep`s resolved by each invocation, whose contexts are entered on
+    `shared_stack`, rather than being torn down with the invocation (see
+    `retain_shared_deps`).
+    """
+
+    def _invoke_link(
+        link: ParseResult[Any, Any],
+        stack: contextlib.ExitStack,
+        deps: DepTypes,
+        shared_deps: dict[Hashable, Any],
+    ):
+        instance = stack.enter_context(link.instance.get(output=link.output))
 
         # Resolve all implicit deps
         resolved_implicit_deps: dict[Hashable, Any] = {}
-        for key, resolved_dep in parse_result.implicit_deps.items():
+        for key, resolved_dep in link.implicit_deps.items():
             resolved_implicit_deps[key] = stack.enter_context(
-                resolved_dep.get(output=parse_result.output)
+                resolved_dep.get(output=link.output)
             )
 
         resolved, global_deps = resolve_callable(
-            parse_result.root_command,
-            parse_result.parsed_command,
+            link.root_command,
+            link.parsed_command,
             instance,
             implicit_deps=resolved_implicit_deps,
-            output=parse_result.output,
-            state=parse_result.state,
+            output=link.output,
+            state=link.state,
             deps=deps,
+            shared_deps=shared_deps,
         )
+        if shared_stack is not None:
+            retain_shared_deps(shared_deps, shared_stack, link.output)
+
         for dep in global_deps:
-            stack.enter_context(dep.get(output=parse_result.output))
+            stack.enter_context(dep.get(output=link.output))
+
+        fanout = get_fanout(link, resolved_implicit_deps)
+        if fanout:
+            # Each value is invoked independently, sharing only the already constructed
+            # (i.e. global) deps.
+            constructed_deps = get_constructed_deps(shared_deps)
+
+            def _invoke_value(value_instance: Resolved[Any]) -> Any:
+                with contextlib.ExitStack() as value_stack:
+                    instance = value_stack.enter_context(
+                        value_instance.get(output=link.output)
+                    )
+                    resolved, _ = resolve_callable(
+                        link.root_command,
+                        link.parsed_command,
+                        instance,
+                        implicit_deps={
+                            **resolved_implicit_deps,
+                            cast(Hashable, fanout.cmd_cls): instance,
+                        },
+                        output=link.output,
+                        state=link.state,
+                        shared_deps=dict(constructed_deps),
+                    )
+                    return value_stack.enter_context(resolved.get(output=link.output))
+
+            return fanout.run(_invoke_value, link.output)
+
+        return stack.enter_context(resolved.get(output=link.output))
 
-        return stack.enter_context(resolved.get(output=parse_result.output))
+    def _invoke_with_stack(stack: contextlib.ExitStack):
+        # Each link of a chained command line (see `Command.chain`) is invoked in turn,
+        # resolving global deps only once, and sharing resolved deps between links.
+        shared: dict[Hashable, Any] = {} if shared_deps is None else shared_deps
+        result = _invoke_link(parse_result, stack, deps, shared)
+        for link in parse_result.chain:
+            result = _invoke_link(link, stack, None, shared)
+        return result
 
     if exit_stack is not None:
         return _invoke_with_stack(exit_stack)
@@ -369,6 +459,9 @@ async def invoke_async(
     help_formatter: HelpFormattable | None = None,
     state: State[Any] | None = None,
     exit_stack: contextlib.AsyncExitStack | None = None,
+    executor: ExecutorType | None = None,
+    timeout: float | None = None,
+    teardown_timeout: float | None = None,
 ) -> Any:
     """Parse the command, and invoke the selected command or subcommand.
 
@@ -405,6 +498,17 @@ async def invoke_async(
         exit_stack: Optional AsyncExitStack to use for managing async context managers.
             If provided, the caller is responsible for closing the stack, allowing context to
             exceed the function call. If not provided, a new stack is created and automatically closed.
+        executor: Run every sync dependency and `invoke` function on a `"thread"` or
+            `"process"` pool executor, rather than blocking the event loop. Individual
+            `Dep(..., executor=...)` and `Command.executor` settings take precedence.
+        timeout: The number of seconds after which the command (and any pending
+            dependency resolution) is cancelled, exiting with `timeout_exit_code`. The
+            smallest of this and the invoked commands' `Command.timeout` applies.
+        teardown_timeout: The number of seconds allotted to exiting the contexts of
+            dependencies (separately to `timeout`), after which the teardown is
+            cancelled. This applies both to the contexts unwound as the command is
+            cancelled by `timeout`, and to the final teardown of the `exit_stack` (when
+            managed by cappa).
     """
     parse_result = parse_command(
         obj=obj,
@@ -421,39 +525,238 @@ async def invoke_async(
         state=state,
     )
 
-    async def _invoke_async_with_stack(stack: contextlib.AsyncExitStack):
+    async def _invoke_async_link(
+        link: ParseResult[Any, Any],
+        stack: contextlib.AsyncExitStack,
+        deps: DepTypes,
+        shared_deps: dict[Hashable, Any],
+    ):
         instance = await stack.enter_async_context(
-            parse_result.instance.get_async(output=parse_result.output)
+            link.instance.get_async(output=link.output)
         )
 
         # Resolve all implicit deps
         resolved_implicit_deps: dict[Hashable, Any] = {}
-        for key, resolved_dep in parse_result.implicit_deps.items():
+        for key, resolved_dep in link.implicit_deps.items():
             resolved_implicit_deps[key] = await stack.enter_async_context(
-                resolved_dep.get_async(output=parse_result.output)
+                resolved_dep.get_async(output=link.output)
             )
 
         resolved, global_deps = resolve_callable(
-            parse_result.root_command,
-            parse_result.parsed_command,
+            link.root_command,
+            link.parsed_command,
             instance,
             implicit_deps=resolved_implicit_deps,
-            output=parse_result.output,
-            state=parse_result.state,
+            output=link.output,
+            state=link.state,
             deps=deps,
+            shared_deps=shared_deps,
         )
         for dep in global_deps:
-            await stack.enter_async_context(dep.get_async(output=parse_result.output))
+            await stack.enter_async_context(
+                dep.get_async(output=link.output, executors=executors)
+            )
+
+        fanout = get_fanout(link, resolved_implicit_deps)
+        if fanout:
+            constructed_deps = get_constructed_deps(shared_deps)
+
+            async def _invoke_value(value_instance: Resolved[Any]) -> Any:
+                async with contextlib.AsyncExitStack() as value_stack:
+                    instance = await value_stack.enter_async_context(
+                        value_instance.get_async(output=link.output)
+                    )
+                    resolved, _ = resolve_callable(
+                        link.root_command,
+                        link.parsed_command,
+                        instance,
+                        implicit_deps={
+                            **resolved_implicit_deps,
+                            cast(Hashable, fanout.cmd_cls): instance,
+                        },
+                        output=link.output,
+                        state=link.state,
+                        shared_deps=dict(constructed_deps),
+                    )
+                    return await value_stack.enter_async_context(
+                        resolved.get_async(output=link.output, executors=executors)
+                    )
+
+            return await fanout.run_async(_invoke_value, link.output)
 
         return await stack.enter_async_context(
-            resolved.get_async(output=parse_result.output)
+            resolved.get_async(output=link.output, executors=executors)
         )
 
+    # Offloaded callables share (lazily created) pools for the whole invocation.
+    executors = Executors(default=executor)
+
+    async def _invoke_async_with_stack(stack: contextlib.AsyncExitStack):
+        # Registered first, such that the pools outlive any context entered on them.
+        stack.callback(executors.shutdown)
+
+        shared_deps: dict[Hashable, Any] = {}
+        result = await _invoke_async_link(parse_result, stack, deps, shared_deps)
+        for link in parse_result.chain:
+            result = await _invoke_async_link(link, stack, None, shared_deps)
+        return result
+
+    budget = resolve_timeout(parse_result, timeout)
+    output = parse_result.output
+
     if exit_stack is not None:
-        return await _invoke_async_with_stack(exit_stack)
+        return await run_with_timeout(
+            _invoke_async_with_stack(exit_stack),
+            budget,
+            output,
+            grace=teardown_timeout,
+        )
+
+    async with exit_stack_with_timeout(teardown_timeout, output) as stack:
+        return await run_with_timeout(
+            _invoke_async_with_stack(stack), budget, output, grace=teardown_timeout
+        )
+
+
+timeout_exit_code = 124
+"""The exit code of an `invoke_async` which exceeded its `timeout`.
+
+Matches the exit code of the coreutils `timeout` command.
+"""
+
+
+def resolve_timeout(
+    parse_result: ParseResult[Any, Any], timeout: float | None = None
+) -> float | None:
+    """Return the smallest timeout of `timeout`, and any invoked command's own."""
+    timeouts = [timeout]
+    for link in (parse_result, *parse_result.chain):
+        timeouts.extend((link.root_command.timeout, link.parsed_command.timeout))
 
-    async with contextlib.AsyncExitStack() as stack:
-        return await _invoke_async_with_stack(stack)
+    return min((t for t in timeouts if t is not None), default=None)
+
+
+async def run_with_timeout(
+    coroutine: Coroutine[Any, Any, T],
+    timeout: float | None,
+    output: Output,
+    name: str = "Command",
+    grace: float | None = None,
+) -> T:
+    """Await `coroutine`, cancelling it and raising an `Exit` after `timeout` seconds.
+
+    The deadline is scheduled on the event loop's own clock (`loop.time()`), and only
+    cancels `coroutine` itself, such that a `TimeoutError` or cancellation raised by
+    the command is never mistaken for the timeout.
+
+    Once cancelled, `coroutine` is given `grace` seconds to unwind (e.x. exiting the
+    contexts of dependencies it was resolving) before being cancelled once more.
+    """
+    if timeout is None:
+        return await coroutine
+
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    task = loop.create_task(coroutine)
+
+    timed_out = False
+    handles: list[asyncio.TimerHandle] = []
+
+    def cancel():
+        nonlocal timed_out
+        timed_out = True
+        task.cancel()
+
+        if grace is not None:
+            handles.append(loop.call_later(grace, task.cancel))
+
+    handles.append(loop.call_later(timeout, cancel))
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if not timed_out:
+            raise
+
+        with Resolved.handle_exit(output):
+            raise Exit(f"{name} timed out after {timeout:g}s.", code=timeout_exit_code)
+    finally:
+        for handle in handles:
+            handle.cancel()
+
+
+@contextlib.asynccontextmanager
+async def exit_stack_with_timeout(
+    timeout: float | None, output: Output
+) -> AsyncGenerator[contextlib.AsyncExitStack, None]:
+    """Produce an `AsyncExitStack`, whose teardown is bounded by `timeout` seconds."""
+    stack = contextlib.AsyncExitStack()
+    try:
+        yield stack
+    except BaseException as e:
+        teardown = stack.__aexit__(type(e), e, e.__traceback__)
+        if not await run_with_timeout(teardown, timeout, output, name="Teardown"):
+            raise
+    else:
+        teardown = stack.__aexit__(None, None, None)
+        await run_with_timeout(teardown, timeout, output, name="Teardown")
+
+
+def get_fanout(
+    link: ParseResult[Any, Any], implicit_deps: dict[Hashable, Any]
+) -> Fanout | None:
+    """Return the `Fanout` of the invoked command, if it has an `Arg(fanout=True)`."""
+    fanout = implicit_deps.get(Fanout)
+    if isinstance(fanout, Fanout) and fanout.cmd_cls is link.parsed_command.cmd_cls:
+        return fanout
+    return None
+
+
+def retain_shared_deps(
+    shared_deps: dict[Hashable, Any], stack: contextlib.ExitStack, output: Output
+) -> None:
+    """Construct the not yet constructed `shared_deps`, entering their contexts on `stack`.
+
+    Deps which depend upon the values of a specific invocation (e.x. the command
+    instance, or its `State`) are instead dropped from `shared_deps`, such that each
+    invocation resolves them anew.
+    """
+    for key, value in list(shared_deps.items()):
+        if not isinstance(value, Resolved):
+            continue
+
+        resolved = cast(Resolved[Any], value)
+        if resolved.result is not Empty:
+            continue
+
+        if is_invocation_independent(resolved, output):
+            stack.enter_context(resolved.get(output=output))
+        else:
+            del shared_deps[key]
+
+
+def is_invocation_independent(value: Any, output: Output) -> bool:
+    """Whether `value` is, or is only produced from, values shared by all invocations."""
+    if not isinstance(value, Resolved):
+        return value is output
+
+    resolved = cast(Resolved[Any], value)
+    if resolved.result is not Empty:
+        return True
+
+    return all(
+        is_invocation_independent(v, output)
+        for v in (*resolved.args, *resolved.kwargs.values())
+    )
+
+
+def get_constructed_deps(deps: dict[Hashable, Any]) -> dict[Hashable, Any]:
+    return {
+        key: value
+        for key, value in deps.items()
+        if isinstance(value, Resolved)
+        and cast(Resolved[Any], value).result is not Empty
+    }
 
 
 def parse_command(
@@ -471,10 +774,28 @@ def parse_command(
     help_formatter: HelpFormattable | None = None,
     state: State[S] | None = None,
 ) -> ParseResult[T, S]:
-    concrete_backend = _coalesce_backend(backend)
-    concrete_output = _coalesce_output(output, theme, color)
+    concrete_backend = coalesce_backend(backend)
+    concrete_output = coalesce_output(output, theme, color)
     concrete_state: State[S] = State.ensure(state)  # type: ignore
 
+    # Meta actions (e.x. `--help`) only need the commands along the path they target, so
+    # the command is collected lazily for them (and not at all for a leading `--version`).
+    lazy = False
+    if concrete_backend is parser.backend:  # pyright: ignore
+        version_arg = create_version_arg(version)
+        meta_action = find_meta_action(
+            sys.argv[1:] if argv is None else argv,
+            create_help_arg(help),
+            version_arg,
+            create_completion_arg(completion),
+        )
+        if meta_action:
+            index, meta_arg = meta_action
+            if index == 0 and meta_arg is version_arg:
+                # Returns, rather than exiting, if the command must be collected after all.
+                exit_with_version(obj, meta_arg, concrete_output, help_formatter)
+            lazy = True
+
     command: FinalCommand[T] = collect(
         obj,
         help=help,
@@ -483,6 +804,7 @@ def parse_command(
         backend=concrete_backend,
         help_formatter=help_formatter,
         state=concrete_state,
+        lazy=lazy,
     )
     return command.parse_command(
         argv=argv,
@@ -507,6 +829,14 @@ def command(
     default_short: bool = False,
     default_long: bool = False,
     deprecated: bool = False,
+    env_prefix: str | None = None,
+    config: ConfigSource | None = None,
+    chain: str | None = None,
+    preload: list[str] | None = None,
+    executor: ExecutorType | None = None,
+    timeout: float | None = None,
+    completion_timeout: float | None = None,
+    allow_abbrev: bool = False,
     help_formatter: HelpFormattable = HelpFormatter.default,
 ) -> type[T]: ...
 @overload
@@ -522,6 +852,14 @@ def command(
     default_short: bool = False,
     default_long: bool = False,
     deprecated: bool = False,
+    env_prefix: str | None = None,
+    config: ConfigSource | None = None,
+    chain: str | None = None,
+    preload: list[str] | None = None,
+    executor: ExecutorType | None = None,
+    timeout: float | None = None,
+    completion_timeout: float | None = None,
+    allow_abbrev: bool = False,
     help_formatter: HelpFormattable = HelpFormatter.default,
 ) -> FuncOrClassDecorator: ...
 @overload
@@ -538,6 +876,14 @@ def command(
     default_short: bool = False,
     default_long: bool = False,
     deprecated: bool = False,
+    env_prefix: str | None = None,
+    config: ConfigSource | None = None,
+    chain: str | None = None,
+    preload: list[str] | None = None,
+    executor: ExecutorType | None = None,
+    timeout: float | None = None,
+    completion_timeout: float | None = None,
+    allow_abbrev: bool = False,
     help_formatter: HelpFormattable = HelpFormatter.default,
 ) -> T: ...
 
@@ -556,6 +902,14 @@ def command(
     default_short: bool = False,
     default_long: bool = False,
     deprecated: bool = False,
+    env_prefix: str | None = None,
+    config: ConfigSource | None = None,
+    chain: str | None = None,
+    preload: list[str] | None = None,
+    executor: ExecutorType | None = None,
+    timeout: float | None = None,
+    completion_timeout: float | None = None,
+    allow_abbrev: bool = False,
     help_formatter: HelpFormattable = HelpFormatter.default,
 ) -> type[T] | T | FuncOrClassDecorator:
     """Register a cappa CLI command/subcomment.
@@ -587,6 +941,25 @@ def command(
         deprecated: If supplied, the argument will be marked as deprecated. If given `True`,
             a default message will be generated, otherwise a supplied string will be
             used as the deprecation message.
+        env_prefix: If supplied, all options will be treated as though annotated with
+            `Arg(default=Env(f"{env_prefix}{FIELD_NAME}"))`, unless they already declare
+            an `Env` default. Subcommands inherit the prefix unless they set their own.
+        config: If supplied, a `ConfigSource` file from which all options fall back to
+            reading their values (keyed by field name), after any `Env` default but before
+            any other default. Subcommands inherit the source unless they set their own.
+        chain: If supplied, the separator (e.x. `"+"`) at which the command line is split
+            into a chain of subcommand invocations, e.x. `tool fetch a + publish b`.
+            Only supported by the native cappa parser.
+        preload: Modules to import on a background thread as soon as the command is
+            selected by the native cappa parser.
+        executor: Under `invoke_async`, run a sync `invoke` function on a `"thread"` or
+            `"process"` pool executor, rather than blocking the event loop.
+        timeout: Under `invoke_async`, the number of seconds after which the command is
+            cancelled, exiting with a distinct exit code (124).
+        completion_timeout: The number of seconds allotted to `Arg.completion` functions,
+            after which whatever completions are ready are returned.
+        allow_abbrev: Accept any unambiguous prefix of the command's long options and
+            subcommand names (e.x. `--verb` for `--verbose`).
         help_formatter: Override the default help formatter.
     """
 
@@ -607,6 +980,14 @@ def command(
             default_short=default_short,
             default_long=default_long,
             deprecated=deprecated,
+            env_prefix=env_prefix,
+            config=config,
+            chain=chain,
+            preload=list(preload) if preload is not None else command.preload,
+            executor=executor,
+            timeout=timeout,
+            completion_timeout=completion_timeout,
+            allow_abbrev=allow_abbrev,
             help_formatter=help_formatter,
         )
         _decorated_cls.__cappa__ = instance  # type: ignore
@@ -634,6 +1015,7 @@ def collect(
     completion: bool | Arg[bool] = True,
     help_formatter: HelpFormattable | None = None,
     state: State[Any] | None = None,
+    lazy: bool = False,
 ) -> FinalCommand[T]:
     """Retrieve the `Command` object from a cappa-capable source class.
 
@@ -653,33 +1035,84 @@ def collect(
         color: Whether to output in color.
         help_formatter: Override the default help formatter.
         state: Optional initial State object.
+        lazy: Collect each subcommand upon first use, rather than collecting the whole
+            command tree up front. Note that errors in a subcommand's definition are
+            then only raised once that subcommand is used.
     """
     state = State.ensure(state)  # pyright: ignore
 
     command: FinalCommand[T] = Command.get(  # pyright: ignore
         obj, help_formatter=help_formatter
-    ).collect(state=state)
+    ).collect(state=state, lazy=lazy)
 
-    concrete_backend = _coalesce_backend(backend)
+    concrete_backend = coalesce_backend(backend)
     if concrete_backend is argparse.backend:  # pyright: ignore
         completion = False
 
     help_arg = create_help_arg(help)
     version_arg = create_version_arg(version)
     completion_arg = create_completion_arg(completion)
+    jobs_arg = create_jobs_arg()
 
     return command.add_meta_actions(
-        help=help_arg, version=version_arg, completion=completion_arg
+        help=help_arg, version=version_arg, completion=completion_arg, jobs=jobs_arg
+    )
+
+
+def find_meta_action(
+    argv: Sequence[str], *meta_args: FinalArg[Any] | None
+) -> tuple[int, FinalArg[Any]] | None:
+    """Find the first item of `argv` (before any `--`) naming one of `meta_args`.
+
+    This scans the raw `argv`, before the command is collected, so it may also match
+    e.x. an option's value which happens to look like `--help`. Only how much of the
+    command is collected depends upon it; the parse itself is unaffected.
+    """
+    names = {name: arg for arg in meta_args if arg for name in arg.names()}
+    for index, item in enumerate(argv):
+        if item == "--":
+            break
+
+        arg = names.get(item.split("=", 1)[0])
+        if arg:
+            return index, arg
+    return None
+
+
+def exit_with_version(
+    obj: CappaCapable[Any],
+    version: FinalArg[Any],
+    output: Output,
+    help_formatter: HelpFormattable | None = None,
+) -> None:
+    """Exit with the version, as `argv[0]` would, without collecting the command.
+
+    The version is the first item the parser would consume, so nothing else about the
+    command can affect the outcome, unless the version's names collide with the
+    command's own (top-level) options. Then (as when a custom output format renders the
+    help), this returns without exiting, leaving the command to be collected as normal.
+    """
+    if output.exit_fields(0) & {"help", "short_help"}:
+        return
+
+    command: Command[Any] = Command.get(  # pyright: ignore
+        obj, help_formatter=help_formatter
     )
+    if set(version.names()) & command.option_names():
+        return
+
+    exc = Exit(version.value_name, code=0, prog=command.real_name())
+    output.exit(exc)
+    raise exc
 
 
-def _coalesce_backend(backend: Backend | None = None) -> Backend:
+def coalesce_backend(backend: Backend | None = None) -> Backend:
     if backend is None:  # pragma: no cover
         return parser.backend
     return backend
 
 
-def _coalesce_output(
+def coalesce_output(
     output: Output | None = None, theme: Theme | None = None, color: bool = True
 ):
     if output is None:
@@ -0,0 +1,220 @@
+"""Invoke a single collected command against many argv vectors."""
+
+from __future__ import annotations
+
+import contextlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence
+
+from rich.theme import Theme
+
+from cappa.base import coalesce_backend, coalesce_output, collect, invoke_parse_result
+from cappa.command import FinalCommand
+from cappa.help import HelpFormattable
+from cappa.invoke.base import resolve_session_deps
+from cappa.invoke.types import DepTypes, InvokeCallableSpec
+from cappa.output import Output
+from cappa.state import State
+from cappa.types import Backend, CappaCapable, ParseResult
+
+if TYPE_CHECKING:
+    from cappa.arg import Arg
+
+__all__ = [
+    "BatchResult",
+    "invoke_many",
+]
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """The outcome of invoking a single argv vector with `invoke_many`.
+
+    Arguments:
+        argv: The argv vector which was invoked.
+        value: The return value of the invoked command, if it did not exit.
+        code: The exit code, `0` unless the command exited with a non-zero code.
+        exit: The `Exit` (or `SystemExit`) raised while parsing or invoking, if any.
+    """
+
+    argv: list[str]
+    value: Any = None
+    code: int = 0
+    exit: SystemExit | None = None
+
+
+@dataclass
+class _Runner:
+    command: FinalCommand[Any]
+    backend: Backend
+    output: Output
+    deps: dict[InvokeCallableSpec[Any], Any] = field(default_factory=lambda: {})
+
+    def run(self, argv: Sequence[str]) -> BatchResult:
+        argv = list(argv)
+        try:
+            parse_result: ParseResult[Any, Any] = self.command.parse_command(
+                argv=argv, backend=self.backend, output=self.output, state=State()
+            )
+            value = invoke_parse_result(parse_result, deps=self.deps)
+        except SystemExit as e:
+            return BatchResult(argv, code=_exit_code(e), exit=e)
+        return BatchResult(argv, value=value)
+
+
+def invoke_many(
+    obj: CappaCapable[Any],
+    argvs: Iterable[Sequence[str]],
+    *,
+    deps: DepTypes = None,
+    jobs: int = 1,
+    chunksize: int = 1,
+    backend: Backend | None = None,
+    color: bool = True,
+    version: str | Arg[str] | None = None,
+    help: bool | Arg[bool] = True,
+    completion: bool | Arg[bool] = True,
+    theme: Theme | None = None,
+    output: Output | None = None,
+    help_formatter: HelpFormattable | None = None,
+) -> Iterator[BatchResult]:
+    """Invoke `obj` once per argv vector in `argvs`, yielding a `BatchResult` for each.
+
+    The command is collected once, and `deps` are resolved once and shared by every
+    invocation (as with `cappa.shell`). An `Exit` raised by any single invocation is
+    captured on its `BatchResult`, rather than ending the batch.
+
+    Results are yielded in the same order as `argvs`, which is consumed lazily, such that
+    arbitrarily long streams of argv vectors can be processed.
+
+    Arguments:
+        obj: A class which can represent a CLI command chain.
+        argvs: The argv vectors to invoke, each excluding the program name.
+        deps: Optional extra dependencies, as with `invoke`. These are resolved once (per
+            worker process, when `jobs > 1`).
+        jobs: When greater than 1, invocations are spread across a pool of `jobs` worker
+            processes, each of which collects its own copy of the command. In that case,
+            the `obj`, `deps` and command return values must be picklable.
+        chunksize: The number of argv vectors sent to a worker process at a time.
+        backend: A function used to perform the underlying parsing and return a raw
+            parsed state. This defaults to the native cappa parser.
+        color: Whether to output in color.
+        version: If a string is supplied, adds a -v/--version flag which returns the
+            given string as the version.
+        help: If `True` (default to True), adds a -h/--help flag.
+        completion: Enables completion when using the cappa `backend` option.
+        theme: Optional rich theme to customized output formatting.
+        output: Optional `Output` instance.
+        help_formatter: Override the default help formatter.
+
+    Examples:
+        >>> import cappa
+        >>> def main(lines):
+        ...     for result in cappa.invoke_many(MyCli, lines, jobs=4):  # doctest: +SKIP
+        ...         print(result.argv, result.code)
+    """
+    options = (
+        obj,
+        deps,
+        backend,
+        color,
+        version,
+        help,
+        completion,
+        theme,
+        output,
+        help_formatter,
+    )
+
+    if jobs <= 1:
+        with contextlib.ExitStack() as stack:
+            runner = _create_runner(stack, *options)
+            for argv in argvs:
+                yield runner.run(argv)
+        return
+
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    # Bound the number of outstanding chunks, so `argvs` is consumed only as results are
+    # consumed, while keeping every worker busy.
+    window = jobs * 2
+    pending: deque[Future[list[BatchResult]]] = deque()
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_initialize_worker, initargs=options
+    ) as executor:
+        for chunk in _chunked(argvs, chunksize):
+            pending.append(executor.submit(_run_worker_chunk, chunk))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _create_runner(
+    stack: contextlib.ExitStack,
+    obj: CappaCapable[Any],
+    deps: DepTypes,
+    backend: Backend | None,
+    color: bool,
+    version: str | Arg[str] | None,
+    help: bool | Arg[bool],
+    completion: bool | Arg[bool],
+    theme: Theme | None,
+    output: Output | None,
+    help_formatter: HelpFormattable | None,
+) -> _Runner:
+    concrete_backend = coalesce_backend(backend)
+    command = collect(
+        obj,
+        backend=concrete_backend,
+        version=version,
+        help=help,
+        completion=completion,
+        help_formatter=help_formatter,
+    )
+    concrete_output = coalesce_output(output, theme, color)
+    session_deps = resolve_session_deps(deps, concrete_output, stack)
+    return _Runner(command, concrete_backend, concrete_output, session_deps)
+
+
+_worker_runner: _Runner | None = None
+
+
+def _initialize_worker(*options: Any) -> None:
+    from multiprocessing.util import Finalize
+
+    global _worker_runner
+
+    stack = contextlib.ExitStack()
+    _worker_runner = _create_runner(stack, *options)
+
+    # Tear down the worker's session deps as the worker process exits.
+    Finalize(None, stack.close, exitpriority=10)
+
+
+def _run_worker_chunk(chunk: list[list[str]]) -> list[BatchResult]:
+    assert _worker_runner is not None
+    return [_worker_runner.run(argv) for argv in chunk]
+
+
+def _chunked(argvs: Iterable[Sequence[str]], size: int) -> Iterator[list[list[str]]]:
+    chunk: list[list[str]] = []
+    for argv in argvs:
+        chunk.append(list(argv))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _exit_code(e: SystemExit) -> int:
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+    return 1
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Literal, Mapping, Sequence
+
+from cappa.completion.types import Completion
+from cappa.state import State
+from cappa.type_view import Empty
+
+__all__ = [
+    "CompletionCache",
+    "DiskCache",
+    "default_cache_dir",
+]
+
+
+def default_cache_dir() -> Path:
+    """Return the platform-specific user cache directory used by cappa."""
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        base = Path(xdg_cache_home)
+    elif sys.platform == "win32":  # pragma: no cover
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":  # pragma: no cover
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path.home() / ".cache"
+
+    return base / "cappa"
+
+
+@dataclass(frozen=True)
+class DiskCache:
+    """Persist the result of an expensive `ValueFrom` default across invocations.
+
+    Results are keyed by the callable's qualified name and its resolved keyword
+    arguments (excluding `State`), plus the modification time of any `depends_on` files, such that
+    touching a dependency invalidates the cached value.
+
+    Keyword arguments must be JSON-like values (`str`, `int`, `float`, `bool`, `None`,
+    paths, and lists, tuples and `str`-keyed dicts thereof), which produce the same key
+    in every process. Results of calls with any other keyword argument are not cached.
+
+    Writes are atomic (written to a temporary file and renamed into place), and the
+    cache directory is bounded to `max_entries` entries, evicting the least recently
+    written entries first. Failure to read or write the cache is never fatal, the
+    value is simply recomputed.
+
+    Arguments:
+        ttl: The number of seconds for which a cached value remains valid. `None`
+            caches the value until its key changes.
+        depends_on: Files whose modification time forms part of the cache key.
+        directory: The directory in which to store cached values. Defaults to a
+            `cappa` directory inside the user's cache directory.
+        serializer: One of "pickle" or "json". Note "json" can only cache values
+            which round-trip through `json.dumps`/`json.loads`.
+        max_entries: The maximum number of entries to retain in `directory`.
+
+    Examples:
+        >>> from cappa import Arg, DiskCache, ValueFrom
+        >>> def git_root(): ...
+        >>> arg = Arg(default=ValueFrom.cached(DiskCache(ttl=3600), git_root))
+    """
+
+    ttl: float | None = None
+    depends_on: Sequence[str | os.PathLike[str]] = ()
+    directory: str | os.PathLike[str] | None = None
+    serializer: Literal["pickle", "json"] = "pickle"
+    max_entries: int = 256
+
+    def __call__(self, callable: Callable[..., Any], kwargs: Mapping[str, Any]) -> Any:
+        """Return the cached result of `callable(**kwargs)`, computing it if missing."""
+        key = self.key(callable, kwargs)
+        if key is None:
+            return callable(**kwargs)
+
+        path = self.path(key)
+        hit, value = self.read(path)
+        if hit:
+            return value
+
+        value = callable(**kwargs)
+
+        # Async callables produce awaitables, which are resolved later and cannot be stored.
+        if value is not Empty and not hasattr(value, "__await__"):
+            self.write(path, value)
+        return value
+
+    @property
+    def resolved_directory(self) -> Path:
+        if self.directory is None:
+            return default_cache_dir()
+        return Path(self.directory)
+
+    def key(
+        self, callable: Callable[..., Any], kwargs: Mapping[str, Any]
+    ) -> str | None:
+        """Return the key of `callable(**kwargs)`, or `None` if it cannot be keyed stably."""
+        name = f"{callable.__module__}.{getattr(callable, '__qualname__', callable)}"
+
+        mtimes: list[Any] = []
+        for dependency in self.depends_on:
+            try:
+                stat = os.stat(dependency)
+            except OSError:
+                mtimes.append(None)
+            else:
+                mtimes.append((stat.st_mtime_ns, stat.st_size))
+
+        # `State` is shared, mutable parse state rather than an input to the computation.
+        key_kwargs = {k: v for k, v in kwargs.items() if not isinstance(v, State)}
+        try:
+            parts = json.dumps(
+                [name, key_kwargs, mtimes],
+                sort_keys=True,
+                default=_encode_key_part,
+                allow_nan=False,
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(parts.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.resolved_directory / f"{key}.{self.serializer}"
+
+    def read(self, path: Path) -> tuple[bool, Any]:
+        try:
+            content = path.read_bytes()
+            if self.serializer == "json":
+                created_at, value = json.loads(content)
+            else:
+                created_at, value = pickle.loads(content)  # noqa: S301
+        except Exception:
+            return False, None
+
+        if self.ttl is not None and time.time() - created_at >= self.ttl:
+            return False, None
+        return True, value
+
+    def write(self, path: Path, value: Any) -> None:
+        payload = (time.time(), value)
+        try:
+            if self.serializer == "json":
+                content = json.dumps(payload).encode()
+            else:
+                content = pickle.dumps(payload)
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                os.replace(temp_name, path)
+            except BaseException:
+                os.unlink(temp_name)
+                raise
+        except Exception:
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        directory = self.resolved_directory
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry)
+                for entry in directory.iterdir()
+                if entry.suffix in {".pickle", ".json"}
+            ]
+        except OSError:  # pragma: no cover
+            return
+
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+
+        for _, entry in sorted(entries, key=lambda item: item[0])[:excess]:
+            try:
+                entry.unlink()
+            except OSError:  # pragma: no cover
+                pass
+
+
+def _encode_key_part(value: Any) -> Any:
+    """Encode the non-JSON values which nonetheless have a stable key (paths)."""
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)  # pyright: ignore
+    raise TypeError(f"Cannot key {type(value).__name__} values")
+
+
+@dataclass(frozen=True)
+class CompletionCache:
+    """Persist the results of a slow `Arg.completion` function across completion requests.
+
+    Results are keyed by the command path (e.x. `prog remote add`), the argument, the
+    completion function, and the partial value being completed (plus the current
+    directory, if `cwd` is `True`).
+
+    A partial value without a cached result of its own is answered by filtering the
+    cached result of a shorter prefix, when there is one, rather than calling the
+    completion function again. This assumes the completion function produces values
+    which start with the partial value (as shells themselves expect).
+
+    Arguments:
+        ttl: The number of seconds for which cached completions remain valid. `None`
+            caches completions until their key changes.
+        cwd: Whether the current directory forms part of the cache key, for completion
+            functions whose results depend upon it (e.x. git branches).
+        directory: The directory in which to store cached completions. Defaults to a
+            `completion` directory inside cappa's user cache directory.
+        max_entries: The maximum number of entries to retain in `directory`.
+        background: Run the completion function in a forked child process, which is
+            left running if it misses the completion deadline
+            (`Command.completion_timeout`), to populate the cache for the next request.
+
+    Examples:
+        >>> from cappa import Arg, CompletionCache
+        >>> def branches(partial: str): ...
+        >>> arg = Arg(completion=branches, completion_cache=60)
+        >>> arg = Arg(
+        ...     completion=branches, completion_cache=CompletionCache(60, cwd=True)
+        ... )
+    """
+
+    ttl: float | None = 60
+    cwd: bool = False
+    directory: str | os.PathLike[str] | None = None
+    max_entries: int = 256
+    background: bool = False
+
+    @classmethod
+    def coerce(cls, value: float | CompletionCache) -> CompletionCache:
+        if isinstance(value, CompletionCache):
+            return value
+        return cls(ttl=value)
+
+    def __call__(
+        self,
+        completion: Callable[[str], list[Completion] | Awaitable[list[Completion]]],
+        partial: str,
+        *,
+        scope: Sequence[str] = (),
+    ) -> list[Completion] | Awaitable[list[Completion]]:
+        """Return the (possibly cached) result of `completion(partial)`.
+
+        The result of an async completion function is cached once it is awaited.
+
+        Arguments:
+            completion: The arg's completion function.
+            partial: The partial value being completed.
+            scope: The command path and arg, distinguishing the completion function's
+                use by different args.
+        """
+        cache = self.disk_cache
+        name = (
+            f"{completion.__module__}.{getattr(completion, '__qualname__', completion)}"
+        )
+        key_scope = [*scope, name]
+        if self.cwd:
+            key_scope.append(os.getcwd())
+
+        for end in range(len(partial), -1, -1):
+            prefix = partial[:end]
+            hit, value = cache.read(cache.path(self.key(key_scope, prefix)))
+            if not hit:
+                continue
+
+            completions = [Completion(v, help=h) for v, h in value]
+            if end < len(partial):
+                completions = [
+                    c for c in completions if c.value and c.value.startswith(partial)
+                ]
+            return completions
+
+        path = cache.path(self.key(key_scope, partial))
+        result = completion(partial)
+        if inspect.isawaitable(result):
+            return self.write_async(cache, path, result)
+
+        self.write(cache, path, result)
+        return result
+
+    def write(self, cache: DiskCache, path: Path, completions: list[Completion]):
+        cache.write(path, [[c.value, c.help] for c in completions])
+
+    async def write_async(
+        self, cache: DiskCache, path: Path, completions: Awaitable[list[Completion]]
+    ) -> list[Completion]:
+        result = await completions
+        self.write(cache, path, result)
+        return result
+
+    @property
+    def disk_cache(self) -> DiskCache:
+        directory = self.directory
+        if directory is None:
+            directory = default_cache_dir() / "completion"
+        return DiskCache(
+            ttl=self.ttl,
+            directory=directory,
+            serializer="json",
+            max_entries=self.max_entries,
+        )
+
+    def key(self, scope: Sequence[str], prefix: str) -> str:
+        return hashlib.sha256(repr((list(scope), prefix)).encode()).hexdigest()
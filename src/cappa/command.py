@@ -12,6 +12,7 @@ from typing import (
     Generic,
     Hashable,
     Iterable,
+    Mapping,
     Protocol,
     Sequence,
     TextIO,
@@ -25,18 +26,25 @@ from type_lens.type_view import TypeView
 from cappa.arg import Arg, FinalArg, Group
 from cappa.class_inspect import fields as get_fields
 from cappa.class_inspect import get_command, get_command_capable_object
+from cappa.completion.index import PrefixIndex
+from cappa.default import ConfigSource, DefaultSources, LazyField
 from cappa.docstring import ClassHelpText
-from cappa.help import HelpFormattable, HelpFormatter
+from cappa.fanout import Fanout, jobs_field_name
+from cappa.help import HelpFormattable, HelpFormatter, format_args_plain
+from cappa.invoke.executor import ExecutorType
 from cappa.invoke.types import Resolved
-from cappa.output import Exit, Output
+from cappa.output import CompletionExit, Exit, Output
 from cappa.state import S, State
-from cappa.subcommand import FinalSubcommand, Subcommand
+from cappa.subcommand import FinalSubcommand, LazyCommands, Subcommand
+from cappa.suggest import SuggestionIndex
+from cappa.trie import Trie
 from cappa.type_view import CallableView
 from cappa.types import ParseResult
 from cappa.typing import assert_type
 
 if TYPE_CHECKING:
     from cappa.base import Backend, CappaCapable
+    from cappa.parser import OptionTable
 
 T = TypeVar("T")
 
@@ -78,6 +86,14 @@ class CommandArgs(TypedDict, total=False):
     hidden: bool
     default_short: bool
     default_long: bool
+    env_prefix: str | None
+    config: ConfigSource | None
+    chain: str | None
+    preload: list[str]
+    executor: ExecutorType | None
+    timeout: float | None
+    completion_timeout: float | None
+    allow_abbrev: bool
 
 
 @dataclasses.dataclass
@@ -110,6 +126,31 @@ class Command(Generic[T]):
         deprecated: If supplied, the argument will be marked as deprecated. If given `True`,
             a default message will be generated, otherwise a supplied string will be
             used as the deprecation message.
+        env_prefix: If supplied, all options will be treated as though annotated with
+            `Arg(default=Env(f"{env_prefix}{FIELD_NAME}"))`, unless they already declare
+            an `Env` default. Subcommands inherit the prefix unless they set their own.
+        config: If supplied, a `ConfigSource` file from which all options fall back to
+            reading their values (keyed by field name), after any `Env` default but before
+            any other default. Subcommands inherit the source unless they set their own.
+        chain: If supplied, the separator (e.x. `"+"`) at which the command line is split
+            into a chain of subcommand invocations, e.x. `tool fetch a + publish b`.
+            Each segment selects one of the command's subcommands, and the segments are
+            invoked in order. Only supported by the native cappa parser.
+        preload: Modules (e.x. `["pandas"]`) to import on a background thread as soon as
+            the command is selected by the native cappa parser, overlapping the import
+            with the remainder of parsing. A string `invoke` target's module is always
+            imported this way.
+        executor: Under `invoke_async`, run a sync `invoke` function on a `"thread"` or
+            `"process"` pool executor, rather than blocking the event loop.
+        timeout: Under `invoke_async`, the number of seconds after which the command
+            (and any pending dependency resolution) is cancelled, exiting with
+            a distinct exit code (124).
+        completion_timeout: The number of seconds allotted to (sync or async)
+            `Arg.completion` functions, after which whatever completions are ready are
+            returned, and the stragglers are cancelled. The smallest of those of the
+            commands leading to the completed argument applies.
+        allow_abbrev: Accept any unambiguous prefix of the command's long options and
+            subcommand names (e.x. `--verb` for `--verbose`).
     """
 
     cmd_cls: type[T]
@@ -131,6 +172,14 @@ class Command(Generic[T]):
     default_short: bool = False
     default_long: bool = False
     deprecated: bool | str = False
+    env_prefix: str | None = None
+    config: ConfigSource | None = None
+    chain: str | None = None
+    preload: list[str] = dataclasses.field(default_factory=lambda: [])
+    executor: ExecutorType | None = None
+    timeout: float | None = None
+    completion_timeout: float | None = None
+    allow_abbrev: bool = False
 
     help_formatter: HelpFormattable = HelpFormatter.default
 
@@ -170,26 +219,20 @@ class Command(Generic[T]):
     def resolved_aliases(self) -> list[Alias]:
         return [Alias.coerce(a) for a in self.aliases]
 
-    def collect(
+    def collect_arguments(
         self,
-        propagated_arguments: list[FinalArg[Any]] | None = None,
+        help_text: ClassHelpText,
         state: State[Any] | None = None,
-    ) -> FinalCommand[T]:
-        kwargs: CommandArgs = CommandArgs()
-
-        help_text = ClassHelpText.collect(self.cmd_cls)
-
-        if not self.help:
-            kwargs["help"] = help_text.summary
-
-        if not self.description:
-            kwargs["description"] = help_text.body
-
+        env_prefix: str | None = None,
+        config: ConfigSource | None = None,
+    ) -> tuple[
+        list[FinalArg[Any] | FinalDestructure[Any]],
+        list[tuple[Subcommand, TypeView[Any] | None, str | None]],
+    ]:
+        """Normalize the command's own args, and detect (but not collect) subcommands."""
         fields = get_fields(self.cmd_cls)
         function_view = CallableView.from_callable(self.cmd_cls, include_extras=True)
 
-        propagated_arguments = propagated_arguments or []
-
         arguments: list[FinalArg[Any] | FinalDestructure[Any]] = []
         raw_subcommands: list[tuple[Subcommand, TypeView[Any] | None, str | None]] = []
         if self.arguments:
@@ -209,6 +252,8 @@ class Command(Generic[T]):
                             default_long=self.default_long,
                             fallback_help=arg_help,
                             state=state,
+                            env_prefix=env_prefix,
+                            config=config,
                         )
                     )
                 elif isinstance(arg, FinalDestructure):
@@ -242,13 +287,67 @@ class Command(Generic[T]):
                         default_short=self.default_short,
                         default_long=self.default_long,
                         state=state,
+                        env_prefix=env_prefix,
+                        config=config,
                     )
                     arguments.extend(arg_defs)
 
-        propagating_arguments = [
-            *propagated_arguments,
-            *(arg for arg in arguments if isinstance(arg, FinalArg) and arg.propagate),
+        return arguments, raw_subcommands
+
+    def option_names(self) -> set[str]:
+        """Return the option names of the command's own (top-level) args.
+
+        Only the command's own args are normalized, without collecting its subcommands.
+        """
+        arguments, _ = self.collect_arguments(ClassHelpText.collect(self.cmd_cls))
+        names: set[str] = set()
+        for arg in arguments:
+            if isinstance(arg, FinalArg):
+                names.update(arg.names())
+            else:
+                names.update(n for a in arg.command.options for n in a.names())
+        return names
+
+    def collect(
+        self,
+        propagated_arguments: list[FinalArg[Any]] | None = None,
+        state: State[Any] | None = None,
+        env_prefix: str | None = None,
+        config: ConfigSource | None = None,
+        lazy: bool = False,
+    ) -> FinalCommand[T]:
+        """Produce the `FinalCommand`, collecting its args and subcommands.
+
+        When `lazy`, each subcommand's commands are collected only upon first access (see
+        `LazyCommands`), rather than the whole tree being collected up front.
+        """
+        kwargs: CommandArgs = CommandArgs()
+
+        if self.env_prefix is not None:
+            env_prefix = self.env_prefix
+        if self.config is not None:
+            config = self.config
+
+        help_text = ClassHelpText.collect(self.cmd_cls)
+
+        if not self.help:
+            kwargs["help"] = help_text.summary
+
+        if not self.description:
+            kwargs["description"] = help_text.body
+
+        arguments, raw_subcommands = self.collect_arguments(
+            help_text, state=state, env_prefix=env_prefix, config=config
+        )
+        propagated_arguments = propagated_arguments or []
+
+        # Subcommands share their parent's list, unless this command adds to it.
+        propagating_arguments = propagated_arguments
+        own_propagating = [
+            arg for arg in arguments if isinstance(arg, FinalArg) and arg.propagate
         ]
+        if own_propagating:
+            propagating_arguments = [*propagated_arguments, *own_propagating]
         subcommands = [
             subcommand.normalize(
                 type_view,
@@ -256,11 +355,28 @@ class Command(Generic[T]):
                 help_formatter=self.help_formatter,
                 propagated_arguments=propagating_arguments,
                 state=state,
+                env_prefix=env_prefix,
+                config=config,
+                lazy=lazy,
             )
             for subcommand, type_view, field_name in raw_subcommands
         ]
 
+        if len([a for a in arguments if isinstance(a, FinalArg) and a.fanout]) > 1:
+            raise ValueError(
+                f"Only one argument may set `Arg.fanout`, per command: {self.cmd_cls}"
+            )
+
+        if self.chain is not None and not subcommands:
+            raise ValueError(
+                f"`chain` requires the command to have subcommands: {self.cmd_cls}"
+            )
+
         check_group_identity([a for a in arguments if isinstance(a, FinalArg)])
+        for arg in arguments:
+            if isinstance(arg, FinalArg) and arg.lazy_default:
+                LazyField.install(self.cmd_cls, arg.field_name)
+
         final_arguments: list[
             FinalArg[Any] | FinalSubcommand | FinalDestructure[Any]
         ] = [
@@ -282,6 +398,14 @@ class Command(Generic[T]):
             default_short=self.default_short,
             default_long=self.default_long,
             deprecated=self.deprecated,
+            env_prefix=env_prefix,
+            config=config,
+            chain=self.chain,
+            preload=self.preload,
+            executor=self.executor,
+            timeout=self.timeout,
+            completion_timeout=self.completion_timeout,
+            allow_abbrev=self.allow_abbrev,
             help_formatter=self.help_formatter,
             _collected=self._collected,
         )
@@ -301,6 +425,78 @@ class FinalCommand(Command[T]):
         default_factory=list
     )
 
+    _plain_help: dict[str, str] = dataclasses.field(
+        default_factory=lambda: {}, init=False, repr=False, compare=False
+    )
+    _option_index: PrefixIndex | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _option_suggestions: SuggestionIndex | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _option_tries: tuple[Trie, Trie] | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _option_table: OptionTable | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def option_index(self, names: Iterable[str]) -> PrefixIndex:
+        """Produce the `PrefixIndex` of the command's option `names`.
+
+        The option names available to a command (including propagated options) are
+        fixed once collected, so the index is built once and reused by every parse.
+        """
+        if self._option_index is None:
+            self._option_index = PrefixIndex(names)
+        return self._option_index
+
+    def option_table(self) -> OptionTable:
+        """Produce the static lookup tables of the command's options, used by the parser.
+
+        Built on the first parse of the command (at any level of a command line), and
+        shared (read-only) by every subsequent parse of it.
+        """
+        if self._option_table is None:
+            from cappa.parser import OptionTable
+
+            self._option_table = OptionTable.from_command(self)
+        return self._option_table
+
+    def option_suggestions(self, names: Iterable[str]) -> SuggestionIndex:
+        """Produce the `SuggestionIndex` of the command's option `names`.
+
+        Only needed once an option is mistyped, so it is built on first use.
+        """
+        if self._option_suggestions is None:
+            self._option_suggestions = SuggestionIndex(names)
+        return self._option_suggestions
+
+    def option_tries(self, options: Mapping[str, FinalArg[Any]]) -> tuple[Trie, Trie]:
+        """Produce the `Trie`s of the command's short and long option names.
+
+        Short option names are stored without their leading `-`, to match each option
+        within a concatenated cluster (e.x. `-abc`). Names are mapped to their arg, such
+        that a prefix shared only by the names of a single arg is unambiguous.
+        """
+        if self._option_tries is None:
+            short = Trie((n[1:], id(a)) for n, a in options.items() if n[:2] != "--")
+            long = Trie((n, id(a)) for n, a in options.items() if n[:2] == "--")
+            self._option_tries = (short, long)
+        return self._option_tries
+
+    def plain_help(self, arg: FinalArg[Any]) -> str:
+        """Produce the plain-text help for `arg` (e.x. for completion descriptions).
+
+        Unlike the rich-rendered help, this is cheap, and is cached on the command, such
+        that repeated completions in the same process (e.x. `cappa.shell`) reuse it.
+        """
+        key = arg.names_str()
+        result = self._plain_help.get(key)
+        if result is None:
+            result = self._plain_help[key] = format_args_plain(self.help_formatter, arg)
+        return result
+
     @property
     def subcommand(self) -> FinalSubcommand | None:
         return next(
@@ -311,9 +507,22 @@ class FinalCommand(Command[T]):
     @property
     def value_arguments(self) -> Iterable[FinalArg[Any]]:
         for arg in self.arguments:
-            if isinstance(arg, FinalArg) and arg.has_value:
+            # The `-j/--jobs` value is parsed, but consumed by the `Fanout`, rather than
+            # being supplied to the command itself.
+            if (
+                isinstance(arg, FinalArg)
+                and arg.has_value
+                and arg.field_name != jobs_field_name
+            ):
                 yield arg
 
+    @property
+    def fanout_argument(self) -> FinalArg[Any] | None:
+        for arg in self.value_arguments:
+            if arg.fanout:
+                return arg
+        return None
+
     @property
     def destructured_arguments(self) -> Iterable[FinalDestructure[Any]]:
         for arg in self.arguments:
@@ -349,23 +558,44 @@ class FinalCommand(Command[T]):
         help: FinalArg[bool] | None = None,
         version: FinalArg[str] | None = None,
         completion: FinalArg[bool] | None = None,
+        jobs: FinalArg[int] | None = None,
     ):
         if self._collected:
             return self
 
+        def add_subcommand_meta_actions(option: FinalCommand[Any]) -> FinalCommand[Any]:
+            return option.add_meta_actions(help, jobs=jobs)
+
         arguments = [
             dataclasses.replace(
                 arg,
-                options={
-                    name: option.add_meta_actions(help)
+                options=arg.options.map(add_subcommand_meta_actions)
+                if isinstance(arg.options, LazyCommands)
+                else {
+                    name: add_subcommand_meta_actions(option)
                     for name, option in arg.options.items()
                 },
             )
-            if help and isinstance(arg, FinalSubcommand)
+            if (help or jobs) and isinstance(arg, FinalSubcommand)
             else arg
             for arg in self.arguments
         ]
 
+        if jobs and self.fanout_argument:
+            # The command's own options take precedence over `-j/--jobs`, which drops
+            # whichever of its names are already taken (or is omitted entirely).
+            taken = {
+                name
+                for arg in arguments
+                if isinstance(arg, FinalArg)
+                for name in arg.names()
+            }
+            short = [name for name in jobs.short or () if name not in taken]
+            long = [name for name in jobs.long or () if name not in taken]
+            if short or long:
+                arguments.append(
+                    dataclasses.replace(jobs, short=short or False, long=long or False)
+                )
         if help:
             arguments.append(help)
         if version:
@@ -382,30 +612,103 @@ class FinalCommand(Command[T]):
         output: Output,
         state: State[Any] | None = None,
         input: TextIO | None = None,
+        sources: DefaultSources | None = None,
+        root: Resolved[T] | None = None,
+        root_args: Mapping[str, Any] | None = None,
     ) -> tuple[Resolved[T], dict[Hashable, Any]]:
+        """Map the parsed arguments to a `Resolved` instance of `command`, and its deps.
+
+        `root` is the already mapped instance of the first link of a chained command line
+        (see `Command.chain`), and `root_args` its parsed arguments. Its (already mapped)
+        root-level values are reused, rather than being evaluated again, except for those
+        which the link itself supplied a different value for.
+        """
         state = State.ensure(state)  # pyright: ignore
 
+        if root is None:
+            missing = [
+                arg
+                for arg in self.value_arguments
+                if arg.required
+                and arg.field_name not in parsed_args
+                and arg.default.has_external_source
+                and not arg.default.has_external_value(sources)
+            ]
+            if missing:
+                names = ", ".join([arg.names_str("/") for arg in missing])
+                raise Exit(
+                    f"The following arguments are required: {names}",
+                    code=2,
+                    prog=prog,
+                    command=self,
+                )
+
+        def is_inherited(field_name: str) -> bool:
+            if root is None or field_name not in root.kwargs:
+                return False
+
+            root_parsed = root_args or {}
+            if field_name not in parsed_args:
+                return field_name not in root_parsed
+            return (
+                field_name in root_parsed
+                and parsed_args[field_name] == root_parsed[field_name]
+            )
+
         kwargs: dict[str, Any] = {}
         for arg in self.value_arguments:
+            if is_inherited(arg.field_name):
+                kwargs[arg.field_name] = cast(Resolved[T], root).kwargs[arg.field_name]
+                continue
+
             kwargs[arg.field_name] = arg.map_result(
-                prog, parsed_args, state=state, input=input
+                prog, parsed_args, state=state, input=input, sources=sources
             )
 
-        subcommand_deps: dict[Hashable, Any] = {}
         for destructure in self.destructured_arguments:
+            if is_inherited(destructure.field_name):
+                kwargs[destructure.field_name] = cast(Resolved[T], root).kwargs[
+                    destructure.field_name
+                ]
+                continue
+
             fd_parsed = parsed_args.get(destructure.field_name, {})
             fd_resolved = destructure.map_result(
-                prog, fd_parsed, output, state=state, input=input
+                prog, fd_parsed, output, state=state, input=input, sources=sources
             )
             kwargs[destructure.field_name] = fd_resolved
 
+        return self.map_result_from_kwargs(
+            command,
+            prog,
+            parsed_args,
+            output,
+            kwargs,
+            state,
+            sources,
+            input=input,
+        )
+
+    def map_result_from_kwargs(
+        self,
+        command: FinalCommand[T],
+        prog: str,
+        parsed_args: dict[str, Any],
+        output: Output,
+        kwargs: dict[str, Any],
+        state: State[Any],
+        sources: DefaultSources | None,
+        input: TextIO | None = None,
+    ) -> tuple[Resolved[T], dict[Hashable, Any]]:
+        """Complete `map_result`, given the already mapped `kwargs` of its arguments."""
+        subcommand_deps: dict[Hashable, Any] = {}
         subcommand = self.subcommand
         if subcommand:
             field_name = subcommand.field_name
             if field_name in parsed_args:
                 value = parsed_args[field_name]
                 value, subcommand_deps = subcommand.map_result(
-                    prog, value, output=output, state=state
+                    prog, value, output=output, state=state, sources=sources
                 )
                 kwargs[field_name] = value
 
@@ -415,7 +718,28 @@ class FinalCommand(Command[T]):
 
         resolved = Resolved(map_result, kwargs=kwargs)
         key = cast(Hashable, command.cmd_cls)
-        deps: dict[Hashable, Any] = {key: resolved, **subcommand_deps}
+        deps: dict[Hashable, Any] = {key: resolved}
+
+        fanout_arg = self.fanout_argument
+        if fanout_arg:
+            fanout_kwargs: dict[str, Any] = {}
+            for meta_arg in self.arguments:
+                if (
+                    isinstance(meta_arg, FinalArg)
+                    and meta_arg.field_name == jobs_field_name
+                ):
+                    fanout_kwargs["jobs"] = meta_arg.map_result(
+                        prog, parsed_args, state=state, input=input, sources=sources
+                    )
+
+            deps[Fanout] = Resolved(
+                Fanout,
+                args=(command.cmd_cls, fanout_arg.field_name, resolved),
+                kwargs=fanout_kwargs,
+            )
+
+        # A subcommand's deps (including its `Fanout`) take precedence over the parent's.
+        deps.update(subcommand_deps)
         return resolved, deps
 
     def parse_command(
@@ -438,10 +762,47 @@ class FinalCommand(Command[T]):
                 self, argv, output=output, prog=prog
             )
             prog = parser.prog
+
+            # A single snapshot of the environment/config files, shared by all defaults.
+            sources = DefaultSources()
             result, implicit_deps = self.map_result(
-                self, prog, parsed_args, state=state, input=input, output=output
+                self,
+                prog,
+                parsed_args,
+                state=state,
+                input=input,
+                output=output,
+                sources=sources,
             )
 
+            # Subsequent links of a chained command line (see `Command.chain`), which the
+            # native parser records alongside the primary parse.
+            chain: list[ParseResult[T, S]] = []
+            for link_parser, link_command, link_args in getattr(parser, "chain", ()):
+                # Root-level values are shared by every link, so are only mapped once
+                # (unless the link supplies its own).
+                link_result, link_deps = self.map_result(
+                    self,
+                    link_parser.prog,
+                    link_args,
+                    state=state,
+                    input=input,
+                    output=output,
+                    sources=sources,
+                    root=result,
+                    root_args=parsed_args,
+                )
+                chain.append(
+                    ParseResult(
+                        root_command=self,
+                        parsed_command=link_command,
+                        instance=link_result,
+                        implicit_deps=link_deps,
+                        output=output,
+                        state=result_state,
+                    )
+                )
+
         return ParseResult(
             root_command=self,
             parsed_command=parsed_command,
@@ -449,6 +810,7 @@ class FinalCommand(Command[T]):
             implicit_deps=implicit_deps,
             output=output,
             state=result_state,
+            chain=chain,
         )
 
 
@@ -478,24 +840,30 @@ def graceful_exit(
 ) -> Generator[None, None, None]:
     try:
         yield
-    except BaseException as e:
+    except (Exit, ValueError) as e:
         if isinstance(e, Exit):
             command = e.command or command
             prog = e.prog or prog
-
-        help = command.help_formatter.long(command, prog)
-        short_help = command.help_formatter.short(command, prog)
-
-        if isinstance(e, ValueError):
+            exc = e
+        else:
             exc = Exit(str(e), code=2, prog=prog, command=command)
-            output.exit(exc, help=help, short_help=short_help)
-            raise exc
 
-        if isinstance(e, Exit):
-            output.exit(e, help=help, short_help=short_help)
-            raise
+        # Rendering help is expensive for large commands, so it's skipped entirely for
+        # completions, and for exits whose format does not include it.
+        fields: set[str] = set()
+        if not isinstance(exc, CompletionExit):
+            fields = output.exit_fields(exc.code)
+        help = command.help_formatter.long(command, prog) if "help" in fields else None
+        short_help = (
+            command.help_formatter.short(command, prog)
+            if "short_help" in fields
+            else None
+        )
+        output.exit(exc, help=help, short_help=short_help)
 
-        raise
+        if exc is e:
+            raise
+        raise exc
 
 
 from cappa.destructure import FinalDestructure  # noqa: E402
@@ -27,6 +27,13 @@ def execute(
     if action == "generate":
         raise Exit(shell.backend_template(prog, arg), code=0)
 
+    if action == "generate-static":
+        # Written verbatim: the embedded table's lines are arbitrarily long and
+        # tab-separated, and must not be wrapped (or otherwise rendered) by rich.
+        script = shell.static_backend_template(prog, arg, command)
+        output.output_console.file.write(script)
+        raise Exit(code=0)
+
     command_args = parse_incomplete_command()
 
     backend(
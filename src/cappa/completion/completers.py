@@ -1,10 +1,42 @@
 from __future__ import annotations
 
+import dataclasses
+
+from cappa.completion.index import PrefixIndex
 from cappa.completion.types import Completion
 
 
-def complete_choices(choices: list[str], help: str | None = None):
-    def completion(partial: str = ""):
-        return [Completion(c, help=help) for c in choices if partial in c]
+@dataclasses.dataclass
+class ChoiceCompleter:
+    """Complete the fixed set of `choices` inferred for an argument.
+
+    Distinct from an arbitrary `Arg.completion` callable, so that the choices can be
+    compiled into static completion scripts, rather than being computed on demand.
+
+    The choices are indexed on first use, such that completing an arg with a very
+    large number of choices need not scan every one of them.
+    """
+
+    choices: list[str]
+    help: str | None = None
+    limit: int | None = None
+
+    _index: PrefixIndex | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def index(self) -> PrefixIndex:
+        if self._index is None:
+            self._index = PrefixIndex(self.choices)
+        return self._index
+
+    def __call__(self, partial: str = "") -> list[Completion]:
+        return [
+            Completion(c, help=self.help)
+            for c in self.index.search(partial, limit=self.limit)
+        ]
+
 
-    return completion
+def complete_choices(choices: list[str], help: str | None = None) -> ChoiceCompleter:
+    return ChoiceCompleter(choices, help=help)
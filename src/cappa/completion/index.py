@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+import math
+from typing import Iterable, Iterator
+
+__all__ = [
+    "PrefixIndex",
+]
+
+# Sorts after any character which may follow a prefix, bounding the range of keys
+# which start with it.
+_upper_bound = "\U0010ffff"
+
+
+class PrefixIndex:
+    """A sorted index of names, answering prefix queries in `O(log n + k log k)`.
+
+    Matches are returned in the order in which the names were given (e.x. declaration
+    order), rather than sorted order, as with a linear `startswith` scan.
+
+    Given a `limit`, only the `offset + limit` earliest matches are produced, each in
+    `O(sqrt(n))` (rather than sorting every match), regardless of how many names match
+    in total.
+
+    Examples:
+        >>> index = PrefixIndex(["push", "pull", "fetch"])
+        >>> index.search("pu")
+        ['push', 'pull']
+        >>> index.search("", limit=2, offset=1)
+        ['pull', 'fetch']
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names = list(names)
+        ordered = sorted(range(len(self.names)), key=self.names.__getitem__)
+        self.keys = [self.names[i] for i in ordered]
+        self.positions = ordered
+
+        self._blocks: tuple[int, list[int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(
+        self, prefix: str, *, limit: int | None = None, offset: int = 0
+    ) -> list[str]:
+        """Return the names which start with `prefix`.
+
+        Arguments:
+            prefix: The prefix to match.
+            limit: The maximum number of names to return.
+            offset: The number of (leading) matches to skip, for paging through results
+                with `limit`.
+        """
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + _upper_bound, lo=start)
+        if start == end:
+            return []
+
+        stop = None if limit is None else offset + limit
+        if end - start == len(self.names):
+            return self.names[offset:stop]
+
+        if stop is None:
+            positions = sorted(self.positions[start:end])
+        else:
+            positions = list(self.earliest(start, end, stop))
+        return [self.names[i] for i in positions[offset:]]
+
+    def earliest(self, start: int, end: int, count: int) -> Iterator[int]:
+        """Produce (up to) the `count` smallest `positions[start:end]`, in order.
+
+        Each produced position splits its range in two, whose minimums are the
+        candidates for the next one.
+        """
+        heap = [(*self.range_min(start, end), start, end)]
+        while heap and count > 0:
+            position, rank, lo, hi = heapq.heappop(heap)
+            yield position
+            count -= 1
+
+            if lo < rank:
+                heapq.heappush(heap, (*self.range_min(lo, rank), lo, rank))
+            if rank + 1 < hi:
+                heapq.heappush(heap, (*self.range_min(rank + 1, hi), rank + 1, hi))
+
+    def range_min(self, lo: int, hi: int) -> tuple[int, int]:
+        """Return the smallest of `positions[lo:hi]`, and its index in `positions`.
+
+        Whole blocks within the range are covered by their precomputed minimums, such
+        that `O(sqrt(n))` items are compared, rather than every item in the range.
+        """
+        positions = self.positions
+        size, blocks = self.blocks()
+
+        first = -(-lo // size)
+        last = hi // size
+        if first >= last:
+            value = min(positions[lo:hi])
+            return value, positions.index(value, lo, hi)
+
+        head = (lo, first * size)
+        tail = (last * size, hi)
+        value = min(blocks[first:last])
+        for segment_lo, segment_hi in (head, tail):
+            if segment_lo < segment_hi:
+                value = min(value, min(positions[segment_lo:segment_hi]))
+
+        for segment_lo, segment_hi in (head, tail):
+            if value in positions[segment_lo:segment_hi]:
+                return value, positions.index(value, segment_lo, segment_hi)
+
+        block = blocks.index(value, first, last) * size
+        return value, positions.index(value, block, block + size)
+
+    def blocks(self) -> tuple[int, list[int]]:
+        """Return the block size, and the minimum of each block of `positions`.
+
+        Built on first use (i.e. by the first limited search), in `O(n)`.
+        """
+        if self._blocks is None:
+            positions = self.positions
+            size = max(math.isqrt(len(positions)), 1)
+            minimums = [
+                min(positions[i : i + size]) for i in range(0, len(positions), size)
+            ]
+            self._blocks = (size, minimums)
+        return self._blocks
@@ -0,0 +1,202 @@
+"""Run completion functions (sync or async) concurrently, bounded by a deadline.
+
+Each source runs on its own thread (async sources on their own event loop within it),
+such that a straggling source never holds up the completions of the others, nor the
+shell waiting on them.
+
+Background sources instead run in a forked child process, which outlives the CLI
+process (and so, the shell's wait for it) to finish its work, e.x. populating a
+completion cache.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+import os
+import pickle
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Sequence, Union
+
+from cappa.completion.types import Completion, FileCompletion
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Future
+
+__all__ = [
+    "CompletionSource",
+    "run_completers",
+]
+
+
+@dataclasses.dataclass
+class CompletionSource:
+    """A zero-argument callable producing completions (or an awaitable of them).
+
+    Arguments:
+        fn: The callable.
+        background: Whether the source is left running after the deadline (e.x. to
+            populate a completion cache), rather than being cancelled. Only supported
+            on platforms with `os.fork`, and otherwise ignored.
+    """
+
+    fn: Callable[[], Any]
+    background: bool = False
+
+
+def run_completers(
+    sources: Sequence[CompletionSource], timeout: float | None = None
+) -> list[Completion | FileCompletion]:
+    """Produce the completions of every source which finishes within `timeout` seconds.
+
+    Completions are returned in the order of `sources`, regardless of the order in which
+    they finish. Stragglers are cancelled (async sources cooperatively, sync sources by
+    being abandoned on a daemon thread), unless they are `background` sources.
+    """
+    if timeout is None and len(sources) == 1:
+        return list(resolve(sources[0].fn()))
+
+    from concurrent.futures import wait
+
+    # Forking first, before any thread is started, as only the forking thread survives.
+    tasks: list[SourceTask] = [
+        ForkTask(s) if s.background and hasattr(os, "fork") else ThreadTask(s)
+        for s in sources
+    ]
+    for task in sorted(tasks, key=lambda t: not isinstance(t, ForkTask)):
+        task.start()
+
+    wait([task.future for task in tasks], timeout=timeout)
+
+    result: list[Completion | FileCompletion] = []
+    for task in tasks:
+        if task.future.done():
+            result.extend(task.future.result())
+        else:
+            task.cancel()
+    return result
+
+
+def resolve(value: Any) -> Any:
+    if not inspect.isawaitable(value):
+        return value
+
+    import asyncio
+
+    return asyncio.run(await_value(value))
+
+
+async def await_value(value: Awaitable[Any]) -> Any:
+    return await value
+
+
+@dataclasses.dataclass
+class ThreadTask:
+    source: CompletionSource
+    future: Future[Any] = dataclasses.field(default_factory=lambda: new_future())
+
+    loop: asyncio.AbstractEventLoop | None = None
+    task: asyncio.Task[Any] | None = None
+    cancelled: bool = False
+    lock: threading.Lock = dataclasses.field(default_factory=threading.Lock)
+
+    def start(self) -> None:
+        thread = threading.Thread(target=self.run, name="cappa-completion", daemon=True)
+        thread.start()
+
+    def run(self) -> None:
+        try:
+            value = self.source.fn()
+            if inspect.isawaitable(value):
+                value = self.run_async(value)
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(value)
+
+    def run_async(self, value: Awaitable[Any]) -> Any:
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        try:
+            with self.lock:
+                task = loop.create_task(await_value(value))
+                self.loop, self.task = loop, task
+                if self.cancelled:
+                    task.cancel()
+            return loop.run_until_complete(task)
+        finally:
+            loop.close()
+
+    def cancel(self) -> None:
+        with self.lock:
+            self.cancelled = True
+            if self.loop is None or self.task is None or self.task.done():
+                return
+
+            try:
+                self.loop.call_soon_threadsafe(self.task.cancel)
+            except RuntimeError:  # pragma: no cover
+                # The loop closed, having finished the task in the meantime.
+                pass
+
+
+@dataclasses.dataclass
+class ForkTask:
+    """Run the source in a child process, which reports its result through a pipe.
+
+    The child is detached from the shell (its own session, with `os.devnull` for its
+    standard streams), such that it is free to outlive the CLI process.
+    """
+
+    source: CompletionSource
+    future: Future[Any] = dataclasses.field(default_factory=lambda: new_future())
+
+    def start(self) -> None:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(read_fd)
+            self.run_child(write_fd)
+
+        os.close(write_fd)
+        thread = threading.Thread(
+            target=self.wait, args=(pid, read_fd), name="cappa-completion", daemon=True
+        )
+        thread.start()
+
+    def run_child(self, write_fd: int) -> None:  # pragma: no cover
+        try:
+            os.setsid()
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+
+            value = resolve(self.source.fn())
+            with os.fdopen(write_fd, "wb") as file:
+                file.write(pickle.dumps(list(value)))
+        finally:
+            os._exit(0)
+
+    def wait(self, pid: int, read_fd: int) -> None:
+        with os.fdopen(read_fd, "rb") as file:
+            content = file.read()
+        os.waitpid(pid, 0)
+
+        if content:
+            self.future.set_result(pickle.loads(content))  # noqa: S301
+        else:
+            self.future.set_exception(RuntimeError("Completion source failed."))
+
+    def cancel(self) -> None:
+        """Leave the child running, to finish its work in the background."""
+
+
+SourceTask = Union[ThreadTask, ForkTask]
+
+
+def new_future() -> Future[Any]:
+    from concurrent.futures import Future
+
+    return Future()
@@ -1,5 +1,11 @@
 from cappa.completion.types import ShellHandler
 
+
+def fish_quote(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
 shells = [
     ShellHandler(
         "bash",
@@ -27,6 +33,97 @@ _%(safe_prog_name)s_completion_setup() {
 
 _%(safe_prog_name)s_completion_setup;
         """,
+        static_template="""\
+_%(safe_prog_name)s_spec=%(spec)s
+
+_%(safe_prog_name)s_lookup() {
+    local path type name kind help
+    _%(safe_prog_name)s_kind=""
+    while IFS=$'\\t' read -r path type name kind help; do
+        if [[ $path == "$1" && $type == "$2" && $name == "$3" ]]; then
+            _%(safe_prog_name)s_kind=$kind
+            return 0
+        fi
+    done <<< "$_%(safe_prog_name)s_spec"
+    return 1
+}
+
+_%(safe_prog_name)s_reply() {
+    local path type name kind help
+    while IFS=$'\\t' read -r path type name kind help; do
+        if [[ $path == "$1" && $type == "$2" && $name == "$3"* ]]; then
+            COMPREPLY+=("$name")
+        fi
+    done <<< "$_%(safe_prog_name)s_spec"
+}
+
+_%(safe_prog_name)s_completion() {
+    local cmd_path="." pending="" npos=0 word key i
+    local cur="${COMP_WORDS[COMP_CWORD]}"
+    [[ $cur == "=" ]] && cur=""
+    COMPREPLY=()
+
+    for ((i = 1; i < COMP_CWORD; i++)); do
+        word="${COMP_WORDS[i]}"
+        if [[ $word == "=" ]]; then
+            continue
+        elif [[ -n $pending && $word != -* ]]; then
+            pending=""
+        elif [[ $word == -* ]]; then
+            pending=""
+            if _%(safe_prog_name)s_lookup "$cmd_path" opt "$word" && [[ $_%(safe_prog_name)s_kind != flag ]]; then
+                pending=$word
+            fi
+        elif _%(safe_prog_name)s_lookup "$cmd_path" cmd "$word" || _%(safe_prog_name)s_lookup "$cmd_path" alias "$word"; then
+            cmd_path="$cmd_path $_%(safe_prog_name)s_kind"
+            npos=0
+        else
+            npos=$((npos + 1))
+        fi
+    done
+
+    if [[ $cur == -* ]]; then
+        _%(safe_prog_name)s_reply "$cmd_path" opt "$cur"
+        return 0
+    fi
+
+    if [[ -n $pending ]]; then
+        _%(safe_prog_name)s_lookup "$cmd_path" opt "$pending"
+        key=$pending
+    elif _%(safe_prog_name)s_lookup "$cmd_path" pos "$npos"; then
+        key=$npos
+    elif _%(safe_prog_name)s_lookup "$cmd_path" pos "+"; then
+        key="+"
+    else
+        _%(safe_prog_name)s_reply "$cmd_path" cmd "$cur"
+        return 0
+    fi
+
+    case $_%(safe_prog_name)s_kind in
+        choices)
+            _%(safe_prog_name)s_reply "$cmd_path" "val:$key" "$cur"
+            ;;
+        file)
+            compopt -o default
+            ;;
+        dynamic)
+            local IFS=$'\\n' response completion value help
+            response=$(env COMPLETION_LINE="${COMP_WORDS[*]}" COMPLETION_LOCATION=$((COMP_CWORD+1)) $1 %(completion_arg)s=complete)
+            if [[ $response == file ]]; then
+                compopt -o default
+                return 0
+            fi
+            for completion in $response; do
+                IFS=':' read -r value help <<< "$completion"
+                COMPREPLY+=("$value")
+            done
+            ;;
+    esac
+    return 0
+}
+
+complete -o nosort -F _%(safe_prog_name)s_completion %(prog_name)s
+""",
     ),
     ShellHandler(
         "zsh",
@@ -49,6 +146,102 @@ _%(safe_prog_name)s_completion() {
     fi
 }
 
+if [[ $zsh_eval_context[-1] == loadautofunc ]]; then
+    _%(safe_prog_name)s_completion "$@"
+else
+    compdef _%(safe_prog_name)s_completion %(prog_name)s
+fi
+""",
+        static_template="""\
+#compdef %(prog_name)s
+
+_%(safe_prog_name)s_spec=%(spec)s
+
+_%(safe_prog_name)s_lookup() {
+    local line
+    local -a fields
+    _%(safe_prog_name)s_kind=""
+    for line in "${(@f)_%(safe_prog_name)s_spec}"; do
+        fields=("${(@ps:\\t:)line}")
+        if [[ $fields[1] == "$1" && $fields[2] == "$2" && $fields[3] == "$3" ]]; then
+            _%(safe_prog_name)s_kind=$fields[4]
+            return 0
+        fi
+    done
+    return 1
+}
+
+_%(safe_prog_name)s_describe() {
+    local line
+    local -a fields candidates
+    for line in "${(@f)_%(safe_prog_name)s_spec}"; do
+        fields=("${(@ps:\\t:)line}")
+        if [[ $fields[1] == "$1" && $fields[2] == "$2" ]]; then
+            candidates+=("${fields[3]//:/\\\\:}:$fields[5]")
+        fi
+    done
+    (( $#candidates )) && _describe "$2" candidates
+}
+
+_%(safe_prog_name)s_completion() {
+    local cmd_path="." pending="" word key
+    local -i npos=0 i
+    local cur=$words[CURRENT]
+
+    for (( i = 2; i < CURRENT; i++ )); do
+        word=$words[i]
+        if [[ -n $pending && $word != -* ]]; then
+            pending=""
+        elif [[ $word == -* ]]; then
+            pending=""
+            if _%(safe_prog_name)s_lookup "$cmd_path" opt "$word" && [[ $_%(safe_prog_name)s_kind != flag ]]; then
+                pending=$word
+            fi
+        elif _%(safe_prog_name)s_lookup "$cmd_path" cmd "$word" || _%(safe_prog_name)s_lookup "$cmd_path" alias "$word"; then
+            cmd_path="$cmd_path $_%(safe_prog_name)s_kind"
+            npos=0
+        else
+            npos+=1
+        fi
+    done
+
+    if [[ $cur == -* ]]; then
+        _%(safe_prog_name)s_describe "$cmd_path" opt
+        return
+    fi
+
+    if [[ -n $pending ]]; then
+        _%(safe_prog_name)s_lookup "$cmd_path" opt "$pending"
+        key=$pending
+    elif _%(safe_prog_name)s_lookup "$cmd_path" pos "$npos"; then
+        key=$npos
+    elif _%(safe_prog_name)s_lookup "$cmd_path" pos "+"; then
+        key="+"
+    else
+        _%(safe_prog_name)s_describe "$cmd_path" cmd
+        return
+    fi
+
+    case $_%(safe_prog_name)s_kind in
+        choices)
+            _%(safe_prog_name)s_describe "$cmd_path" "val:$key"
+            ;;
+        file)
+            _files
+            ;;
+        dynamic)
+            local -a completions
+            completions=("${(@f)$(env COMPLETION_LINE="${words[*]}" COMPLETION_LOCATION=$((CURRENT)) \\
+%(prog_name)s %(completion_arg)s=complete)}")
+            if [[ "${completions[1]}" == "file" ]]; then
+                _files
+            elif [[ -n "$completions" ]]; then
+                _describe 'values' completions
+            fi
+            ;;
+    esac
+}
+
 if [[ $zsh_eval_context[-1] == loadautofunc ]]; then
     _%(safe_prog_name)s_completion "$@"
 else
@@ -76,6 +269,103 @@ end
 
 complete --no-files --command %(prog_name)s --arguments "(_%(safe_prog_name)s_completion)"
 """,
+        static_template="""\
+set -g __%(safe_prog_name)s_spec %(spec)s
+
+function __%(safe_prog_name)s_records --argument-names cmd_path type
+    for line in (string split \\n -- $__%(safe_prog_name)s_spec)
+        set -l fields (string split \\t -- $line)
+        if test "$fields[1]" = "$cmd_path"; and test "$fields[2]" = "$type"
+            echo $line
+        end
+    end
+end
+
+function __%(safe_prog_name)s_lookup --argument-names cmd_path type name
+    for line in (__%(safe_prog_name)s_records $cmd_path $type)
+        set -l fields (string split \\t -- $line)
+        if test "$fields[3]" = "$name"
+            echo $fields[4]
+            return 0
+        end
+    end
+    return 1
+end
+
+function __%(safe_prog_name)s_reply --argument-names cmd_path type
+    for line in (__%(safe_prog_name)s_records $cmd_path $type)
+        set -l fields (string split \\t -- $line)
+        printf '%%s\\t%%s\\n' $fields[3] $fields[5]
+    end
+end
+
+function _%(safe_prog_name)s_completion
+    set -l tokens (commandline -opc)
+    set -e tokens[1]
+    set -l cur (commandline -ct)
+    set -l cmd_path .
+    set -l pending
+    set -l npos 0
+    set -l kind
+    set -l key
+
+    for word in $tokens
+        if test -n "$pending"; and not string match -q -- '-*' $word
+            set pending
+        else if string match -q -- '-*' $word
+            set pending
+            if set kind (__%(safe_prog_name)s_lookup $cmd_path opt $word); and test "$kind" != flag
+                set pending $word
+            end
+        else if set kind (__%(safe_prog_name)s_lookup $cmd_path cmd $word); or set kind (__%(safe_prog_name)s_lookup $cmd_path alias $word)
+            set cmd_path "$cmd_path $kind"
+            set npos 0
+        else
+            set npos (math $npos + 1)
+        end
+    end
+
+    if string match -q -- '-*' $cur
+        __%(safe_prog_name)s_reply $cmd_path opt
+        return
+    end
+
+    if test -n "$pending"
+        set kind (__%(safe_prog_name)s_lookup $cmd_path opt $pending)
+        set key $pending
+    else if set kind (__%(safe_prog_name)s_lookup $cmd_path pos $npos)
+        set key $npos
+    else if set kind (__%(safe_prog_name)s_lookup $cmd_path pos +)
+        set key +
+    else
+        __%(safe_prog_name)s_reply $cmd_path cmd
+        return
+    end
+
+    switch $kind
+        case choices
+            __%(safe_prog_name)s_reply $cmd_path "val:$key"
+        case file
+            __fish_complete_path $cur
+        case dynamic
+            set -l response (env COMPLETION_LINE=(commandline -cp) COMPLETION_LOCATION=(math (commandline -C) + 1) \\
+%(prog_name)s %(completion_arg)s=complete)
+
+            for completion in $response
+                set -l value (string split --max 1 ":" -- $completion)
+
+                if test $value[1] = "file"
+                    __fish_complete_path $cur
+                else
+                    printf '%%s\\t%%s\\n' $value[1] $value[2]
+                end
+            end
+    end
+end
+
+complete --no-files --command %(prog_name)s --arguments "(_%(safe_prog_name)s_completion)"
+""",
+        quote=fish_quote,
     ),
 ]
 available_shells = {s.name: s for s in shells}
@@ -0,0 +1,129 @@
+"""Compile a command tree into the table embedded in static completion scripts.
+
+Each record of the table is a tab-separated line of `path, type, name, kind, help`:
+
+- `path`: The canonical subcommand names leading to the command, after a leading `.`
+  for the root command (e.x. `. remote add`).
+- `type`: One of
+    - `cmd`: A subcommand name (or visible alias) offered as a completion.
+    - `alias`: A hidden subcommand name (or alias), which is accepted but not offered.
+    - `opt`: An option name, e.x. `--name`.
+    - `pos`: A positional argument, named by its index (or `+`, for every index beyond
+      the final positional, when it is unbounded).
+    - `val:<key>`: A choice for the value of the option (or positional index) `key`.
+- `name`: The name being completed (or matched against the command line).
+- `kind`: For `cmd`/`alias` records, the canonical subcommand name. For `opt`/`pos`
+  records, how the value is completed:
+    - `flag`: The option accepts no value.
+    - `file`: The value is completed with local file paths.
+    - `choices`: The value is completed with the corresponding `val:<key>` records.
+    - `dynamic`: The value is produced by calling back into the CLI, for args with a
+      custom `Arg.completion` function.
+- `help`: The help text, reduced to a single line.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, Tuple
+
+from cappa.arg import FinalArg
+from cappa.command import FinalCommand
+from cappa.completion.completers import ChoiceCompleter
+from cappa.subcommand import FinalSubcommand
+
+__all__ = [
+    "Record",
+    "collect_records",
+    "format_records",
+]
+
+Record = Tuple[str, str, str, str, str]
+
+root_path = "."
+
+
+def collect_records(command: FinalCommand[Any], path: str = root_path) -> list[Record]:
+    """Produce the completion records for `command`, and every subcommand beneath it."""
+    records: list[Record] = []
+
+    for arg in [*command.options, *command.propagated_arguments]:
+        kind = value_kind(arg)
+        for name in [*(arg.short or []), *(arg.long or [])]:
+            records.append((path, "opt", name, kind, clean_help(arg.help)))
+            records.extend(choice_records(arg, path, name))
+
+    index = 0
+    for positional in command.positional_arguments:
+        if isinstance(positional, FinalSubcommand):
+            records.extend(subcommand_records(positional, path))
+            continue
+
+        kind = value_kind(positional)
+        n = positional.num_args.n
+        keys = [str(index)] if n == -1 else [str(index + i) for i in range(n)]
+        if n == -1:
+            keys.append("+")
+        index += len(keys)
+
+        for key in keys:
+            records.append((path, "pos", key, kind, clean_help(positional.help)))
+            records.extend(choice_records(positional, path, key))
+
+    return records
+
+
+def subcommand_records(arg: FinalSubcommand, path: str) -> Iterable[Record]:
+    for name, command in arg.options.items():
+        visible = not command.hidden
+        yield (
+            path,
+            "cmd" if visible else "alias",
+            name,
+            name,
+            clean_help(command.help),
+        )
+
+        for alias in command.resolved_aliases():
+            alias_type = "cmd" if visible and not alias.hidden else "alias"
+            yield (path, alias_type, alias.name, name, clean_help(command.help))
+
+        yield from collect_records(command, f"{path} {name}")
+
+
+def choice_records(arg: FinalArg[Any], path: str, key: str) -> Iterable[Record]:
+    if not isinstance(arg.completion, ChoiceCompleter):
+        return
+
+    help = clean_help(arg.completion.help)
+    for choice in arg.completion.choices:
+        if choice:
+            yield (path, f"val:{key}", choice, "-", help)
+
+
+def value_kind(arg: FinalArg[Any]) -> str:
+    if arg.num_args.n == 0:
+        return "flag"
+
+    if arg.completion is None:
+        return "file"
+
+    if isinstance(arg.completion, ChoiceCompleter):
+        return "choices"
+
+    return "dynamic"
+
+
+def clean_help(help: str | None) -> str:
+    if not help:
+        return ""
+
+    return re.sub(r"\s+", " ", help.strip().split("\n\n", 1)[0])
+
+
+def format_records(records: Iterable[Record]) -> str:
+    return "\n".join("\t".join(clean_field(f) for f in record) for record in records)
+
+
+def clean_field(value: str) -> str:
+    return re.sub(r"\s+", " ", value)
@@ -2,23 +2,45 @@ from __future__ import annotations
 
 import dataclasses
 import re
-from typing import TYPE_CHECKING, Any
+import shlex
+from typing import TYPE_CHECKING, Any, Callable
 
 if TYPE_CHECKING:
     from cappa.arg import Arg
+    from cappa.command import FinalCommand
 
 
 @dataclasses.dataclass
 class ShellHandler:
     name: str
     template: str
+    static_template: str = ""
+    quote: Callable[[str], str] = shlex.quote
 
     def backend_template(self, prog: str, arg: Arg[Any]) -> str:
+        return self.template % self.template_context(prog, arg)
+
+    def static_backend_template(
+        self, prog: str, arg: Arg[Any], command: FinalCommand[Any]
+    ) -> str:
+        """Produce a script with the completion table for `command` embedded within it.
+
+        Only args with a custom `Arg.completion` function call back into the CLI.
+        """
+        from cappa.completion.static import collect_records, format_records
+
+        spec = format_records(collect_records(command))
+        return self.static_template % {
+            **self.template_context(prog, arg),
+            "spec": self.quote(spec),
+        }
+
+    def template_context(self, prog: str, arg: Arg[Any]) -> dict[str, str]:
         safe_name = re.sub(r"\W*", "", prog.replace("-", "_"), flags=re.ASCII)
 
         assert isinstance(arg.long, list)
         assert len(arg.long) > 0
-        return self.template % {
+        return {
             "prog_name": prog,
             "safe_prog_name": safe_name,
             "completion_arg": arg.long[0],
@@ -1,24 +1,55 @@
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+import inspect
 import os
-from dataclasses import dataclass
+import threading
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     ClassVar,
+    Coroutine,
+    Dict,
     Hashable,
+    Literal,
+    Mapping,
     Protocol,
     TextIO,
+    Tuple,
     Union,
+    cast,
     runtime_checkable,
 )
 
 import rich.prompt
 from typing_extensions import Self, TypeAlias, TypeVar
 
+from cappa.cache import DiskCache
+from cappa.output import Exit
 from cappa.state import State
 from cappa.type_view import Empty, EmptyType
 
+if TYPE_CHECKING:
+    import asyncio
+
+try:
+    import tomllib as _tomllib
+
+    tomllib: ModuleType | None = _tomllib
+except ImportError:  # pragma: no cover
+    try:
+        import tomli as _tomli  # pyright: ignore[reportMissingImports]
+
+        tomllib = _tomli
+    except ImportError:
+        tomllib = None
+
 T = TypeVar("T")
 
 
@@ -114,17 +145,39 @@ class Default:
         return self.fallback_to(other)
 
     def __call__(
-        self, state: State[Any] | None = None, input: TextIO | None = None
+        self,
+        state: State[Any] | None = None,
+        input: TextIO | None = None,
+        sources: DefaultSources | None = None,
     ) -> tuple[bool, Any]:
-        """Evaluate the default retrieval sequence, returning the first non-Empty value."""
-        for default in self.sequence:
+        """Evaluate the default retrieval sequence, returning the first non-Empty value.
+
+        `sources` is an optional per-invocation snapshot of the external sources
+        (environment, config files) against which `Env`/`Config` defaults are resolved.
+        """
+        for index, default in enumerate(self.sequence):
             if isinstance(default, ValueFrom):
                 value = default(state=state)
             elif isinstance(default, (Prompt, Confirm)):
                 value = default(input=input)
+            elif isinstance(default, Env):
+                value = default(environ=sources.environ if sources else None)
+            elif isinstance(default, Config):
+                value = default(sources=sources)
             else:
                 value = default()
 
+            if isinstance(default, (AsyncPrompt, AsyncConfirm)):
+                # Whether the prompt produces a value is only known once it's answered,
+                # at which point the remainder of the sequence may yet need evaluating.
+                remainder = Default(*self.sequence[index + 1 :], default=self.default)
+                return default.is_parsed, remainder.fallback_from_async(
+                    cast(Coroutine[Any, Any, Any], value),
+                    state=state,
+                    input=input,
+                    sources=sources,
+                )
+
             if value is not Empty:
                 return default.is_parsed, value
 
@@ -133,11 +186,66 @@ class Default:
 
         return True, self.default
 
+    async def fallback_from_async(
+        self,
+        value: Coroutine[Any, Any, Any],
+        state: State[Any] | None = None,
+        input: TextIO | None = None,
+        sources: DefaultSources | None = None,
+    ) -> Any:
+        """Await an async prompt's `value`, falling back to `self` if it's Empty.
+
+        Values produced by `self` which should not be parsed are wrapped in
+        `ParsedValue`, given that the caller has already committed to the prompt's
+        `is_parsed`.
+        """
+        result = await value
+        if result is not Empty:
+            return result
+
+        is_parsed, result = self(state=state, input=input, sources=sources)
+        if inspect.iscoroutine(result):
+            result = await result
+
+        if is_parsed and not isinstance(result, ParsedValue):
+            return ParsedValue(result)
+        return result
+
     @property
     def has_value(self) -> bool:
         """Whether the default instance **has** a default or if it's Empty."""
         return not self.sequence and self.default is Empty
 
+    @property
+    def env_vars(self) -> tuple[str, ...]:
+        """All environment variable names consulted by the default, in order."""
+        return tuple(
+            env_var
+            for d in self.sequence
+            if isinstance(d, Env)
+            for env_var in d.env_vars
+        )
+
+    @property
+    def has_external_source(self) -> bool:
+        """Whether the default can be fulfilled by an environment variable or config file."""
+        return any(isinstance(d, (Env, Config)) for d in self.sequence)
+
+    def has_external_value(self, sources: DefaultSources | None = None) -> bool:
+        """Whether any of the default's environment variables or config keys are set.
+
+        Checked against `sources` (the invocation's snapshot), if supplied.
+        """
+        environ = sources.environ if sources else os.environ
+        if any(env_var in environ for env_var in self.env_vars):
+            return True
+
+        return any(
+            d(sources=sources) is not Empty
+            for d in self.sequence
+            if isinstance(d, Config)
+        )
+
     @property
     def fallback_value(self) -> Any:
         return next(
@@ -177,9 +285,14 @@ class Env(DefaultType):
         object.__setattr__(self, "env_vars", (env_var, *env_vars))
         object.__setattr__(self, "default", default)
 
-    def __call__(self) -> str | EmptyType | None:
+    def __call__(
+        self, environ: Mapping[str, str] | None = None
+    ) -> str | EmptyType | None:
+        if environ is None:
+            environ = os.environ
+
         for env_var in self.env_vars:
-            value = os.getenv(env_var)
+            value = environ.get(env_var)
             if value is not None:
                 return value
 
@@ -238,6 +351,88 @@ class Confirm(rich.prompt.Confirm, DefaultType):
         return super().__call__(default=Empty, stream=input)
 
 
+class AsyncPrompt(Prompt):
+    """Prompt the user for a value, without blocking the event loop.
+
+    For use with `parse_async`/`invoke_async`. Input is read on a background thread,
+    such that other async defaults (and parsers) resolve concurrently with the prompt.
+    Prompts are still asked one at a time, in the order of their arguments.
+
+    Examples:
+        >>> from cappa import Arg, AsyncPrompt
+        >>> arg = Arg(default=AsyncPrompt("Ask user for value"))
+    """
+
+    async def __call__(self, input: TextIO | None = None):  # type: ignore
+        ask = super().__call__
+        return await ask_async(lambda: ask(input=input))
+
+
+class AsyncConfirm(Confirm):
+    """Prompt the user for a confirmation, without blocking the event loop.
+
+    See `AsyncPrompt`.
+
+    Examples:
+        >>> from cappa import Arg, AsyncConfirm
+        >>> arg = Arg(default=AsyncConfirm("Confirm with user"))
+    """
+
+    async def __call__(self, input: TextIO | None = None):  # type: ignore
+        ask = super().__call__
+        return await ask_async(lambda: ask(input=input))
+
+
+# The lock serializing the prompts of each running event loop.
+_prompt_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def ask_async(ask: Callable[[], T]) -> T:
+    """Call the blocking `ask` on a daemon thread, one prompt at a time.
+
+    The lock is acquired in the order in which prompts are awaited, so prompts are
+    asked in a deterministic order. A daemon thread (rather than an executor) is used
+    such that a prompt abandoned on cancellation never blocks interpreter shutdown.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    lock = _prompt_locks.get(loop)
+    if lock is None:
+        lock = _prompt_locks[loop] = asyncio.Lock()
+
+    async with lock:
+        future: asyncio.Future[T] = loop.create_future()
+
+        def set_result(result: T) -> None:
+            if not future.done():
+                future.set_result(result)
+
+        def set_exception(exception: BaseException) -> None:
+            if not future.done():
+                future.set_exception(exception)
+
+        def read() -> None:
+            try:
+                result = ask()
+            except BaseException as e:
+                loop.call_soon_threadsafe(set_exception, e)
+            else:
+                loop.call_soon_threadsafe(set_result, result)
+
+        threading.Thread(target=read, name="cappa-prompt", daemon=True).start()
+        return await future
+
+
+@dataclass(frozen=True)
+class ParsedValue:
+    """An async default's value which has already been parsed (or needs no parsing)."""
+
+    value: Any
+
+
 @dataclass(frozen=True)
 class Value(DefaultType):
     value: Any
@@ -262,16 +457,38 @@ class ValueFrom(DefaultType):
         ...         return f.read()
         >>>
         >>> arg = Arg(default=ValueFrom(from_file, name="config.json"))
+
+    See `ValueFrom.cached` to persist the result across invocations.
     """
 
     callable: Callable[..., Any]
     kwargs: dict[str, Any]
+    cache: DiskCache | None = None
 
     is_parsed: ClassVar[bool] = True
 
     def __init__(self, callable: Callable[..., Any], **kwargs: Any):
         object.__setattr__(self, "callable", callable)
         object.__setattr__(self, "kwargs", kwargs)
+        object.__setattr__(self, "cache", None)
+
+    @classmethod
+    def cached(
+        cls, cache: DiskCache, callable: Callable[..., Any], /, **kwargs: Any
+    ) -> ValueFrom:
+        """Produce a `ValueFrom` whose result is persisted across invocations by `cache`.
+
+        For functions which are slow, but whose result is stable. All `**kwargs` are
+        supplied to `callable`, as with `ValueFrom`.
+
+        Examples:
+            >>> from cappa import Arg, DiskCache, ValueFrom
+            >>> def git_root(): ...
+            >>> arg = Arg(default=ValueFrom.cached(DiskCache(ttl=3600), git_root))
+        """
+        result = cls(callable, **kwargs)
+        object.__setattr__(result, "cache", cache)
+        return result
 
     def __call__(self, state: State[Any] | None = None):
         from cappa.invoke.base import fulfill_deps
@@ -282,9 +499,241 @@ class ValueFrom(DefaultType):
             resolved = fulfill_deps(self.callable, deps, allow_empty=True)
             kwargs = {**resolved.kwargs, **self.kwargs}
 
+        if self.cache:
+            return self.cache(self.callable, kwargs)
         return self.callable(**kwargs)
 
 
+ConfigFormat: TypeAlias = Literal["toml", "json", "ini"]
+
+# Process-wide cache of parsed config files: path -> (content digest, parsed content).
+_config_cache: Dict[Path, Tuple[str, Mapping[str, Any]]] = {}
+
+
+@dataclass(frozen=True)
+class ConfigSource:
+    """Describe a configuration file from which a command's arguments can be defaulted.
+
+    The file is read and parsed at most once per invocation, and only if some argument
+    actually falls back to it. Parsed content is additionally cached by content hash,
+    so that long-lived processes skip re-parsing unchanged files.
+
+    A missing file is treated as though it were empty.
+
+    Arguments:
+        path: The path to the config file.
+        format: One of "toml", "json", or "ini". Defaults to inferring the format
+            from the file's suffix.
+        section: An optional "."-separated path to the table/object within the file
+            which holds the command's values, e.x. `tool.mytool` in a `pyproject.toml`.
+            For "ini" files, this is the section name.
+
+    Examples:
+        >>> from cappa import ConfigSource, command
+        >>> @command(config=ConfigSource("pyproject.toml", section="tool.mytool"))
+        ... class Example:
+        ...     host: str = "localhost"
+    """
+
+    path: str | os.PathLike[str]
+    format: ConfigFormat | None = None
+    section: str | None = None
+
+    @property
+    def resolved_format(self) -> ConfigFormat:
+        if self.format is not None:
+            return self.format
+
+        suffix = Path(self.path).suffix.lower()
+        if suffix == ".toml":
+            return "toml"
+        if suffix == ".json":
+            return "json"
+        if suffix in {".ini", ".cfg"}:
+            return "ini"
+
+        raise ValueError(
+            f"Cannot infer config format of `{self.path}`, supply `ConfigSource(format=...)`."
+        )
+
+    def load(self) -> Mapping[str, Any]:
+        """Read and parse the file, returning the mapping described by `section`."""
+        path = Path(self.path)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return {}
+
+        digest = hashlib.sha1(content).hexdigest()  # noqa: S324
+        cached = _config_cache.get(path)
+        if cached and cached[0] == digest:
+            data = cached[1]
+        else:
+            data = self.parse(content)
+            _config_cache[path] = (digest, data)
+
+        return self.select_section(data)
+
+    def parse(self, content: bytes) -> Mapping[str, Any]:
+        format = self.resolved_format
+        if format == "toml" and tomllib is None:  # pragma: no cover
+            raise RuntimeError(
+                "TOML config files require Python 3.11+ or the `tomli` package."
+            )
+
+        try:
+            if format == "toml":
+                assert tomllib
+                return tomllib.loads(content.decode())
+
+            if format == "json":
+                import json
+
+                return json.loads(content)
+
+            import configparser
+
+            parser = configparser.ConfigParser()
+            parser.read_string(content.decode())
+            return {name: dict(parser[name]) for name in parser.sections()}
+        except Exception as e:
+            raise Exit(f"Invalid config file `{self.path}`: {e}", code=2)
+
+    def select_section(self, data: Mapping[str, Any]) -> Mapping[str, Any]:
+        if not self.section:
+            return data
+
+        sections = (
+            [self.section] if self.resolved_format == "ini" else self.section.split(".")
+        )
+        for section in sections:
+            value = data.get(section)
+            if not isinstance(value, Mapping):
+                return {}
+            data = value  # pyright: ignore
+        return data
+
+    def key(self, key: str) -> Config:
+        """Produce a `Config` default which reads `key` from this source."""
+        return Config(self, key)
+
+
+@dataclass(frozen=True)
+class Config(DefaultType):
+    """Lazily read a value from a `ConfigSource`.
+
+    Generally produced automatically for each argument of a command with an associated
+    `Command.config`, but can also be supplied explicitly, e.x.
+    `Arg(default=Env("FOO") | source.key("foo"))`.
+
+    Keys are looked up verbatim, falling back to the "-"-separated form of the key.
+
+    Like `Env`, values produced by `Config` **do** invoke the `Arg.parse` parser.
+    """
+
+    source: ConfigSource
+    name: str
+
+    def __call__(self, sources: DefaultSources | None = None) -> Any:
+        data = sources.config(self.source) if sources else self.source.load()
+
+        for name in (self.name, self.name.replace("_", "-")):
+            if name in data:
+                return data[name]
+
+        return Empty
+
+
+@dataclass
+class DefaultSources:
+    """A per-invocation snapshot of the external sources which defaults can be read from.
+
+    The environment is captured once, and config files are loaded lazily on first
+    use, such that all arguments of a single invocation observe the same state.
+    """
+
+    environ: Mapping[str, str] = field(default_factory=lambda: dict(os.environ))
+    configs: dict[ConfigSource, Mapping[str, Any]] = field(default_factory=lambda: {})
+
+    def config(self, source: ConfigSource) -> Mapping[str, Any]:
+        result = self.configs.get(source)
+        if result is None:
+            result = self.configs[source] = source.load()
+        return result
+
+
+@dataclass(frozen=True)
+class LazyDefault:
+    """A not-yet-evaluated `Arg(lazy_default=True)` default, held by a command instance.
+
+    Resolved (and replaced by its value) by `LazyField`, upon first access of the field.
+    """
+
+    resolve: Callable[[], Any]
+
+
+class LazyDefaultError(ValueError):
+    """Raised upon first access of a `LazyDefault` field, whose value failed to parse.
+
+    Unlike the underlying `Exit` (a `SystemExit`), an ordinary exception, such that an
+    incidental access (e.x. the dataclass `__repr__`) cannot exit the process. Under
+    `invoke`, it is reported (and exits) as its `exit`, as any other parse error would.
+    """
+
+    def __init__(self, exit: Exit):
+        super().__init__(str(exit.message))
+        self.exit = exit
+
+
+class LazyField:
+    """Class-level data descriptor which resolves a `LazyDefault` upon first access.
+
+    All other values pass through unchanged, so the descriptor is transparent to
+    instances constructed outside of cappa.
+    """
+
+    def __init__(self, name: str, default: Any = Empty):
+        self.name = name
+        self.default = default
+
+    @classmethod
+    def install(cls, cmd_cls: type, name: str) -> None:
+        existing = getattr(cmd_cls, name, Empty)
+        if isinstance(existing, LazyField):
+            return
+
+        qualname = cmd_cls.__qualname__
+        if not dataclasses.is_dataclass(cmd_cls) or "__slots__" in vars(cmd_cls):
+            raise ValueError(
+                f"`Arg.lazy_default` on `{qualname}.{name}` requires a "
+                "dataclass without `__slots__`."
+            )
+
+        setattr(cmd_cls, name, cls(name, existing))
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            if self.default is Empty:
+                raise AttributeError(self.name)
+            return self.default
+
+        try:
+            value = instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+        if isinstance(value, LazyDefault):
+            try:
+                value = value.resolve()
+            except Exit as e:
+                raise LazyDefaultError(e) from e
+            instance.__dict__[self.name] = value
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__[self.name] = value
+
+
 @dataclass
 class DefaultFormatter:
     format: str = "{default}"
@@ -322,7 +771,7 @@ class DefaultFormatter:
 
 PromptType = rich.prompt.Prompt
 ConfirmType = rich.prompt.Confirm
-default_types = (rich.prompt.Prompt, rich.prompt.Confirm, Env, ValueFrom)
+default_types = (rich.prompt.Prompt, rich.prompt.Confirm, Env, ValueFrom, Config)
 DefaultTypes: TypeAlias = Union[
     Default, DefaultType, rich.prompt.Prompt, rich.prompt.Confirm
 ]
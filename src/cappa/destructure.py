@@ -7,7 +7,7 @@ from type_lens import TypeView
 from typing_extensions import Annotated
 
 from cappa.arg import FinalArg
-from cappa.default import Default
+from cappa.default import ConfigSource, Default, DefaultSources
 from cappa.invoke.types import Resolved
 from cappa.output import Output
 from cappa.state import State
@@ -26,6 +26,8 @@ class Destructure:
         type_view: TypeView[Any],
         default_short: bool = False,
         default_long: bool = False,
+        env_prefix: str | None = None,
+        config: ConfigSource | None = None,
     ) -> FinalDestructure[Any] | None:
         if not destructure:
             return None
@@ -45,7 +47,7 @@ class Destructure:
             default_short=inner.default_short or default_short,
             default_long=inner.default_long or default_long,
         )
-        command: FinalCommand[Any] = inner.collect()
+        command: FinalCommand[Any] = inner.collect(env_prefix=env_prefix, config=config)
         return FinalDestructure(
             field_name=field_name,
             command=command,
@@ -80,13 +82,14 @@ class FinalDestructure(Destructure, Generic[T]):
         output: Output,
         state: State[Any] | None = None,
         input: TextIO | None = None,
+        sources: DefaultSources | None = None,
     ) -> Resolved[T]:
         if self.is_optional and not parsed_args:
-            _, value = self.default(state=state, input=input)
+            _, value = self.default(state=state, input=input, sources=sources)
             return Resolved(lambda: value)
 
         return self.command.map_result(
-            self.command, prog, parsed_args, output, state, input
+            self.command, prog, parsed_args, output, state, input, sources=sources
         )[0]
 
     def explode_args(self) -> list[FinalArg[Any] | FinalDestructure[Any]]:
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator, Sequence, cast
+
+from cappa.invoke.types import Resolved
+from cappa.output import Exit, Output
+from cappa.type_view import Empty
+
+__all__ = [
+    "Fanout",
+    "jobs_field_name",
+    "parse_jobs",
+]
+
+# The `-j/--jobs` option has no value on the command itself, so its field name is chosen
+# to never collide with a real field.
+jobs_field_name = "__jobs__"
+
+
+def parse_jobs(value: str) -> int:
+    """Parse a `-j/--jobs` value, where `0` means one per CPU."""
+    jobs = int(value)
+    if jobs < 0:
+        raise ValueError("must be 0 (one per CPU) or greater")
+    return jobs
+
+
+@dataclass(frozen=True)
+class Fanout:
+    """Describes the per-value invocations of a command with an `Arg(fanout=True)`.
+
+    Produced as an implicit dependency of the command during parsing, and consumed by
+    `invoke` in place of invoking the command once.
+
+    Arguments:
+        cmd_cls: The command class whose field is fanned out.
+        field_name: The fanned out field.
+        instance: The full command instance, holding every value.
+        jobs: The maximum number of concurrent invocations. `0` uses one per CPU.
+    """
+
+    cmd_cls: type
+    field_name: str
+    instance: Resolved[Any]
+    jobs: int = 1
+
+    @property
+    def workers(self) -> int:
+        return self.jobs or os.cpu_count() or 1
+
+    def instances(self) -> Iterator[Resolved[Any]]:
+        """Produce a command instance per value, each holding a single-element sequence.
+
+        The full `instance` must already have been resolved, such that every other
+        field's value (e.x. an evaluated default, or an opened file) is produced once,
+        and shared by each invocation.
+        """
+        kwargs = {
+            key: resolved_value(value) for key, value in self.instance.kwargs.items()
+        }
+        values: Any = kwargs.pop(self.field_name)
+
+        sequence_type = cast(Callable[[list[Any]], Any], type(values or []))
+        for value in values or ():
+            yield Resolved(
+                self.instance.callable,
+                kwargs={**kwargs, self.field_name: sequence_type([value])},
+            )
+
+    def run(
+        self, call: Callable[[Resolved[Any]], Any], output: Output | None = None
+    ) -> list[Any]:
+        """Call `call` once per instance on a thread pool, returning results in order."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        instances = list(self.instances())
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(call, instance) for instance in instances]
+
+        outcomes: list[tuple[Any, Exit | None]] = []
+        for future in futures:
+            try:
+                outcomes.append((future.result(), None))
+            except Exit as e:
+                outcomes.append((None, e))
+
+        return self.aggregate(outcomes, output)
+
+    async def run_async(
+        self,
+        call: Callable[[Resolved[Any]], Awaitable[Any]],
+        output: Output | None = None,
+    ) -> list[Any]:
+        """Await `call` once per instance as asyncio tasks, returning results in order."""
+        import asyncio
+
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def bounded(instance: Resolved[Any]) -> tuple[Any, Exit | None]:
+            async with semaphore:
+                try:
+                    return await call(instance), None
+                except Exit as e:
+                    return None, e
+
+        outcomes = await asyncio.gather(*(bounded(i) for i in self.instances()))
+        return self.aggregate(outcomes, output)
+
+    def aggregate(
+        self, outcomes: Sequence[tuple[Any, Exit | None]], output: Output | None = None
+    ) -> list[Any]:
+        """Collect the per-value results, raising a combined `Exit` if any failed.
+
+        Each failure's own message has already been output by its invocation, so the
+        combined `Exit` only summarizes, with the exit code of the first failure.
+        """
+        failures = [e for _, e in outcomes if e is not None and e.code]
+        if failures:
+            with Resolved.handle_exit(output):
+                raise Exit(
+                    f"{len(failures)} of {len(outcomes)} invocations failed.",
+                    code=failures[0].code,
+                )
+
+        return [result for result, _ in outcomes]
+
+
+def resolved_value(value: Any) -> Any:
+    if isinstance(value, Resolved):
+        result = cast(Resolved[Any], value).result
+        if result is Empty:
+            raise RuntimeError("The command must be resolved before being fanned out.")
+        return result
+    return value
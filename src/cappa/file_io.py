@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import sys
 from dataclasses import dataclass
-from typing import IO, Any, BinaryIO, TextIO
+from typing import IO, Any, AnyStr, BinaryIO, Generic, Iterator, TextIO
 
 import cappa
 
@@ -21,6 +21,10 @@ class FileMode:
         errors: A string indicating how encoding and decoding errors are to
             be handled. Passes directly through to builtin `open()`.
 
+        chunk_size: Only relevant to `Iterator[str]`/`Iterator[bytes]` annotated arguments.
+            When supplied, the file is streamed in chunks of (at most) `chunk_size`
+            characters/bytes, rather than line by line. Note this is **not** an `open()`
+            argument.
         error_code: The exit code to use when an error occurs. Defaults to 1. Note this is **not**
             an `open()` argument.
     """
@@ -30,6 +34,7 @@ class FileMode:
     encoding: str | None = None
     errors: str | None = None
 
+    chunk_size: int | None = None
     error_code: int = 1
 
     def __call__(self, filename: str) -> IO[Any] | TextIO | BinaryIO:
@@ -59,3 +64,71 @@ class FileMode:
             return open(filename, self.mode, self.buffering, self.encoding, self.errors)
         except OSError as e:
             raise cappa.Exit(f"Cannot open {filename}: {e}", code=self.error_code)
+
+    def stream(self, filename: str) -> FileStream[Any]:
+        """Open the given `filename`, returning an iterator over its lines or chunks.
+
+        The underlying file is closed when the returned `FileStream` is closed,
+        except for the "-" (stdin) file name, which is left open.
+        """
+        file = self(filename)
+        return FileStream(file, chunk_size=self.chunk_size, owned=filename != "-")
+
+
+class FileStream(Generic[AnyStr]):
+    """A lazy, constant-memory iterator over the lines or chunks of an open file.
+
+    Binary files streamed in chunks are read with `readinto` into a single
+    reused buffer, rather than allocating a fresh read buffer per chunk.
+
+    Doubles as a context manager, so that the underlying file is closed along with
+    the rest of the invoke context.
+    """
+
+    def __init__(
+        self, file: IO[AnyStr], *, chunk_size: int | None = None, owned: bool = True
+    ):
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("`FileMode.chunk_size` must be a positive integer.")
+
+        self.file: IO[AnyStr] = file
+        self.owned = owned
+
+        self._iter: Iterator[AnyStr] = (
+            iter_chunks(file, chunk_size) if chunk_size else iter(file)
+        )
+
+    def __iter__(self) -> FileStream[AnyStr]:
+        return self
+
+    def __next__(self) -> AnyStr:
+        return next(self._iter)
+
+    def __enter__(self) -> FileStream[AnyStr]:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.owned:
+            self.file.close()
+
+
+def iter_chunks(file: IO[Any], chunk_size: int) -> Iterator[Any]:
+    readinto = getattr(file, "readinto", None)
+    if readinto is None:
+        # Text files have no `readinto`; decoding necessitates a new string per chunk anyways.
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        size = readinto(buffer)
+        if not size:
+            return
+        yield bytes(view[:size])
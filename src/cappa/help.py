@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 import typing
 from collections.abc import Iterable
 from dataclasses import dataclass, replace
@@ -122,6 +123,7 @@ class HelpFormattable(typing.Protocol):
     left_padding: Dimension
     arg_format: ArgFormat | ArgFormats
     default_format: str
+    env_format: str
 
     def long(
         self, command: FinalCommand[Any], prog: str
@@ -138,9 +140,11 @@ class HelpFormatter(HelpFormattable):
     arg_format: ArgFormat | ArgFormats = (
         Markdown("{help}"),
         Markdown("{choices}"),
+        Markdown("{env}", style="dim italic"),
         Markdown("{default}", style="dim italic"),
     )
     default_format: str = "(Default: {default})"
+    env_format: str = "(Env: {env})"
 
     default: typing.ClassVar[HelpFormatter]
 
@@ -182,6 +186,9 @@ class HelpFormatter(HelpFormattable):
     def with_default_format(self, format: str) -> Self:
         return replace(self, default_format=format)
 
+    def with_env_format(self, format: str) -> Self:
+        return replace(self, env_format=format)
+
 
 HelpFormatter.default = HelpFormatter()
 
@@ -228,7 +235,38 @@ def format_args(
 ) -> Displayable:
     """Format multiple args with the same field_name by concatenating their help texts."""
     segments: list[TextComponent] = []
+    for format_segment, formatted_text in _format_arg_segments(help_formatter, args):
+        segment = _replace_rich_text_component(format_segment, formatted_text)
+        if segment:
+            segments.append(segment)
+
+    return _markdown_to_text(console, segments)
+
+
+def format_args_plain(help_formatter: HelpFormattable, *args: FinalArg[Any]) -> str:
+    """Format args as with `format_args`, but as plain text, without rendering through rich.
+
+    Markdown segments are left as their (formatted) source text, less bold/code markers.
+    This is used for completion descriptions, where rendering every candidate would
+    dominate the latency.
+    """
+    segments: list[str] = []
+    for format_segment, formatted_text in _format_arg_segments(help_formatter, args):
+        if isinstance(format_segment, Markdown):
+            formatted_text = re.sub(r"\*\*|`", "", formatted_text)
+        else:
+            formatted_text = Text.from_markup(formatted_text).plain
 
+        text = " ".join(formatted_text.split())
+        if text:
+            segments.append(text)
+
+    return " ".join(segments)
+
+
+def _format_arg_segments(
+    help_formatter: HelpFormattable, args: Sequence[FinalArg[Any]]
+) -> Iterable[tuple[TextComponent, str]]:
     for arg in args:
         unknown_arg_format = help_formatter.arg_format
         if isinstance(unknown_arg_format, Iterable) and not isinstance(
@@ -247,10 +285,16 @@ def format_args(
             if arg.choices:
                 choices = "Valid options: " + ", ".join(arg.choices) + "."
 
+            env = ""
+            env_vars = arg.default.env_vars
+            if env_vars:
+                env = help_formatter.env_format.format(env=", ".join(env_vars))
+
             context: dict[str, Any] = {
                 "help": arg.help or "",
                 "default": default,
                 "choices": choices,
+                "env": env,
                 "arg": arg,
             }
 
@@ -261,13 +305,7 @@ def format_args(
             if not format_segment_text:
                 continue
 
-            formatted_text = format_segment_text.format(**context)
-            segment = _replace_rich_text_component(format_segment, formatted_text)
-
-            if segment:
-                segments.append(segment)
-
-    return _markdown_to_text(console, segments)
+            yield format_segment, format_segment_text.format(**context)
 
 
 def _markdown_to_text(console: Console, renderables: Sequence[TextComponent]) -> Text:
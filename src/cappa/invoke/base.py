@@ -3,6 +3,9 @@ from __future__ import annotations
 import contextlib
 import importlib
 import inspect
+import sys
+import threading
+import weakref
 from typing import (
     Any,
     AsyncGenerator,
@@ -18,6 +21,7 @@ from typing_extensions import TypeGuard
 
 from cappa.class_inspect import has_command
 from cappa.command import Command
+from cappa.invoke.executor import ExecutorType
 from cappa.invoke.types import (
     C,
     Dep,
@@ -43,7 +47,13 @@ def resolve_callable(
     output: Output,
     state: State[Any],
     deps: DepTypes = None,
+    shared_deps: dict[Hashable, Any] | None = None,
 ) -> tuple[Resolved[C], Sequence[Resolved[Any]]]:
+    """Resolve the invoke handler of `parsed_command`, and its dependencies.
+
+    When given, `shared_deps` seeds (and is updated with) the explicit `Dep`s resolved
+    for this invocation, such that a chain of invocations can share dep instances.
+    """
     try:
         fn: Callable[..., Any] = resolve_invoke_handler(parsed_command, implicit_deps)
 
@@ -54,8 +64,17 @@ def resolve_callable(
 
         global_deps = resolve_global_deps(deps, implicit_deps)
 
-        fulfilled_deps: dict[Hashable, Any] = {**implicit_deps, **global_deps}
-        resolved = fulfill_deps(fn, fulfilled_deps)
+        fulfilled_deps: dict[Hashable, Any] = {
+            **(shared_deps or {}),
+            **implicit_deps,
+            **global_deps,
+        }
+        resolved = fulfill_deps(fn, fulfilled_deps, executor=parsed_command.executor)
+
+        if shared_deps is not None:
+            for key, value in fulfilled_deps.items():
+                if isinstance(key, Dep):
+                    shared_deps[key] = value
     except InvokeResolutionError as e:
         raise InvokeResolutionError(
             f"Failed to invoke {parsed_command.cmd_cls} due to resolution failure."
@@ -80,7 +99,7 @@ def resolve_global_deps(
         # Deps need to be fulfilled, whereas raw values are taken directly.
         if isinstance(dep, Dep):
             dep_callable = resolve_callable_reference(dep.callable)  # pyright: ignore
-            value = fulfill_deps(dep_callable, implicit_deps)
+            value = fulfill_deps(dep_callable, implicit_deps, executor=dep.executor)
         else:
             value = Resolved(source_function, result=dep)
 
@@ -93,6 +112,21 @@ def resolve_global_deps(
     return result
 
 
+def resolve_session_deps(
+    deps: DepTypes, output: Output, stack: contextlib.ExitStack
+) -> dict[InvokeCallableSpec[Any], Any]:
+    """Resolve `deps` once, such that the values can be shared by many invocations.
+
+    Each dep's context is entered on `stack`, and the resolved values are returned in the
+    mapping form of `DepTypes` (which is then accepted by `invoke` as literal values).
+    """
+    result: dict[InvokeCallableSpec[Any], Any] = {}
+    for dep, resolved in resolve_global_deps(deps, {Output: output}).items():
+        source = cast(Dep[Any], dep).callable
+        result[source] = stack.enter_context(resolved.get(output=output))
+    return result
+
+
 def resolve_invoke_handler(
     command: Command[C], implicit_deps: dict[Hashable, Any]
 ) -> Callable[..., C]:
@@ -111,6 +145,40 @@ def resolve_invoke_handler(
     return resolve_callable_reference(fn)
 
 
+def prefetch_modules(command: Command[Any]) -> threading.Thread | None:
+    """Import the modules `command` will need, on a background (daemon) thread.
+
+    This includes the module of a string `invoke` target, and any `Command.preload`
+    modules. Called as soon as the parser selects `command`, such that (potentially
+    slow) imports overlap with the remainder of parsing, default resolution and prompts,
+    rather than starting only once `resolve_callable_reference` needs the module.
+
+    Import errors are ignored here; they will be re-raised (and reported) by the
+    subsequent import on the main thread.
+    """
+    module_names = list(command.preload)
+    if isinstance(command.invoke, str) and "." in command.invoke:
+        module_names.append(command.invoke.rsplit(".", 1)[0])
+
+    module_names = [name for name in module_names if name not in sys.modules]
+    if not module_names:
+        return None
+
+    thread = threading.Thread(
+        target=import_modules, args=(module_names,), name="cappa-prefetch", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def import_modules(module_names: list[str]) -> None:
+    for module_name in module_names:
+        try:
+            importlib.import_module(module_name)
+        except Exception:  # noqa: S112
+            continue
+
+
 def resolve_callable_reference(fn: InvokeCallableSpec[C] | None) -> InvokeCallable[C]:
     if isinstance(fn, str):
         try:
@@ -142,24 +210,55 @@ def resolve_callable_reference(fn: InvokeCallableSpec[C] | None) -> InvokeCallab
     return cast(Callable[..., Any], fn)
 
 
+_callable_views: weakref.WeakKeyDictionary[Callable[..., Any], CallableView | None] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_callable_view(fn: Callable[..., Any]) -> CallableView | None:
+    """Produce the `CallableView` of `fn`, or `None` if it cannot be inspected.
+
+    Inspecting a signature is comparatively expensive, and the parser fulfills the deps
+    of an arg's action for every value it parses, so views are cached by callable.
+    """
+    try:
+        return _callable_views[fn]
+    except (KeyError, TypeError):
+        pass
+
+    try:
+        callable_view = CallableView.from_callable(fn, include_extras=True)
+    except (ValueError, AttributeError):
+        # ValueError is common amongst builtins. Perhaps TypeView ought to be handling this.
+        # AttributeError is currently an issue with Enums, I think TypeView should **definitely**
+        # handle this.
+        callable_view = None
+
+    # Callables which can't be weakly referenced (or hashed) are simply not cached.
+    with contextlib.suppress(TypeError):
+        _callable_views[fn] = callable_view
+    return callable_view
+
+
 def fulfill_deps(
-    fn: Callable[..., C], fulfilled_deps: dict[Hashable, Any], allow_empty: bool = False
+    fn: Callable[..., C],
+    fulfilled_deps: dict[Hashable, Any],
+    allow_empty: bool = False,
+    executor: ExecutorType | None = None,
 ) -> Resolved[C]:
     args: list[Any] = []
     result: dict[str, Any] = {}
 
     try:
-        callable_view = CallableView.from_callable(fn, include_extras=True)
+        callable_view = get_callable_view(fn)
     except NameError as e:  # pragma: no cover
         name = getattr(e, "name", None) or str(e)
         raise InvokeResolutionError(
             f"Could not collect resolve reference to {name} for `{getattr(fn, '__name__', '')}`"
         )
-    except (ValueError, AttributeError):
-        # ValueError is common amongst builtins. Perhaps TypeView ought to be handling this.
-        # AttributeError is currently an issue with Enums, I think TypeView should **definitely**
-        # handle this.
-        return Resolved(fn, result)
+
+    if callable_view is None:
+        return Resolved(fn, result, executor=executor)
 
     for index, param_view in enumerate(callable_view.parameters):
         type_view: TypeView[Any] = param_view.type_view  # pyright: ignore
@@ -181,12 +280,15 @@ def fulfill_deps(
 
             # Whereas everything else should be a resolvable explicit Dep, which might have either
             # already been fullfullfilled, or yet need to be.
-            if dep not in fulfilled_deps:
-                fulfilled_deps[dep] = fulfill_deps(
-                    cast(Callable[..., Any], dep.callable), fulfilled_deps
+            key = dep.key()
+            if key not in fulfilled_deps:
+                fulfilled_deps[key] = fulfill_deps(
+                    cast(Callable[..., Any], dep.callable),
+                    fulfilled_deps,
+                    executor=dep.executor,
                 )
 
-            result[param_view.name] = fulfilled_deps[dep]
+            result[param_view.name] = fulfilled_deps[key]
 
         # Method `self` arguments can be assumed to be typed as the literal class they reside inside,
         # These classes should always be already fulfilled by the root command structure.
@@ -216,7 +318,7 @@ def fulfill_deps(
                 f"is not a valid dependency for Dep({fn.__name__})."
             )
 
-    return Resolved(fn, kwargs=result, args=tuple(args))
+    return Resolved(fn, kwargs=result, args=tuple(args), executor=executor)
 
 
 def is_implicit_context_manager(
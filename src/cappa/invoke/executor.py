@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Callable, Literal
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+__all__ = [
+    "ExecutorType",
+    "Executors",
+]
+
+ExecutorType = Literal["thread", "process"]
+
+
+@dataclass
+class Executors:
+    """The executor pools shared by every offloaded callable in an `invoke_async` call.
+
+    Pools are created lazily (so an invocation which offloads nothing creates none), are
+    bounded by their default worker counts, and are shut down with `shutdown`.
+
+    Arguments:
+        default: The executor used by callables which do not specify their own. `None`
+            leaves them on the event loop.
+    """
+
+    default: ExecutorType | None = None
+    pools: dict[ExecutorType, Executor] = field(default_factory=lambda: {})
+
+    def get(self, kind: ExecutorType) -> Executor:
+        pool = self.pools.get(kind)
+        if pool is None:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+            if kind == "thread":
+                pool = ThreadPoolExecutor(thread_name_prefix="cappa")
+            elif kind == "process":
+                pool = ProcessPoolExecutor()
+            else:
+                raise ValueError(
+                    f"Invalid executor `{kind}`, expected one of: 'thread', 'process'."
+                )
+            self.pools[kind] = pool
+        return pool
+
+    async def run(
+        self, kind: ExecutorType, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Call `fn` on the `kind` executor, without blocking the event loop."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.get(kind), functools.partial(fn, *args, **kwargs)
+        )
+
+    @contextlib.asynccontextmanager
+    async def enter_context(
+        self, kind: ExecutorType, context: contextlib.AbstractContextManager[Any]
+    ) -> AsyncGenerator[Any, None]:
+        """Enter (and exit) a sync context manager on the `kind` executor."""
+        if kind == "process":
+            raise ValueError(
+                "Context manager (and generator) dependencies cannot use the 'process' "
+                "executor, use 'thread' instead."
+            )
+
+        value = await self.run(kind, context.__enter__)
+        try:
+            yield value
+        except BaseException as e:
+            if not await self.run(kind, context.__exit__, type(e), e, e.__traceback__):
+                raise
+        else:
+            await self.run(kind, context.__exit__, None, None, None)
+
+    def shutdown(self) -> None:
+        for pool in self.pools.values():
+            pool.shutdown(wait=False)
+        self.pools.clear()
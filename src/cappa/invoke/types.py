@@ -4,12 +4,14 @@ import contextlib
 import inspect
 from dataclasses import dataclass, field
 from typing import (
+    TYPE_CHECKING,
     Any,
     AsyncGenerator,
     Callable,
     Coroutine,
     Generator,
     Generic,
+    Iterable,
     Mapping,
     Sequence,
     TypeVar,
@@ -19,9 +21,14 @@ from typing import (
 
 from typing_extensions import Annotated
 
+from cappa.default import LazyDefaultError
+from cappa.invoke.executor import Executors, ExecutorType
 from cappa.output import Exit, Output
 from cappa.type_view import Empty, EmptyType
 
+if TYPE_CHECKING:
+    import asyncio
+
 
 class SelfType: ...
 
@@ -34,9 +41,26 @@ InvokeCallableSpec = Union[InvokeCallable[T], str]
 
 @dataclass(frozen=True)
 class Dep(Generic[T]):
-    """Describes the callable required to fulfill a given dependency."""
+    """Describes the callable required to fulfill a given dependency.
+
+    Arguments:
+        callable: The function which produces the dependency's value.
+        executor: Under `invoke_async`, run a sync `callable` on a `"thread"` or
+            `"process"` pool executor, rather than blocking the event loop.
+    """
 
     callable: InvokeCallableSpec[T]
+    executor: ExecutorType | None = None
+
+    def key(self) -> Dep[T]:
+        """Return the key under which the dependency is resolved (and overridden).
+
+        Settings which do not change the produced value (such as `executor`) are
+        omitted, such that e.x. `deps={fn: ...}` overrides `Dep(fn, executor=...)`.
+        """
+        if self.executor is None:
+            return self
+        return Dep(self.callable)
 
 
 DepTypes = Union[
@@ -57,15 +81,23 @@ class Resolved(Generic[C]):
     kwargs: dict[str, Any | Resolved[Any]] = field(default_factory=lambda: {})
     args: tuple[Any, ...] = field(default=())
     result: C | EmptyType = Empty
+    executor: ExecutorType | None = None
+    concurrent: bool = False
 
     def call(self, *args: Any, output: Output | None = None, managed: bool = True):
         with self.get(*args, output=output, managed=managed) as value:
             return value
 
     async def call_async(
-        self, *args: Any, output: Output | None = None, managed: bool = True
+        self,
+        *args: Any,
+        output: Output | None = None,
+        managed: bool = True,
+        executors: Executors | None = None,
     ):
-        async with self.get_async(*args, output=output, managed=managed) as value:
+        async with self.get_async(
+            *args, output=output, managed=managed, executors=executors
+        ) as value:
             return value
 
     @contextlib.contextmanager
@@ -115,7 +147,11 @@ class Resolved(Generic[C]):
 
     @contextlib.asynccontextmanager
     async def get_async(
-        self, *args: Any, output: Output | None = None, managed: bool = True
+        self,
+        *args: Any,
+        output: Output | None = None,
+        managed: bool = True,
+        executors: Executors | None = None,
     ) -> AsyncGenerator[C, None]:
         """Get the resolved value, in an async context.
 
@@ -123,6 +159,10 @@ class Resolved(Generic[C]):
         `enter_async_context` and `async with`. There seems to be no way to
         share the logic between the two methods, so they just need to be kept
         in sync :shrug:.
+
+        When given `executors`, a sync callable with an `executor` (or any sync
+        callable, given a default executor) is run on that executor, rather than on
+        the event loop.
         """
         if self.result is not Empty:
             yield self.result
@@ -130,10 +170,21 @@ class Resolved(Generic[C]):
 
         async with contextlib.AsyncExitStack() as stack:
             finalized_kwargs = dict(self.iter_kwargs(is_resolved=False))
+
+            # `concurrent` values (e.x. async defaults, like `AsyncPrompt`) are started
+            # up front, such that they resolve alongside one another, and alongside the
+            # remaining values.
+            tasks = self.start_concurrent(output=output, executors=executors)
+            stack.callback(cancel_tasks, tasks.values())
+
             for k, v in self.iter_kwargs(is_resolved=True):
-                finalized_kwargs[k] = await stack.enter_async_context(
-                    v.get_async(output=output, managed=managed)
-                )
+                if k not in tasks:
+                    finalized_kwargs[k] = await stack.enter_async_context(
+                        v.get_async(output=output, managed=managed, executors=executors)
+                    )
+
+            for k, task in tasks.items():
+                finalized_kwargs[k] = await task
 
             with self.handle_exit(output):
                 callable = cast(Callable[..., Any], self.callable)
@@ -141,7 +192,20 @@ class Resolved(Generic[C]):
                 if requires_management:
                     callable = contextlib.asynccontextmanager(callable)
 
-                result: Any = callable(*args, *self.args, **finalized_kwargs)
+                # Sync yield functions are context-managers, as in `get`. Their
+                # (potentially blocking) body only runs once entered, below.
+                requires_sync_management = inspect.isgeneratorfunction(callable)
+                if requires_sync_management:
+                    callable = contextlib.contextmanager(callable)
+
+                executor = self.resolve_executor(executors)
+                if executors and executor and not requires_sync_management:
+                    result: Any = await executors.run(
+                        executor, callable, *args, *self.args, **finalized_kwargs
+                    )
+                else:
+                    result = callable(*args, *self.args, **finalized_kwargs)
+
                 is_async_context_manager = isinstance(
                     result, contextlib.AbstractAsyncContextManager
                 )
@@ -151,15 +215,77 @@ class Resolved(Generic[C]):
 
                 if requires_management or (managed and is_async_context_manager):
                     result = await stack.enter_async_context(result)  # pyright: ignore
-                elif managed and is_sync_context_manager:
+                elif requires_sync_management or (managed and is_sync_context_manager):
                     # Handle synchronous context managers in async context
-                    result = stack.enter_context(result)  # pyright: ignore
+                    context_executor = self.resolve_executor(
+                        executors, context_manager=True
+                    )
+                    if executors and context_executor:
+                        result = await stack.enter_async_context(
+                            executors.enter_context(context_executor, result)  # pyright: ignore
+                        )
+                    else:
+                        result = stack.enter_context(result)  # pyright: ignore
                 elif isinstance(result, Coroutine):
                     result = await result  # pyright: ignore
 
             self.result = result
             yield result
 
+    def start_concurrent(
+        self, output: Output | None = None, executors: Executors | None = None
+    ) -> dict[str, asyncio.Future[Any]]:
+        """Start resolving the `concurrent` kwargs as tasks, keyed by kwarg name.
+
+        Requires an `asyncio` event loop. Otherwise (e.x. under trio), every value is
+        resolved in sequence, as normal.
+        """
+        concurrent = [
+            (k, v) for k, v in self.iter_kwargs(is_resolved=True) if v.concurrent
+        ]
+        if len(concurrent) < 2:
+            return {}
+
+        import asyncio
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:  # pragma: no cover
+            return {}
+
+        return {
+            k: asyncio.ensure_future(v.call_async(output=output, executors=executors))
+            for k, v in concurrent
+        }
+
+    def resolve_executor(
+        self, executors: Executors | None, *, context_manager: bool = False
+    ) -> ExecutorType | None:
+        """Return the executor on which to run the callable, if any.
+
+        Coroutine (and async generator) functions always run on the event loop.
+
+        A context manager cannot be entered on a `"process"` executor. When it would
+        be (i.e. `context_manager`) only because of the default executor, it falls
+        back to a `"thread"` executor instead. An explicit `"process"` executor is
+        retained, and rejected by `Executors.enter_context`.
+        """
+        if executors is None:
+            return None
+
+        callable = self.callable
+        if inspect.iscoroutinefunction(callable) or inspect.isasyncgenfunction(
+            callable
+        ):
+            return None
+
+        if self.executor:
+            return self.executor
+
+        if context_manager and executors.default == "process":
+            return "thread"
+        return executors.default
+
     def iter_kwargs(self, *, is_resolved: bool):
         for k, v in self.kwargs.items():
             if is_resolved == isinstance(v, self.__class__):
@@ -174,3 +300,15 @@ class Resolved(Generic[C]):
             if output:  # pragma: no cover
                 output.exit(e)
             raise e
+        except LazyDefaultError as e:
+            if output:
+                output.exit(e.exit)
+            raise e.exit from None
+
+
+def cancel_tasks(tasks: Iterable[asyncio.Future[Any]]) -> None:
+    """Cancel any outstanding `tasks`, such as when a sibling task failed."""
+    for task in tasks:
+        if not task.cancel() and not task.cancelled():
+            # Mark the (already reported, or superseded) exception as retrieved.
+            task.exception()
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import re
+import string
 import sys
+import threading
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, List, Union
 
@@ -14,6 +17,7 @@ if TYPE_CHECKING:
     from cappa.command import FinalCommand
 
 __all__ = [
+    "CompletionExit",
     "Displayable",
     "Exit",
     "HelpExit",
@@ -25,6 +29,8 @@ __all__ = [
 ]
 
 
+_write_lock = threading.RLock()
+
 Displayable: TypeAlias = RenderableType
 Outputable: TypeAlias = Union[List[Displayable], Displayable, "Exit", str, Any, None]
 
@@ -43,6 +49,17 @@ class Exit(SystemExit):
         self.command = command
         super().__init__(code)
 
+    def __reduce__(self):
+        # Allows an `Exit` to cross a process boundary (e.x. `invoke_many(..., jobs=N)`).
+        # The `command` is dropped, as it is only used to render help for the message.
+        return (_rebuild_exit, (self.__class__, self.message, self.code, self.prog))
+
+
+def _rebuild_exit(
+    cls: type[Exit], message: Any, code: str | int | None, prog: str | None
+) -> Exit:
+    return cls(message, code=code, prog=prog)
+
 
 class HelpExit(Exit):
     def __init__(
@@ -56,6 +73,17 @@ class HelpExit(Exit):
         self.message = message
 
 
+class CompletionExit(Exit):
+    """An `Exit` carrying the (already formatted) completions for a shell script.
+
+    Its message is written to the output console's file verbatim, rather than being
+    rendered by rich (which would wrap long lines, and is slow for many completions).
+    """
+
+    def __init__(self, message: str | None = None, *, prog: str | None = None):
+        super().__init__(message, code=0, prog=prog)
+
+
 theme: Theme = Theme(
     {
         "cappa.prog": "grey50",
@@ -122,6 +150,18 @@ class Output:
         self.output_console.push_theme(t or theme)
         self.error_console.push_theme(t or theme)
 
+    def exit_fields(self, code: str | int | None = 0) -> set[str]:
+        """Produce the named fields referenced by the format an `Exit` with `code` uses.
+
+        Allows callers to skip producing context (e.x. help text) which would go unused.
+        """
+        format = self.output_format if code == 0 else self.error_format
+        return {
+            re.split(r"[.\[]", name, maxsplit=1)[0]
+            for _, name, _, _ in string.Formatter().parse(format)
+            if name
+        }
+
     def exit(
         self,
         e: Exit,
@@ -129,6 +169,12 @@ class Output:
         short_help: Displayable | None = None,
     ):
         """Print a `cappa.Exit` object to the appropriate console."""
+        if isinstance(e, CompletionExit):
+            if e.message:
+                with _write_lock:
+                    self.output_console.file.write(f"{e.message}\n")
+            return
+
         if e.code == 0:
             self.output(e, help=help, short_help=short_help)
         else:
@@ -207,7 +253,10 @@ class Output:
         if message is None:
             return
 
-        console.print(message, overflow="ignore", crop=False)
+        # Serialize writes across both consoles, such that concurrent invocations
+        # (e.x. `Arg(fanout=True)`) never interleave their messages.
+        with _write_lock:
+            console.print(message, overflow="ignore", crop=False)
 
 
 def rich_to_ansi(console: Console, message: Outputable) -> str:
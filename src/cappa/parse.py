@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import contextlib
+import dataclasses
 import enum
 import functools
 import inspect
@@ -12,6 +13,7 @@ from typing import (
     Callable,
     Final,
     Generator,
+    Iterator,
     List,
     Sequence,
     TextIO,
@@ -20,6 +22,7 @@ from typing import (
     cast,
 )
 
+from cappa.default import ParsedValue
 from cappa.file_io import FileMode
 from cappa.output import Exit
 from cappa.state import S, State
@@ -133,6 +136,9 @@ def parse_value(typ: MaybeTypeView[T]) -> Parser[T]:
     if type_view.is_subclass_of((TextIO, BinaryIO)):
         return parse_file_io(type_view)
 
+    if is_file_stream(type_view):
+        return parse_file_stream(type_view)
+
     return parse_fallback(type_view.annotation)
 
 
@@ -290,6 +296,37 @@ def parse_file_io(typ: MaybeTypeView[T]) -> Parser[T]:
     return file_io_mapper
 
 
+def is_file_stream(type_view: TypeView[Any]) -> bool:
+    """Detect `Annotated[Iterator[str | bytes], FileMode(...)]` annotations."""
+    if not type_view.is_subclass_of(Iterator) or not type_view.inner_types:
+        return False
+
+    if not type_view.inner_types[0].is_subclass_of((str, bytes)):
+        return False
+
+    return any(isinstance(f, FileMode) for f in type_view.metadata)
+
+
+def parse_file_stream(typ: MaybeTypeView[T]) -> Parser[T]:
+    type_view = _as_type_view(typ)
+    file_mode: FileMode = next(f for f in type_view.metadata if isinstance(f, FileMode))
+
+    # As with `parse_file_io`, the mode follows from the (element) type.
+    is_binary = type_view.inner_types[0].is_subclass_of(bytes)
+    if is_binary != ("b" in file_mode.mode):
+        if not is_binary:
+            raise ValueError(
+                f"`FileMode(mode='{file_mode.mode}')` streams `bytes`, which conflicts "
+                "with an `Iterator[str]` annotation."
+            )
+        file_mode = dataclasses.replace(file_mode, mode=file_mode.mode + "b")
+
+    def file_stream_mapper(value: str) -> T:
+        return file_mode.stream(value)  # type: ignore
+
+    return file_stream_mapper
+
+
 def evaluate_parse(
     parsers: Parser[T] | Sequence[Parser[Any]],
     type_view: TypeView[T],
@@ -388,6 +425,9 @@ def parse_handler(
             if inspect.iscoroutine(raw_value):
                 raw_value = await raw_value
 
+            if isinstance(raw_value, ParsedValue):
+                raw_value, is_parsed = raw_value.value, True
+
             with apply_parse(parse_fn, prog, raw_value, is_parsed, names_str) as parsed:
                 if inspect.iscoroutine(parsed):
                     try:
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import copy
 import dataclasses
 import re
 from collections import deque
-from functools import cached_property
+from functools import partial
 from typing import (
     Any,
     Callable,
+    Generator,
     Generic,
     Hashable,
     Iterable,
@@ -16,10 +18,11 @@ from typing import (
 from cappa.arg import Arg, ArgAction, ArgActionType, FinalArg
 from cappa.command import Alias, Command, FinalCommand
 from cappa.completion.types import Completion, FileCompletion
-from cappa.help import format_args, format_subcommand_names
-from cappa.invoke.base import fulfill_deps
-from cappa.output import Exit, HelpExit, Output
+from cappa.help import format_subcommand_names
+from cappa.invoke.base import fulfill_deps, prefetch_modules
+from cappa.output import CompletionExit, Exit, HelpExit, Output
 from cappa.subcommand import FinalSubcommand
+from cappa.suggest import suggest
 from cappa.typing import T
 
 negative_number = re.compile(r"^-\d+$|^-\d*\.\d+$")
@@ -82,10 +85,44 @@ def backend(
     prog: str,
     provide_completions: bool = False,
 ) -> tuple[Any, FinalCommand[T], dict[str, Any]]:
+    first, *links = split_chain(command, argv)
     context = ParseContext.from_command(command)
+
+    # Only the final link of a chained command line is relevant to completions.
+    if provide_completions and links:
+        first, links = links[-1], []
+        context = ParseContext.from_chain_link(command, {})
+
+    parse_state = parse_segment(
+        command, first, context, output, prog, provide_completions
+    )
+
+    if provide_completions:
+        raise Exit(code=0)
+
+    for link in links:
+        link_context = ParseContext.from_chain_link(command, context.result)
+        link_state = parse_segment(command, link, link_context, output, prog)
+        parse_state.chain.append(
+            (link_state, link_state.current_command, link_context.result)
+        )
+
+    return (parse_state, parse_state.current_command or command, context.result)
+
+
+def parse_segment(
+    command: FinalCommand[Any],
+    argv: list[str],
+    context: ParseContext,
+    output: Output,
+    prog: str,
+    provide_completions: bool = False,
+) -> ParseState:
     parse_state = ParseState.from_command(
         argv, command, output=output, provide_completions=provide_completions
     )
+    if not provide_completions:
+        prefetch_modules(command)
 
     try:
         try:
@@ -100,7 +137,7 @@ def backend(
             raise Exit(cast(str, e.version.value_name), code=0, prog=parse_state.prog)
         except BadArgumentError as e:
             if parse_state.provide_completions and e.arg:
-                completions = e.arg.completion(e.value) if e.arg.completion else []
+                completions = complete_arg(parse_state, e.arg, e.value)
                 raise CompletionAction(*completions)
 
             raise Exit(str(e), code=2, prog=parse_state.prog, command=e.command)
@@ -108,15 +145,93 @@ def backend(
         from cappa.completion.base import execute, format_completions
 
         if provide_completions:
-            completions = format_completions(*e.completions)
-            raise Exit(completions, code=0)
+            raise CompletionExit(format_completions(*e.completions))
 
         execute(command, prog, e.value, cast(Arg[Any], e.arg), output=output)
 
-    if provide_completions:
-        raise Exit(code=0)
+    return parse_state
 
-    return (parse_state, parse_state.current_command or command, context.result)
+
+def complete_arg(
+    parse_state: ParseState, arg: Arg[Any] | FinalSubcommand, value: Any
+) -> list[Completion]:
+    """Produce the completions of `arg` for the partial `value`.
+
+    Uses the arg's `completion_cache`, if it has one, keyed by the command path and arg.
+    Async completion functions are awaited, and the completion function is bounded by
+    the `Command.completion_timeout` of the commands leading to `arg`.
+    """
+    if not arg.completion:
+        return []
+
+    from cappa.completion.runner import CompletionSource, run_completers
+
+    source = CompletionSource(partial(arg.completion, value))
+    if isinstance(arg, FinalArg) and arg.completion_cache and isinstance(value, str):
+        scope = [c.real_name() for c in parse_state.command_stack]
+        scope.append(arg.field_name)
+        source = CompletionSource(
+            partial(arg.completion_cache, arg.completion, value, scope=scope),
+            background=arg.completion_cache.background,
+        )
+
+    timeouts = [c.completion_timeout for c in parse_state.command_stack]
+    timeout = min((t for t in timeouts if t is not None), default=None)
+
+    return cast("list[Completion]", run_completers([source], timeout=timeout))
+
+
+def split_chain(command: FinalCommand[Any], argv: list[str]) -> list[list[str]]:
+    """Split `argv` into the segments of a chained command line (see `Command.chain`).
+
+    Splitting happens before parsing, so any token equal to the separator ends the
+    segment, even where it would otherwise be an option's value (e.x. `--name +`).
+    The exception is tokens following `--`, which all belong to the final segment.
+    """
+    if command.chain is None:
+        return [argv]
+
+    segments: list[list[str]] = [[]]
+    for index, item in enumerate(argv):
+        if item == "--":
+            segments[-1].extend(argv[index:])
+            break
+
+        if item == command.chain:
+            segments.append([])
+        else:
+            segments[-1].append(item)
+    return segments
+
+
+def complete(
+    command: FinalCommand[Any], argv: list[str], output: Output
+) -> tuple[Completion | FileCompletion, ...]:
+    """Produce the completions for the final (possibly partial) item in `argv`.
+
+    Unlike `backend(..., provide_completions=True)`, the completions are returned
+    directly, rather than being formatted for a shell completion script.
+    """
+    *links, last = split_chain(command, argv)
+    context = ParseContext.from_command(command)
+    if links:
+        context = ParseContext.from_chain_link(command, {})
+
+    parse_state = ParseState.from_command(
+        last, command, output=output, provide_completions=True
+    )
+
+    try:
+        parse(parse_state, context)
+    except CompletionAction as e:
+        return e.completions
+    except BadArgumentError as e:
+        if e.arg and e.arg.completion:
+            return tuple(complete_arg(parse_state, e.arg, e.value))
+    except (HelpAction, VersionAction, Exit):
+        pass
+
+    return ()
 
 
 @dataclasses.dataclass
@@ -127,6 +242,12 @@ class ParseState:
     command_stack: list[FinalCommand[Any]]
     output: Output
     provide_completions: bool = False
+    prefetch: bool = True
+    """Whether to prefetch the modules of the selected commands (see `prefetch_modules`)."""
+
+    chain: list[tuple[ParseState, FinalCommand[Any], dict[str, Any]]] = (
+        dataclasses.field(default_factory=lambda: [])
+    )
 
     @classmethod
     def from_command(
@@ -142,6 +263,7 @@ class ParseState:
             command_stack=[command],
             output=output,
             provide_completions=provide_completions,
+            prefetch=not provide_completions,
         )
 
     @property
@@ -157,28 +279,23 @@ class ParseState:
 
 
 @dataclasses.dataclass
-class ParseContext:
-    """The parsing context specific to a command."""
+class OptionTable:
+    """The static, per-command lookup tables of a `ParseContext`.
+
+    These depend only upon the command, so they're built once per `FinalCommand` (see
+    `FinalCommand.option_table`), rather than on every parse of it. They must not be
+    mutated.
+    """
 
-    command: FinalCommand[Any]
-    arguments: deque[FinalArg[Any] | FinalSubcommand]
-    missing_options: set[str]
     arguments_by_field_name: dict[str, list[FinalArg[Any]]]
     arguments_by_value_name: dict[str, FinalArg[Any]]
     propagated_options: set[str]
-    parent_context: ParseContext | None = None
-    exclusive_args: dict[str, FinalArg[Any]] = dataclasses.field(
-        default_factory=lambda: {}
-    )
-
-    result: dict[str, Any] = dataclasses.field(default_factory=lambda: {})
+    propagating_options: list[str]
+    unique_field_names: set[str]
+    positional_arguments: list[FinalArg[Any] | FinalSubcommand]
 
     @classmethod
-    def from_command(
-        cls,
-        command: FinalCommand[Any],
-        parent_context: ParseContext | None = None,
-    ) -> ParseContext:
+    def from_command(cls, command: FinalCommand[Any]) -> OptionTable:
         arguments_by_field_name: dict[str, list[FinalArg[Any]]] = {}
         arguments_by_value_name: dict[str, FinalArg[Any]] = {}
         propagated_options: set[str] = set()
@@ -216,26 +333,89 @@ class ParseContext:
             arguments_by_field_name.setdefault(field_name, []).append(arg)
             add_option_names(arg)
 
-        arguments = deque(command.positional_arguments)
-
         return cls(
-            command=command,
-            parent_context=parent_context,
             arguments_by_field_name=arguments_by_field_name,
             arguments_by_value_name=arguments_by_value_name,
             propagated_options=propagated_options,
-            arguments=arguments,
-            missing_options=unique_field_names,
+            propagating_options=[o.field_name for o in command.options if o.propagate],
+            unique_field_names=unique_field_names,
+            positional_arguments=list(command.positional_arguments),
         )
 
-    @cached_property
-    def propagated_context(self) -> dict[str, ParseContext]:
-        parent_context = (
-            self.parent_context.propagated_context if self.parent_context else {}
+
+@dataclasses.dataclass
+class ParseContext:
+    """The parsing context specific to a command."""
+
+    command: FinalCommand[Any]
+    arguments: deque[FinalArg[Any] | FinalSubcommand]
+    missing_options: set[str]
+    arguments_by_field_name: dict[str, list[FinalArg[Any]]]
+    arguments_by_value_name: dict[str, FinalArg[Any]]
+    propagated_options: set[str]
+    parent_context: ParseContext | None = None
+    exclusive_args: dict[str, FinalArg[Any]] = dataclasses.field(
+        default_factory=lambda: {}
+    )
+    propagated_context: dict[str, ParseContext] = dataclasses.field(
+        default_factory=lambda: {}
+    )
+    """The context owning each propagated option, by field name.
+
+    Shared by every context along the parsed path of subcommands (a parse only ever
+    descends), each adding its own propagating options, rather than each merging a
+    copy of its parent's.
+    """
+
+    result: dict[str, Any] = dataclasses.field(default_factory=lambda: {})
+
+    @classmethod
+    def from_command(
+        cls,
+        command: FinalCommand[Any],
+        parent_context: ParseContext | None = None,
+    ) -> ParseContext:
+        table = command.option_table()
+
+        context = cls(
+            command=command,
+            parent_context=parent_context,
+            arguments_by_field_name=table.arguments_by_field_name,
+            arguments_by_value_name=table.arguments_by_value_name,
+            propagated_options=table.propagated_options,
+            arguments=deque(table.positional_arguments),
+            missing_options=set(table.unique_field_names),
+        )
+        if parent_context:
+            context.propagated_context = parent_context.propagated_context
+
+        for field_name in table.propagating_options:
+            context.propagated_context[field_name] = context
+        return context
+
+    @classmethod
+    def from_chain_link(
+        cls, command: FinalCommand[Any], root_result: dict[str, Any]
+    ) -> ParseContext:
+        """Produce a root context for a subsequent link of a chained command line.
+
+        The root's own arguments are supplied by the first link, so the link only
+        requires a subcommand, inheriting the first link's root-level values (unless it
+        supplies its own, which apply to this link alone).
+        """
+        context = cls.from_command(command)
+        context.arguments = deque(
+            a for a in context.arguments if isinstance(a, FinalSubcommand)
+        )
+        context.missing_options = set()
+
+        subcommand_fields = {a.field_name for a in context.arguments}
+        context.result.update(
+            (k, copy.copy(v))
+            for k, v in root_result.items()
+            if k not in subcommand_fields
         )
-        self_options = {o.field_name: o for o in self.command.options if o.propagate}
-        self_context: dict[str, ParseContext] = dict.fromkeys(self_options, self)
-        return {**parent_context, **self_context}
+        return context
 
     def next_argument(self):
         return self.arguments.popleft()
@@ -312,13 +492,13 @@ class ArgCollection:
                 return None
 
             if isinstance(item, RawOption) and not item.is_long:
-                item = self.generate_virtual_args(item, context.arguments_by_value_name)
+                item = self.generate_virtual_args(item, context)
             return item
 
         return None
 
     def generate_virtual_args(
-        self, arg: RawOption, options: dict[str, Any]
+        self, arg: RawOption, context: ParseContext
     ) -> RawOption | RawArg:
         """Produce "virtual" options from short (potentially concatenated) options.
 
@@ -329,24 +509,24 @@ class ArgCollection:
         """
         result: list[RawOption | RawArg] = []
 
-        partial_arg = ""
-        remaining_arg = arg.name[1:]
-        while remaining_arg:
-            partial_arg += remaining_arg[0]
-            remaining_arg = remaining_arg[1:]
+        short, _ = context.command.option_tries(context.arguments_by_value_name)
+        cluster = arg.name[1:]
+        index = 0
+        while index < len(cluster):
+            match = short.first_match(cluster, index)
+            if match is None:
+                break
 
-            option_name = f"-{partial_arg}"
+            option_name = f"-{match}"
+            result.append(RawOption(option_name, value=arg.value))
+            index += len(match)
 
-            option = options.get(option_name)
-            if option:
-                result.append(RawOption(option_name, value=arg.value))
-                partial_arg = ""
+            # An option which requires consuming further arguments should consume
+            # the rest of the concatenated character sequence as its value.
+            if context.arguments_by_value_name[option_name].num_args.n:
+                break
 
-                # An option which requires consuming further arguments should consume
-                # the rest of the concatenated character sequence as its value.
-                if option.num_args.n:
-                    partial_arg = remaining_arg
-                    break
+        partial_arg = cluster[index:]
 
         if not result:
             # i.e. -p, where -p is not a real short option. It will get skipped above.
@@ -356,9 +536,9 @@ class ArgCollection:
         if partial_arg:
             result.append(RawArg(partial_arg))
 
-        option, *virtual_args = result
+        first, *virtual_args = result
         self.pending_args.extend(virtual_args)
-        return option
+        return first
 
 
 @dataclasses.dataclass
@@ -405,23 +585,44 @@ class RawOption:
 
 
 def parse(parse_state: ParseState, context: ParseContext) -> None:
+    """Parse the command line, descending through its selected subcommands.
+
+    Each command's parse (`parse_command`) yields the context of the subcommand it
+    selects, which is parsed to completion before its parent resumes. Driving these
+    from an explicit stack (rather than recursing) bounds the Python stack depth,
+    regardless of how deeply subcommands are nested.
+    """
+    stack = [parse_command(parse_state, context)]
+    while stack:
+        nested_context = next(stack[-1], None)
+        if nested_context is None:
+            stack.pop()
+        else:
+            stack.append(parse_command(parse_state, nested_context))
+
+
+def parse_command(
+    parse_state: ParseState, context: ParseContext
+) -> Generator[ParseContext, None, None]:
     while True:
         while isinstance(parse_state.args.peek_value(context), RawOption):
             arg = cast(RawOption, parse_state.args.next(context))
             parse_option(parse_state, context, arg)
 
-        parse_args(parse_state, context)
+        yield from parse_args(parse_state, context)
 
         if not parse_state.args.has_values():
             break
 
     # Options are not explicitly iterated over because they can occur multiple times non-contiguouesly.
     # So instead we check afterward, if there are any missing which we haven't yet fulfilled.
+    # Those which may yet be fulfilled by an environment variable or config file are
+    # checked once their defaults are evaluated (see `FinalCommand.map_result`).
     required_missing_options = [
         arg
         for opt_name in sorted(context.missing_options)
         for arg in context.arguments_by_field_name[opt_name]
-        if arg.required
+        if arg.required and not arg.default.has_external_source
     ]
     if required_missing_options:
         names = ", ".join([opt.names_str("/") for opt in required_missing_options])
@@ -436,31 +637,40 @@ def parse(parse_state: ParseState, context: ParseContext) -> None:
 def parse_option(
     parse_state: ParseState, context: ParseContext, raw: RawOption
 ) -> None:
+    if (
+        raw.name not in context.arguments_by_value_name
+        and raw.is_long
+        and can_abbreviate(parse_state, context)
+    ):
+        _, long = context.command.option_tries(context.arguments_by_value_name)
+        name = long.unique_prefix(raw.name)
+        if name is not None:
+            raw = dataclasses.replace(raw, name=name)
+
     if raw.name not in context.arguments_by_value_name:
+        option_index = context.command.option_index(context.arguments_by_value_name)
         possible_options: dict[str, FinalArg[Any]] = {
-            name: arg
-            for name, arg in context.arguments_by_value_name.items()
-            if name.startswith(raw.name)
+            name: context.arguments_by_value_name[name]
+            for name in option_index.search(raw.name)
         }
 
         if parse_state.provide_completions:
             options: list[Completion] = []
             for name, option in possible_options.items():
-                rendered_help = str(
-                    format_args(
-                        parse_state.output.output_console,
-                        context.command.help_formatter,
-                        option,
-                    )
-                ).strip()
-                completion = Completion(name, help=rendered_help, arg=option)
+                plain_help = context.command.plain_help(option)
+                completion = Completion(name, help=plain_help, arg=option)
                 options.append(completion)
 
             raise CompletionAction(*options)
 
         message = f"Unrecognized arguments: {raw.name}"
-        if possible_options:
-            message += f" (Did you mean: {', '.join(possible_options.keys())})"
+        suggestions = suggest(
+            raw.name,
+            possible_options,
+            context.command.option_suggestions(context.arguments_by_value_name),
+        )
+        if suggestions:
+            message += f" (Did you mean: {', '.join(suggestions)})"
 
         raise BadArgumentError(
             message, value=raw.name, command=parse_state.current_command
@@ -471,7 +681,20 @@ def parse_option(
     consume_arg(parse_state, context, arg, raw)
 
 
-def parse_args(parse_state: ParseState, context: ParseContext) -> None:
+def can_abbreviate(parse_state: ParseState, context: ParseContext) -> bool:
+    """Whether a name may be an abbreviation (see `Command.allow_abbrev`).
+
+    The final (partial) item being completed is never treated as an abbreviation, such
+    that it is completed rather than being expanded.
+    """
+    if not context.command.allow_abbrev:
+        return False
+    return not parse_state.provide_completions or parse_state.args.has_values()
+
+
+def parse_args(
+    parse_state: ParseState, context: ParseContext
+) -> Generator[ParseContext, None, None]:
     while context.arguments:
         peeked = parse_state.args.peek_value(context)
         if isinstance(peeked, RawOption):
@@ -480,7 +703,7 @@ def parse_args(parse_state: ParseState, context: ParseContext) -> None:
         arg = context.next_argument()
 
         if isinstance(arg, FinalSubcommand):
-            consume_subcommand(parse_state, context, arg)
+            yield from consume_subcommand(parse_state, context, arg)
         else:
             consume_arg(parse_state, context, arg)
     else:
@@ -505,7 +728,7 @@ def parse_args(parse_state: ParseState, context: ParseContext) -> None:
 
 def consume_subcommand(
     parse_state: ParseState, context: ParseContext, arg: FinalSubcommand
-) -> Any:
+) -> Generator[ParseContext, None, None]:
     value = parse_state.args.next(context)
     if value is None:
         if not arg.required:
@@ -520,11 +743,17 @@ def consume_subcommand(
 
     assert isinstance(value, RawArg), value
     canonical = arg.resolve_name(value.raw)
+    if canonical is None and can_abbreviate(parse_state, context):
+        name = arg.name_trie.unique_prefix(value.raw)
+        if name is not None:
+            value = RawArg(name)
+            canonical = arg.resolve_name(name)
+
     if canonical is None:
         message = f"Invalid command '{value.raw}'"
-        possible_values = [
-            name for name in arg.all_visible_names() if name.startswith(value.raw)
-        ]
+        possible_values = suggest(
+            value.raw, arg.name_index.search(value.raw), arg.name_suggestions
+        )
         if possible_values:
             message += f" (Did you mean: {format_subcommand_names(possible_values)})"
 
@@ -545,7 +774,11 @@ def consume_subcommand(
     parse_state.push_command(command)
     nested_context = context.push(command, canonical)
 
-    parse(parse_state, nested_context)
+    # Start importing the selected command's modules while the rest is parsed.
+    if parse_state.prefetch:
+        prefetch_modules(command)
+
+    yield nested_context
 
     context.result[arg.field_name] = nested_context.result
 
@@ -727,8 +960,8 @@ def consume_arg(
     # Handle completions for args with values
     if parse_state.provide_completions and not parse_state.args.has_values() and values:
         if arg.completion:
-            completions: list[Completion] | list[FileCompletion] = arg.completion(
-                result
+            completions: list[Completion] | list[FileCompletion] = complete_arg(
+                parse_state, arg, result
             )
         else:
             completions = [FileCompletion(values[-1])]
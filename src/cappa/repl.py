@@ -0,0 +1,239 @@
+"""An interactive shell which runs many commands against a single collected command.
+
+The command is collected once, and each line is tokenized with `shlex`, parsed by the
+native cappa parser, and invoked. Any `deps` supplied to the shell are resolved once, at
+the start of the session, and remain alive (and their contexts entered) until it ends.
+Likewise, `Dep`s required by the invoked commands are resolved upon first use, and then
+shared by the remainder of the session.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import glob
+import shlex
+import sys
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Iterator, TextIO
+
+from rich.theme import Theme
+
+from cappa import parser
+from cappa.arg import Arg
+from cappa.base import coalesce_output, collect, invoke_parse_result
+from cappa.command import FinalCommand
+from cappa.completion.base import split_incomplete_command
+from cappa.completion.types import FileCompletion
+from cappa.help import HelpFormattable
+from cappa.invoke.base import resolve_session_deps
+from cappa.invoke.types import DepTypes, InvokeCallableSpec
+from cappa.output import Output
+from cappa.state import State
+from cappa.types import CappaCapable, ParseResult
+
+__all__ = [
+    "Shell",
+    "shell",
+]
+
+exit_commands = ("exit", "quit")
+
+
+@dataclass
+class Shell:
+    """A session which parses and invokes lines of input against `command`.
+
+    Arguments:
+        command: The collected command.
+        output: The `Output` used for every command in the session.
+        deps: Session-scoped dependency values, as produced by `Shell.resolve_deps`.
+        prompt: The prompt displayed before each line of interactive input.
+        stack: The session's exit stack, upon which the contexts of session-scoped
+            deps are entered. Closed when the session ends (see `Shell.close`).
+        shared_deps: The `Dep`s (required by the commands invoked so far) which are
+            shared by every line of the session.
+    """
+
+    command: FinalCommand[Any]
+    output: Output
+    deps: dict[InvokeCallableSpec[Any], Any] = field(default_factory=lambda: {})
+    prompt: str = "> "
+    stack: contextlib.ExitStack = field(default_factory=contextlib.ExitStack)
+    shared_deps: dict[Hashable, Any] = field(default_factory=lambda: {})
+
+    def resolve_deps(self, deps: DepTypes) -> None:
+        """Resolve `deps` once, entering their contexts on the session's `stack`."""
+        self.deps.update(resolve_session_deps(deps, self.output, self.stack))
+
+    def close(self) -> None:
+        """Tear down the session's deps."""
+        self.shared_deps.clear()
+        self.stack.close()
+
+    def __enter__(self) -> Shell:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def run_line(self, line: str) -> int:
+        """Parse and invoke a single line of input, returning its exit code."""
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            self.output.error(f"Invalid input: {e}")
+            return 2
+
+        try:
+            parse_result: ParseResult[Any, Any] = self.command.parse_command(
+                argv=argv, backend=parser.backend, output=self.output, state=State()
+            )
+            invoke_parse_result(
+                parse_result,
+                deps=self.deps,
+                shared_deps=self.shared_deps,
+                shared_stack=self.stack,
+            )
+        except SystemExit as e:
+            if e.code is None:
+                return 0
+            if isinstance(e.code, int):
+                return e.code
+            return 1
+        except KeyboardInterrupt:
+            return 130
+        except Exception:
+            traceback.print_exc()
+            return 1
+        return 0
+
+    def complete(self, line: str) -> list[str]:
+        """Produce the candidate replacements for the final word of `line`."""
+        argv = list(split_incomplete_command(line))
+        text = "" if not line or line[-1].isspace() else argv[-1]
+
+        completions = parser.complete(self.command, argv, self.output)
+        if completions and isinstance(completions[0], FileCompletion):
+            return sorted(glob.glob(f"{glob.escape(text)}*"))
+
+        return [
+            c.value
+            for c in completions
+            if not isinstance(c, FileCompletion)
+            and c.value
+            and c.value.startswith(text)
+        ]
+
+    def loop(self, lines: Iterator[str]) -> None:
+        """Run each line in `lines`, until exhausted or an exit command is given."""
+        for line in lines:
+            stripped = line.strip()
+            if not stripped:
+                continue
+
+            if stripped in exit_commands:
+                return
+
+            self.run_line(stripped)
+
+
+def shell(
+    obj: CappaCapable[Any],
+    *,
+    deps: DepTypes = None,
+    prompt: str | None = None,
+    input: TextIO | None = None,
+    color: bool = True,
+    version: str | Arg[str] | None = None,
+    help: bool | Arg[bool] = True,
+    theme: Theme | None = None,
+    output: Output | None = None,
+    help_formatter: HelpFormattable | None = None,
+) -> None:
+    """Run an interactive shell, invoking each line of input as a command of `obj`.
+
+    The command is collected once, up front, and every line is parsed with the native
+    cappa parser. Entering `exit`, `quit`, or end-of-file ends the session.
+
+    Arguments:
+        obj: A class which can represent a CLI command chain.
+        deps: Optional extra dependencies, as with `invoke`. Unlike `invoke`, these are
+            resolved once, and shared by every command in the session. Likewise, the
+            `Dep`s of invoked commands are resolved upon first use, and then shared by
+            the remainder of the session (unless they depend upon the command instance,
+            or other per-command values). Generator-style deps are torn down when the
+            session ends.
+        prompt: The prompt displayed before each line. Defaults to the command's name.
+        input: Read lines from the given stream, rather than interactively from stdin.
+        color: Whether to output in color.
+        version: If a string is supplied, adds a -v/--version flag which returns the
+            given string as the version.
+        help: If `True` (default to True), adds a -h/--help flag.
+        theme: Optional rich theme to customized output formatting.
+        output: Optional `Output` instance.
+        help_formatter: Override the default help formatter.
+
+    Examples:
+        >>> import cappa
+        >>> def main():
+        ...     cappa.shell(MyCli, deps=[create_pool])  # doctest: +SKIP
+    """
+    command = collect(
+        obj,
+        backend=parser.backend,
+        version=version,
+        help=help,
+        completion=False,
+        help_formatter=help_formatter,
+    )
+    output = coalesce_output(output, theme, color)
+    session = Shell(
+        command,
+        output,
+        prompt=f"{command.real_name()}> " if prompt is None else prompt,
+    )
+
+    with session:
+        session.resolve_deps(deps)
+
+        if input is None:
+            session.loop(_interactive_lines(session.prompt, session.complete))
+        else:
+            session.loop(iter(input))
+
+
+def _interactive_lines(
+    prompt: str, complete: Callable[[str], list[str]]
+) -> Iterator[str]:  # pragma: no cover
+    _install_completer(complete)
+
+    while True:
+        try:
+            yield input(prompt)
+        except KeyboardInterrupt:
+            sys.stdout.write("\n")
+        except EOFError:
+            sys.stdout.write("\n")
+            return
+
+
+def _install_completer(
+    complete: Callable[[str], list[str]],
+) -> None:  # pragma: no cover
+    try:
+        import readline
+    except ImportError:
+        return
+
+    matches: list[str] = []
+
+    def completer(_: str, state: int) -> str | None:
+        if state == 0:
+            buffer = readline.get_line_buffer()[: readline.get_endidx()]
+            matches[:] = complete(buffer)
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer_delims(" \t\n")
+    readline.set_completer(completer)
+    readline.parse_and_bind("tab: complete")
@@ -0,0 +1,378 @@
+"""Serve a cappa CLI from a long-lived, pre-warmed process over a Unix socket.
+
+The server collects the command once, and then runs each request through
+`FinalCommand.parse_command` and `invoke`, using the client's argv, working directory,
+environment and stdio file descriptors (passed over the socket with `SCM_RIGHTS`).
+
+Alternatively, with `fork=True`, the server instead forks a child process per request,
+after importing all string `invoke` targets and calling `gc.freeze()`. Children share the
+warmed parent's memory copy-on-write, while remaining fully isolated from one another.
+
+The client half lives in `cappa.serve_client`, which only depends on the standard
+library. Run by path, or as a script written by `write_client`, a forwarded invocation
+imports neither `cappa` nor the CLI's own modules. (`request` is re-exported here, and
+`python -m cappa.serve SOCKET [ARGS...]` also works, but both first import `cappa`.)
+"""
+
+from __future__ import annotations
+
+import array
+import contextlib
+import gc
+import json
+import os
+import re
+import socket
+import socketserver
+import sys
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Generator, Iterator, cast
+
+from cappa import serve_client
+from cappa.serve_client import (
+    EXIT_CODE,
+    FD_COUNT,
+    LENGTH,
+    receive_exactly,
+    request,
+)
+
+if TYPE_CHECKING:
+    from rich.theme import Theme
+
+    from cappa.arg import Arg
+    from cappa.command import FinalCommand
+    from cappa.help import HelpFormattable
+    from cappa.invoke.types import DepTypes
+    from cappa.types import Backend, CappaCapable, ParseResult
+
+__all__ = [
+    "CommandServer",
+    "ForkingCommandServer",
+    "create_server",
+    "request",
+    "serve",
+    "write_client",
+]
+
+
+class CommandServer(socketserver.UnixStreamServer):
+    """A Unix socket server which parses and invokes a pre-collected command per request.
+
+    Requests are handled sequentially, because each request temporarily takes over the
+    process-global `sys.std*` streams, environment and working directory.
+    """
+
+    def __init__(
+        self,
+        socket_path: str | os.PathLike[str],
+        command: FinalCommand[Any],
+        *,
+        backend: Backend,
+        deps: DepTypes = None,
+        color: bool = True,
+        theme: Theme | None = None,
+    ):
+        self.command = command
+        self.backend = backend
+        self.deps = deps
+        self.color = color
+        self.theme_ = theme
+        super().__init__(os.fspath(socket_path), _RequestHandler)
+
+    def warm(self) -> None:
+        """Eagerly import the string `invoke` targets of every command in the tree."""
+        from cappa.invoke.base import resolve_callable_reference
+
+        for command in _iter_commands(self.command):
+            if isinstance(command.invoke, str):
+                resolve_callable_reference(command.invoke)
+
+    def run(
+        self,
+        argv: list[str],
+        cwd: str,
+        env: dict[str, str],
+        stdin: IO[str],
+        stdout: IO[str],
+        stderr: IO[str],
+    ) -> int:
+        """Parse and invoke a single request, returning its exit code."""
+        import traceback
+
+        from cappa.base import coalesce_output, invoke_parse_result
+        from cappa.state import State
+
+        with _redirect_process(cwd, env, stdin, stdout, stderr):
+            try:
+                output = coalesce_output(None, self.theme_, self.color)
+                parse_result: ParseResult[Any, Any] = self.command.parse_command(
+                    argv=argv,
+                    backend=self.backend,
+                    output=output,
+                    state=State(),
+                )
+                invoke_parse_result(parse_result, deps=self.deps)
+            except SystemExit as e:
+                return _exit_code(e, stderr)
+            except Exception:
+                traceback.print_exc(file=stderr)
+                return 1
+        return 0
+
+
+class ForkingCommandServer(socketserver.ForkingMixIn, CommandServer):
+    """A `CommandServer` which handles each request in a forked child process.
+
+    Upon construction, the server warms itself (see `CommandServer.warm`) and then
+    freezes the garbage collector, such that the collected command and imported modules
+    are never touched by the collector, and thus remain shared copy-on-write with each
+    child. Because each child has its own copy of the process' global state, requests
+    may be handled concurrently.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.warm()
+        gc.freeze()
+
+    def server_close(self) -> None:
+        super().server_close()
+        gc.unfreeze()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    request: socket.socket
+
+    def handle(self):
+        server = cast(CommandServer, self.server)
+        payload, fds = _receive(self.request)
+
+        with contextlib.ExitStack() as stack:
+            stdin, stdout, stderr = (
+                stack.enter_context(os.fdopen(fd, mode))
+                for fd, mode in zip(fds, ("r", "w", "w"))
+            )
+            code = server.run(
+                payload["argv"], payload["cwd"], payload["env"], stdin, stdout, stderr
+            )
+
+        self.request.sendall(EXIT_CODE.pack(code))
+
+
+def create_server(
+    obj: CappaCapable[Any],
+    socket_path: str | os.PathLike[str],
+    *,
+    deps: DepTypes = None,
+    backend: Backend | None = None,
+    color: bool = True,
+    version: str | Arg[str] | None = None,
+    help: bool | Arg[bool] = True,
+    completion: bool | Arg[bool] = True,
+    theme: Theme | None = None,
+    help_formatter: HelpFormattable | None = None,
+    fork: bool = False,
+) -> CommandServer:
+    """Collect the command and bind a `CommandServer` to `socket_path`.
+
+    A stale socket file at `socket_path` is removed before binding. When `fork` is
+    `True`, a `ForkingCommandServer` is produced instead.
+    """
+    from cappa.base import coalesce_backend, collect
+
+    if not hasattr(socket, "AF_UNIX"):  # pragma: no cover
+        raise RuntimeError("`cappa.serve` requires Unix domain socket support.")
+
+    concrete_backend = coalesce_backend(backend)
+    command = collect(
+        obj,
+        backend=concrete_backend,
+        version=version,
+        help=help,
+        completion=completion,
+        help_formatter=help_formatter,
+    )
+
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+
+    server_cls = ForkingCommandServer if fork else CommandServer
+    return server_cls(
+        socket_path,
+        command,
+        backend=concrete_backend,
+        deps=deps,
+        color=color,
+        theme=theme,
+    )
+
+
+def serve(
+    obj: CappaCapable[Any],
+    socket_path: str | os.PathLike[str],
+    *,
+    deps: DepTypes = None,
+    backend: Backend | None = None,
+    color: bool = True,
+    version: str | Arg[str] | None = None,
+    help: bool | Arg[bool] = True,
+    completion: bool | Arg[bool] = True,
+    theme: Theme | None = None,
+    help_formatter: HelpFormattable | None = None,
+    fork: bool = False,
+) -> None:
+    """Serve `obj` over the Unix socket at `socket_path`, until interrupted.
+
+    The command is collected (and its modules imported) once, up front. Each request is
+    then parsed and invoked with a fresh `State` and `Output`, isolated from any prior
+    request except through objects intentionally held by the process (such as
+    pre-constructed values supplied through `deps`).
+
+    Arguments:
+        obj: A class which can represent a CLI command chain.
+        socket_path: The filesystem path at which to bind the Unix socket.
+        deps: Optional extra dependencies, as with `invoke`. Note the mapping form of `deps`
+            can be given already constructed values, which are then shared by all requests.
+        backend: A function used to perform the underlying parsing and return a raw
+            parsed state. This defaults to the native cappa parser.
+        color: Whether to output in color.
+        version: If a string is supplied, adds a -v/--version flag which returns the
+            given string as the version.
+        help: If `True` (default to True), adds a -h/--help flag.
+        completion: Enables completion when using the cappa `backend` option.
+        theme: Optional rich theme to customized output formatting.
+        help_formatter: Override the default help formatter.
+        fork: When `True`, handle each request in a child process forked from the
+            pre-warmed server (see `ForkingCommandServer`), rather than in the server
+            process itself.
+
+    Examples:
+        >>> import cappa.serve
+        >>> def main():
+        ...     cappa.serve.serve(MyCli, "/tmp/my-cli.sock")  # doctest: +SKIP
+    """
+    server = create_server(
+        obj,
+        socket_path,
+        deps=deps,
+        backend=backend,
+        color=color,
+        version=version,
+        help=help,
+        completion=completion,
+        theme=theme,
+        help_formatter=help_formatter,
+        fork=fork,
+    )
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:  # pragma: no cover
+            pass
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(socket_path)
+
+
+def write_client(
+    path: str | os.PathLike[str],
+    socket_path: str | os.PathLike[str],
+    *,
+    python: str | None = None,
+) -> Path:
+    """Write a standalone, executable client script for the server at `socket_path`.
+
+    The script is `cappa.serve_client` with `socket_path` embedded, run by `python`
+    (defaulting to the current interpreter) with `-I -S`. It only depends on the
+    standard library, so each invocation pays for interpreter startup alone, rather than
+    for importing `cappa` (and `rich`).
+
+    Examples:
+        >>> import cappa.serve
+        >>> cappa.serve.write_client("bin/my-cli", "/tmp/my-cli.sock")  # doctest: +SKIP
+        >>> # $ bin/my-cli subcommand --option value
+    """
+    source = Path(serve_client.__file__).read_text()
+    source = re.sub(
+        r"^SOCKET_PATH: .*$",
+        lambda _: f"SOCKET_PATH: str | None = {os.fspath(socket_path)!r}",
+        source,
+        count=1,
+        flags=re.MULTILINE,
+    )
+
+    result = Path(path)
+    result.write_text(f"#!{python or sys.executable} -IS\n{source}")
+    result.chmod(result.stat().st_mode | 0o111)
+    return result
+
+
+def _iter_commands(command: FinalCommand[Any]) -> Iterator[FinalCommand[Any]]:
+    yield command
+
+    subcommand = command.subcommand
+    if subcommand:
+        for option in subcommand.options.values():
+            yield from _iter_commands(option)
+
+
+def _receive(sock: socket.socket) -> tuple[dict[str, Any], list[int]]:
+    fds = array.array("i")
+    header, ancdata, _, _ = sock.recvmsg(
+        LENGTH.size, socket.CMSG_SPACE(FD_COUNT * fds.itemsize)
+    )
+    for level, type, data in ancdata:
+        if level == socket.SOL_SOCKET and type == socket.SCM_RIGHTS:
+            fds.frombytes(data[: len(data) - (len(data) % fds.itemsize)])
+
+    if len(fds) != FD_COUNT:
+        for fd in fds:
+            os.close(fd)
+        raise ValueError(f"Expected {FD_COUNT} file descriptors, got {len(fds)}.")
+
+    header += receive_exactly(sock, LENGTH.size - len(header))
+    (length,) = LENGTH.unpack(header)
+    return json.loads(receive_exactly(sock, length)), list(fds)
+
+
+@contextlib.contextmanager
+def _redirect_process(
+    cwd: str,
+    env: dict[str, str],
+    stdin: IO[str],
+    stdout: IO[str],
+    stderr: IO[str],
+) -> Generator[None, None, None]:
+    streams = (sys.stdin, sys.stdout, sys.stderr)
+    original_env = dict(os.environ)
+    original_cwd = os.getcwd()
+
+    os.environ.clear()
+    os.environ.update(env)
+    os.chdir(cwd)
+    sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+    try:
+        yield
+    finally:
+        stdout.flush()
+        stderr.flush()
+        sys.stdin, sys.stdout, sys.stderr = streams
+        os.chdir(original_cwd)
+        os.environ.clear()
+        os.environ.update(original_env)
+
+
+def _exit_code(e: SystemExit, stderr: IO[str]) -> int:
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+
+    # Mirrors the interpreter's handling of `sys.exit("message")`.
+    stderr.write(f"{e.code}\n")
+    return 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(serve_client.main(sys.argv[1:]))
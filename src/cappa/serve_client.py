@@ -0,0 +1,135 @@
+"""The client half of `cappa.serve`, forwarding a CLI invocation to a running server.
+
+This module is meant to be run by path (rather than as `cappa.serve_client`, which would
+first import `cappa` itself), such that a forwarded invocation costs little more than
+interpreter startup:
+
+    python -I -S path/to/cappa/serve_client.py SOCKET [ARGS...]
+
+Or, more conveniently, as a standalone script written by `cappa.serve.write_client`,
+with the socket path embedded:
+
+    ./my-cli [ARGS...]
+
+To that end, it only imports the (C) modules underlying `socket` and `struct`, which are
+cheap to load, rather than their comparatively slow to import wrappers (or `json`,
+`typing`, etc).
+"""
+
+from __future__ import annotations
+
+import _socket
+import _struct
+import os
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import IO, Any, Sequence
+
+# Requests are framed as a 4-byte payload length (which carries the stdio fds), followed
+# by a JSON payload. The response is a 4-byte signed exit code.
+LENGTH = _struct.Struct("!I")
+EXIT_CODE = _struct.Struct("!i")
+FD_COUNT = 3
+
+# Embedded by `cappa.serve.write_client`, in which case argv is forwarded in its entirety.
+SOCKET_PATH: str | None = None
+
+
+def request(
+    socket_path: str | os.PathLike[str],
+    argv: Sequence[str] | None = None,
+    *,
+    cwd: str | None = None,
+    env: dict[str, str] | None = None,
+    stdin: IO[Any] | None = None,
+    stdout: IO[Any] | None = None,
+    stderr: IO[Any] | None = None,
+) -> int:
+    """Forward a CLI invocation to a `cappa.serve` server, returning its exit code.
+
+    Defaults to forwarding the current process' argv, working directory, environment,
+    and stdio.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    assert stdin and stdout and stderr, "Forwarding requires stdio."
+
+    payload = _dumps(
+        {
+            "argv": list(sys.argv[1:] if argv is None else argv),
+            "cwd": cwd or os.getcwd(),
+            "env": dict(os.environ if env is None else env),
+        }
+    ).encode()
+    fds = [stdin.fileno(), stdout.fileno(), stderr.fileno()]
+
+    # Anything already buffered needs to precede the server's writes to the same fds.
+    stdout.flush()
+    stderr.flush()
+
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(os.fspath(socket_path))
+        sock.sendmsg(
+            [LENGTH.pack(len(payload))],
+            [
+                (
+                    _socket.SOL_SOCKET,
+                    _socket.SCM_RIGHTS,
+                    _struct.pack(f"{len(fds)}i", *fds),
+                )
+            ],
+        )
+        sock.sendall(payload)
+        (code,) = EXIT_CODE.unpack(receive_exactly(sock, EXIT_CODE.size))
+    finally:
+        sock.close()
+
+    return code
+
+
+def main(argv: Sequence[str]) -> int:
+    socket_path = SOCKET_PATH
+    if socket_path is None:
+        if not argv:
+            sys.stderr.write("Usage: serve_client.py SOCKET [ARGS...]\n")
+            return 2
+        socket_path, *argv = argv
+
+    return request(socket_path, argv)
+
+
+def receive_exactly(sock: _socket.socket, size: int) -> bytes:
+    chunks: list[bytes] = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Connection closed mid-message.")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+# Escape quotes, backslashes, control characters, and lone surrogates (e.x. from
+# undecodable environment variables), which cannot otherwise be encoded as UTF-8.
+_ESCAPES = {ord('"'): '\\"', ord("\\"): "\\\\"}
+_ESCAPES.update(
+    (c, f"\\u{c:04x}") for c in (*range(0x20), *range(0xD800, 0xE000), 0x7F)
+)
+
+
+def _dumps(value: str | list[str] | dict[str, Any]) -> str:
+    """Encode the payload as JSON, equivalent to `json.dumps` for its (limited) types."""
+    if isinstance(value, str):
+        return f'"{value.translate(_ESCAPES)}"'
+    if isinstance(value, list):
+        return f"[{','.join(_dumps(item) for item in value)}]"
+    items = (f"{_dumps(key)}:{_dumps(item)}" for key, item in value.items())
+    return f"{{{','.join(items)}}}"
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main(sys.argv[1:]))
@@ -1,21 +1,26 @@
 from __future__ import annotations
 
 import dataclasses
-from typing import TYPE_CHECKING, Any, Iterable, Mapping, TextIO
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping, TextIO
 
 from typing_extensions import Annotated, TypeAlias
 
 from cappa.arg import Group
 from cappa.class_inspect import Field, extract_dataclass_metadata
+from cappa.completion.index import PrefixIndex
 from cappa.completion.types import Completion
 from cappa.invoke.types import Resolved
 from cappa.state import State
+from cappa.suggest import SuggestionIndex
+from cappa.trie import Trie
 from cappa.type_view import Empty, EmptyType, TypeView
 from cappa.typing import T, assert_type, find_annotations
 
 if TYPE_CHECKING:
     from cappa.arg import FinalArg
     from cappa.command import Alias, Command, FinalCommand
+    from cappa.default import ConfigSource, DefaultSources
     from cappa.help import HelpFormattable
     from cappa.output import Output
 
@@ -78,6 +83,9 @@ class Subcommand:
         help_formatter: HelpFormattable | None = None,
         propagated_arguments: list[FinalArg[Any]] | None = None,
         state: State[Any] | None = None,
+        env_prefix: str | None = None,
+        config: ConfigSource | None = None,
+        lazy: bool = False,
     ) -> FinalSubcommand:
         if type_view is None:
             type_view = TypeView(Any)
@@ -85,14 +93,24 @@ class Subcommand:
         field_name = field_name or assert_type(self.field_name, str)
         types = infer_types(self, type_view)
         required = infer_required(self, type_view)
-        options = infer_options(
-            self,
-            types,
-            help_formatter=help_formatter,
+        commands = infer_options(self, types, help_formatter=help_formatter)
+        alias_map = build_alias_map(commands)
+
+        collect = partial(
+            collect_option,
             propagated_arguments=propagated_arguments,
-            state=state,
+            # Commands inferred from `types` are collected without the state.
+            state=state if self.options else None,
+            env_prefix=env_prefix,
+            config=config,
+            lazy=lazy,
         )
-        alias_map = build_alias_map(options)
+        options: Mapping[str, FinalCommand[Any]]
+        if lazy:
+            options = LazyCommands(commands, collect)
+        else:
+            options = {name: collect(command) for name, command in commands.items()}
+
         group = infer_group(self)
 
         return FinalSubcommand(
@@ -121,6 +139,16 @@ class FinalSubcommand(Subcommand):
         default_factory=dict
     )
 
+    _name_index: PrefixIndex | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _name_suggestions: SuggestionIndex | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _name_trie: Trie | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def resolve_name(self, name: str) -> str | None:
         """Return the canonical name for a typed-in name (canonical or alias).
 
@@ -140,18 +168,29 @@ class FinalSubcommand(Subcommand):
         output: Output,
         state: State[Any] | None = None,
         input: TextIO | None = None,
+        sources: DefaultSources | None = None,
     ) -> tuple[Resolved[Any], dict[Any, Any]]:
         canonical = parsed_args.pop("__name__")
         option = self.options[canonical]
         return option.map_result(
-            option, prog, parsed_args, output=output, state=state, input=input
+            option,
+            prog,
+            parsed_args,
+            output=output,
+            state=state,
+            input=input,
+            sources=sources,
         )
 
     def available_options(self) -> list[FinalCommand[Any]]:
         return [o for o in self.options.values() if not o.hidden]
 
     def names(self) -> list[str]:
-        return [n for n, o in self.options.items() if not o.hidden]
+        # Names are known without collecting (lazily collected) commands.
+        options = self.options
+        if isinstance(options, LazyCommands):
+            return [n for n, o in options.commands.items() if not o.hidden]
+        return [n for n, o in options.items() if not o.hidden]
 
     def visible_aliases_for(self, canonical: str) -> list[Alias]:
         """Visible (non-hidden) aliases for the given canonical subcommand name."""
@@ -172,8 +211,36 @@ class FinalSubcommand(Subcommand):
     def names_str(self, delimiter: str = ", ") -> str:
         return delimiter.join(self.names())
 
+    @property
+    def name_index(self) -> PrefixIndex:
+        """The `PrefixIndex` of `all_visible_names`, built on first use."""
+        if self._name_index is None:
+            self._name_index = PrefixIndex(self.all_visible_names())
+        return self._name_index
+
+    @property
+    def name_suggestions(self) -> SuggestionIndex:
+        """The `SuggestionIndex` of `all_visible_names`, built on first use.
+
+        Hidden commands and aliases are never suggested.
+        """
+        if self._name_suggestions is None:
+            self._name_suggestions = SuggestionIndex(self.all_visible_names())
+        return self._name_suggestions
+
+    @property
+    def name_trie(self) -> Trie:
+        """The `Trie` of every accepted name (and alias), mapped to its canonical name."""
+        if self._name_trie is None:
+            names = [(name, name) for name in self.options]
+            names.extend(
+                (alias, target) for alias, (target, _) in self.alias_map.items()
+            )
+            self._name_trie = Trie(names)
+        return self._name_trie
+
     def completion(self, partial: str):
-        return [Completion(o) for o in self.all_visible_names() if partial in o]
+        return [Completion(o) for o in self.name_index.search(partial)]
 
 
 def infer_types(arg: Subcommand, type_view: TypeView[Any]) -> Iterable[type]:
@@ -197,33 +264,77 @@ def infer_options(
     arg: Subcommand,
     types: Iterable[type],
     help_formatter: HelpFormattable | None = None,
-    propagated_arguments: list[FinalArg[Any]] | None = None,
-    state: State[Any] | None = None,
-) -> dict[str, FinalCommand[Any]]:
+) -> dict[str, Command[Any]]:
     from cappa.command import Command
 
     if arg.options:
-        return {
-            name: type_command.collect(
-                propagated_arguments=propagated_arguments,
-                state=state,
-            )
-            for name, type_command in arg.options.items()
-        }
+        return dict(arg.options)
 
-    options: dict[str, FinalCommand[Any]] = {}
+    options: dict[str, Command[Any]] = {}
     for type_ in types:
         type_command: Command[Any] = Command.get(type_, help_formatter=help_formatter)  # pyright: ignore
-        type_name = type_command.real_name()
-        options[type_name] = type_command.collect(
-            propagated_arguments=propagated_arguments
-        )
-
+        options[type_command.real_name()] = type_command
     return options
 
 
+def collect_option(
+    command: Command[Any],
+    *,
+    propagated_arguments: list[FinalArg[Any]] | None,
+    state: State[Any] | None,
+    env_prefix: str | None,
+    config: ConfigSource | None,
+    lazy: bool,
+) -> FinalCommand[Any]:
+    return command.collect(
+        propagated_arguments=propagated_arguments,
+        state=state,
+        env_prefix=env_prefix,
+        config=config,
+        lazy=lazy,
+    )
+
+
+class LazyCommands(Mapping[str, "FinalCommand[Any]"]):
+    """The commands of a subcommand, each of which is collected upon first access.
+
+    Produced by `Command.collect(lazy=True)`, such that only the commands a command line
+    actually reaches (e.x. `sub` of `tool sub --help`) are collected. Names (and
+    membership) are known without collecting anything.
+    """
+
+    def __init__(
+        self,
+        commands: Mapping[str, Command[Any]],
+        collect: Callable[[Command[Any]], FinalCommand[Any]],
+    ):
+        self.commands = commands
+        self.collect = collect
+        self.collected: dict[str, FinalCommand[Any]] = {}
+
+    def __getitem__(self, name: str) -> FinalCommand[Any]:
+        result = self.collected.get(name)
+        if result is None:
+            result = self.collected[name] = self.collect(self.commands[name])
+        return result
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.commands
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.commands)
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def map(self, fn: Callable[[FinalCommand[Any]], FinalCommand[Any]]) -> LazyCommands:
+        """Produce the commands, with `fn` applied to each as it is collected."""
+        collect = self.collect
+        return LazyCommands(self.commands, lambda command: fn(collect(command)))
+
+
 def build_alias_map(
-    options: dict[str, FinalCommand[Any]],
+    options: Mapping[str, Command[Any]],
 ) -> dict[str, tuple[str, Alias]]:
     """Build alias name -> (canonical, Alias) for a set of subcommand options.
 
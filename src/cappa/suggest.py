@@ -0,0 +1,138 @@
+"""Suggest the names a user may have meant, when they mistype one.
+
+Names are indexed by their bigrams, such that (unlike a linear scan) a mistyped name
+is only compared, by its Damerau-Levenshtein distance, to a fraction of the names of a
+CLI with very many subcommands or options.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+__all__ = [
+    "SuggestionIndex",
+    "damerau_levenshtein",
+    "suggest",
+]
+
+
+def damerau_levenshtein(a: str, b: str) -> int:
+    """Return the edit distance between `a` and `b`.
+
+    Edits are insertions, deletions, substitutions and transpositions of adjacent
+    characters (which, unlike the "optimal string alignment" variant, may be edited
+    further).
+
+    Examples:
+        >>> damerau_levenshtein("comit", "commit")
+        1
+        >>> damerau_levenshtein("pshu", "push")
+        2
+        >>> damerau_levenshtein("ca", "abc")
+        2
+    """
+    max_distance = len(a) + len(b)
+    rows = [[max_distance] * (len(b) + 2) for _ in range(len(a) + 2)]
+    for i in range(len(a) + 1):
+        rows[i + 1][1] = i
+    for j in range(len(b) + 1):
+        rows[1][j + 1] = j
+
+    last_row: dict[str, int] = {}
+    for i in range(1, len(a) + 1):
+        last_match_column = 0
+        for j in range(1, len(b) + 1):
+            k = last_row.get(b[j - 1], 0)
+            m = last_match_column
+            cost = 1
+            if a[i - 1] == b[j - 1]:
+                cost = 0
+                last_match_column = j
+
+            rows[i + 1][j + 1] = min(
+                rows[i][j] + cost,
+                rows[i + 1][j] + 1,
+                rows[i][j + 1] + 1,
+                rows[k][m] + (i - k - 1) + 1 + (j - m - 1),
+            )
+        last_row[a[i - 1]] = i
+
+    return rows[len(a) + 1][len(b) + 1]
+
+
+class SuggestionIndex:
+    """An index of the bigrams of names, answering "names within `n` edits of `query`".
+
+    Each edit changes at most 3 of a name's bigrams (a transposition of `xy` changes
+    `?x`, `xy`, and `y?`), so a name within `n` edits of `query` must share all but
+    `3 * n` of the query's bigrams, and differ in length by at most `n`. Only those
+    candidates are compared by their (comparatively expensive) edit distance.
+
+    Matches are ordered by their distance, and then by the order in which the names
+    were given (e.x. declaration order).
+
+    Examples:
+        >>> index = SuggestionIndex(["commit", "checkout", "cherry-pick"])
+        >>> index.search("comit", max_distance=1)
+        ['commit']
+        >>> index.search("chekcout", max_distance=2)
+        ['checkout']
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names = list(dict.fromkeys(names))
+        self.postings: dict[str, list[int]] = {}
+        for position, name in enumerate(self.names):
+            for gram in bigrams(name):
+                self.postings.setdefault(gram, []).append(position)
+
+    def search(self, query: str, max_distance: int) -> list[str]:
+        grams = bigrams(query)
+        threshold = len(grams) - 3 * max_distance
+
+        if threshold > 0:
+            counts: dict[int, int] = {}
+            for gram in grams:
+                for position in self.postings.get(gram, ()):
+                    counts[position] = counts.get(position, 0) + 1
+            candidates: Iterable[int] = sorted(
+                p for p, count in counts.items() if count >= threshold
+            )
+        else:
+            candidates = range(len(self.names))
+
+        matches: list[tuple[int, int, str]] = []
+        for position in candidates:
+            name = self.names[position]
+            if abs(len(name) - len(query)) > max_distance:
+                continue
+
+            distance = damerau_levenshtein(query, name)
+            if distance <= max_distance:
+                matches.append((distance, position, name))
+
+        return [name for _, _, name in sorted(matches)]
+
+
+def bigrams(name: str) -> set[str]:
+    # Padded, such that edits at either end also change a bigram.
+    padded = f"\0{name}\0"
+    return {padded[i : i + 2] for i in range(len(padded) - 1)}
+
+
+def max_suggestion_distance(name: str) -> int:
+    """Scale the edits tolerated in a mistyped name, to its length.
+
+    Otherwise, a short name would be within a couple of edits of most other short names.
+    """
+    return min(3, max(1, len(name.lstrip("-")) // 3))
+
+
+def suggest(
+    query: str, prefix_matches: Iterable[str], index: SuggestionIndex
+) -> list[str]:
+    """Return the names which start with `query`, followed by those within a few edits."""
+    result = dict.fromkeys(prefix_matches)
+    for name in index.search(query, max_suggestion_distance(query)):
+        result.setdefault(name)
+    return list(result)
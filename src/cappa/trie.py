@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Hashable, Iterable, Tuple
+
+__all__ = [
+    "Trie",
+]
+
+
+@dataclasses.dataclass
+class TrieNode:
+    children: dict[str, TrieNode] = dataclasses.field(default_factory=lambda: {})
+    name: str | None = None
+    """The name ending at this node, if any."""
+
+    first: str | None = None
+    """The first name added beneath this node."""
+
+    target: Hashable = None
+    ambiguous: bool = False
+    """Whether the names beneath this node have more than one distinct target."""
+
+
+class Trie:
+    """A character trie of names, each mapped to the `target` they refer to.
+
+    Lookups walk one node per character of the token being matched, independent of
+    the number of names in the trie.
+
+    Examples:
+        >>> trie = Trie([("--verbose", "verbose"), ("--version", "version")])
+        >>> trie.unique_prefix("--verb")
+        '--verbose'
+        >>> trie.unique_prefix("--ver") is None
+        True
+        >>> Trie([("a", "a"), ("bc", "bc")]).first_match("bcd")
+        'bc'
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, Hashable]] = ()):
+        self.root = TrieNode()
+        for name, target in items:
+            self.add(name, target)
+
+    def add(self, name: str, target: Hashable) -> None:
+        node = self.root
+        for char in name:
+            node = node.children.setdefault(char, TrieNode())
+            if node.first is None:
+                node.first, node.target = name, target
+            elif node.target != target:
+                node.ambiguous = True
+
+        node.name = name
+
+    def find(self, prefix: str) -> TrieNode | None:
+        node = self.root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def unique_prefix(self, prefix: str) -> str | None:
+        """Return the name which `prefix` unambiguously abbreviates.
+
+        `prefix` is unambiguous if it is itself a name, or if every name it prefixes
+        refers to the same target (e.x. the aliases of a single option).
+        """
+        node = self.find(prefix)
+        if node is None or node is self.root:
+            return None
+
+        if node.name is not None:
+            return node.name
+
+        if node.ambiguous:
+            return None
+        return node.first
+
+    def first_match(self, text: str, start: int = 0) -> str | None:
+        """Return the shortest name which prefixes `text[start:]`, if any."""
+        node = self.root
+        for index in range(start, len(text)):
+            child = node.children.get(text[index])
+            if child is None:
+                return None
+
+            node = child
+            if node.name is not None:
+                return node.name
+        return None
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -56,6 +56,8 @@ class ParseResult(Generic[T, S]):
         implicit_deps: Mapping of command classes to their deferred instances, collected during parsing.
         output: The output handler for the command.
         state: The state object for the command.
+        chain: The parse results of any subsequent links in a chained command line (see
+            `Command.chain`), to be invoked in order after this one.
     """
 
     root_command: Command[T]
@@ -64,3 +66,4 @@ class ParseResult(Generic[T, S]):
     implicit_deps: dict[Hashable, Any]
     state: State[S]
     output: Output
+    chain: list[ParseResult[T, S]] = field(default_factory=lambda: [])
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+from unittest.mock import patch
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.default import DefaultSources
+from tests.utils import Backend, backends, parse
+
+
+@dataclass
+class Sub:
+    level: Annotated[int, cappa.Arg(long=True)] = 1
+
+
+@dataclass
+class Tool:
+    host: Annotated[str, cappa.Arg(long=True)]
+    port: Annotated[int, cappa.Arg(long=True)] = 80
+    dry_run: Annotated[bool, cappa.Arg(long=True)] = False
+    sub: cappa.Subcommands[Union[Sub, None]] = None
+
+
+@dataclass
+class Positional:
+    positional: Union[str, None] = None
+
+
+explicit_source = cappa.ConfigSource("explicit.json")
+
+
+@dataclass
+class Explicit:
+    name: Annotated[str, cappa.Arg(default=explicit_source.key("other"))] = "default"
+
+
+def tool(source: cappa.ConfigSource) -> cappa.Command[Tool]:
+    return cappa.Command(Tool, config=source, env_prefix="TOOL_")
+
+
+@backends
+def test_toml(backend: Backend, tmp_path: Path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        '[tool.mytool]\nhost = "example.com"\nport = 8080\ndry-run = true\n'
+    )
+
+    tool_ = tool(cappa.ConfigSource(path, section="tool.mytool"))
+    with patch.dict("os.environ", clear=True):
+        test = parse(tool_, backend=backend)
+
+    assert test.host == "example.com"
+    assert test.port == 8080
+    assert test.dry_run is True
+
+
+@backends
+def test_json(backend: Backend, tmp_path: Path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"host": "example.com", "positional": "nope"}))
+
+    source = cappa.ConfigSource(path)
+    with patch.dict("os.environ", clear=True):
+        test = parse(tool(source), backend=backend)
+
+    assert test.host == "example.com"
+    assert test.port == 80
+
+    positional = parse(cappa.Command(Positional, config=source), backend=backend)
+    assert positional.positional is None
+
+
+@backends
+def test_ini(backend: Backend, tmp_path: Path):
+    path = tmp_path / "setup.cfg"
+    path.write_text("[mytool]\nhost = example.com\nport = 8080\n")
+
+    tool_ = tool(cappa.ConfigSource(path, section="mytool"))
+    with patch.dict("os.environ", clear=True):
+        test = parse(tool_, backend=backend)
+
+    assert test.host == "example.com"
+    assert test.port == 8080
+
+
+@backends
+def test_precedence(backend: Backend, tmp_path: Path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"host": "config", "port": 1}))
+
+    tool_ = tool(cappa.ConfigSource(path))
+    with patch("os.environ", new={"TOOL_PORT": "2"}):
+        test = parse(tool_, backend=backend)
+        assert test.host == "config"
+        assert test.port == 2
+
+        test = parse(tool_, "--port", "3", backend=backend)
+        assert test.port == 3
+
+
+@backends
+def test_subcommand_inherits_config(backend: Backend, tmp_path: Path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"host": "config", "level": 4}))
+
+    tool_ = tool(cappa.ConfigSource(path))
+    with patch.dict("os.environ", clear=True):
+        test = parse(tool_, "sub", backend=backend)
+
+    assert test.sub
+    assert test.sub.level == 4
+
+
+@backends
+def test_missing_file(backend: Backend, tmp_path: Path):
+    tool_ = tool(cappa.ConfigSource(tmp_path / "missing.json"))
+    with patch.dict("os.environ", clear=True):
+        test = parse(tool_, "--host", "cli", backend=backend)
+        assert test.port == 80
+
+        with pytest.raises(cappa.Exit) as e:
+            parse(tool_, backend=backend)
+        assert e.value.code == 2
+
+
+@backends
+def test_invalid_file(backend: Backend, tmp_path: Path):
+    path = tmp_path / "config.json"
+    path.write_text("{")
+
+    tool_ = tool(cappa.ConfigSource(path))
+    with patch.dict("os.environ", clear=True):
+        with pytest.raises(cappa.Exit) as e:
+            parse(tool_, "--host", "cli", backend=backend)
+
+    assert e.value.code == 2
+    assert "Invalid config file" in str(e.value.message)
+
+
+@backends
+def test_explicit_config_default(
+    backend: Backend, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.chdir(tmp_path)
+    test = parse(Explicit, backend=backend)
+    assert test.name == "default"
+
+    (tmp_path / "explicit.json").write_text(json.dumps({"other": "config"}))
+    test = parse(Explicit, backend=backend)
+    assert test.name == "config"
+
+
+def test_loaded_once_per_invocation(tmp_path: Path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"host": "config"}))
+    source = cappa.ConfigSource(path)
+
+    sources = DefaultSources()
+    with patch.object(cappa.ConfigSource, "load", return_value={}) as load:
+        sources.config(source)
+        sources.config(source)
+
+    assert load.call_count == 1
+
+
+def test_unchanged_content_not_reparsed(tmp_path: Path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"host": "config"}))
+    source = cappa.ConfigSource(path)
+
+    with patch.object(cappa.ConfigSource, "parse", side_effect=json.loads) as parse_:
+        assert source.load() == {"host": "config"}
+        assert source.load() == {"host": "config"}
+        assert parse_.call_count == 1
+
+        path.write_text(json.dumps({"host": "changed"}))
+        assert source.load() == {"host": "changed"}
+        assert parse_.call_count == 2
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError) as e:
+        cappa.ConfigSource("config.yaml").resolved_format
+
+    assert "Cannot infer config format" in str(e.value)
+
+
+@backends
+def test_required_fallback_loads_once(backend: Backend, tmp_path: Path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"host": "config"}))
+    tool_ = tool(cappa.ConfigSource(path))
+
+    load = cappa.ConfigSource.load
+    with patch.dict("os.environ", clear=True), patch.object(
+        cappa.ConfigSource, "load", autospec=True, side_effect=load
+    ) as load_:
+        test = parse(tool_, "--port", "1", "--dry-run", backend=backend)
+        assert test.host == "config"
+        assert load_.call_count == 1
+
+        # Nothing falls back to the file, so it's never read.
+        load_.reset_mock()
+        parse(tool_, "--host", "cli", "--port", "1", "--dry-run", backend=backend)
+        assert load_.call_count == 0
+
+
+def test_invalid_file_is_exit(tmp_path: Path):
+    path = tmp_path / "config.toml"
+    path.write_text("host = ")
+
+    with pytest.raises(cappa.Exit) as e:
+        cappa.ConfigSource(path).load()
+
+    assert e.value.code == 2
+    assert "Invalid config file" in str(e.value.message)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from io import StringIO
+from typing import TextIO, cast
+
+from typing_extensions import Annotated
+
+import cappa
+from cappa import AsyncConfirm, AsyncPrompt, Default, ValueFrom
+from tests.utils import Backend, backends
+
+
+def parse(cls: type, input: TextIO, backend: Backend | None = None):
+    return asyncio.run(cappa.parse_async(cls, argv=[], input=input, backend=backend))
+
+
+@backends
+def test_value(backend: Backend):
+    @dataclass
+    class Test:
+        name: Annotated[str, cappa.Arg(default=AsyncPrompt("Name"))]
+        ok: Annotated[bool, cappa.Arg(default=AsyncConfirm("Ok"))]
+
+    result = parse(Test, StringIO("two\ny\n"), backend)
+    assert result == Test(name="two", ok=True)
+
+
+def double(value: str) -> int:
+    return int(value) * 2
+
+
+@backends
+def test_fallback(backend: Backend):
+    @dataclass
+    class Test:
+        num: Annotated[
+            int,
+            cappa.Arg(default=Default(AsyncPrompt("Number"), default=5), parse=double),
+        ]
+
+    result = parse(Test, StringIO("4\n"), backend)
+    assert result.num == 8
+
+    # The fallback value is not itself parsed.
+    result = parse(Test, StringIO(""), backend)
+    assert result.num == 5
+
+
+def test_prompt_order():
+    @dataclass
+    class Test:
+        a: Annotated[str, cappa.Arg(default=AsyncPrompt("A"))]
+        b: Annotated[str, cappa.Arg(default=AsyncPrompt("B"))]
+        c: Annotated[str, cappa.Arg(default=AsyncPrompt("C"))]
+
+    for _ in range(5):
+        result = parse(Test, StringIO("1\n2\n3\n"))
+        assert result == Test(a="1", b="2", c="3")
+
+
+resolved = threading.Event()
+
+
+class WaitingInput:
+    """Only produces the user's answer once the async default has been resolved."""
+
+    def readline(self) -> str:
+        if resolved.wait(timeout=5):
+            return "answered\n"
+        return "timed out\n"
+
+
+async def fetch_default() -> str:
+    await asyncio.sleep(0)
+    resolved.set()
+    return "fetched"
+
+
+def test_concurrent_with_prompt():
+    @dataclass
+    class Test:
+        answer: Annotated[str, cappa.Arg(default=AsyncPrompt("Answer"))]
+        fetched: Annotated[str, cappa.Arg(default=ValueFrom(fetch_default))]
+
+    resolved.clear()
+    result = parse(Test, cast(TextIO, WaitingInput()))
+    assert result == Test(answer="answered", fetched="fetched")
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Union
+from unittest.mock import patch
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from tests.utils import Backend, CapsysOutput, backends, parse, terminal_width
+
+
+@cappa.command(env_prefix="TOOL_")
+@dataclass
+class Sub:
+    level: Annotated[int, cappa.Arg(long=True)] = 1
+
+
+@cappa.command(env_prefix="TOOL_")
+@dataclass
+class Positional:
+    positional: Union[str, None] = None
+
+
+@cappa.command(env_prefix="OTHER_")
+@dataclass
+class OtherSub:
+    level: Annotated[int, cappa.Arg(long=True)] = 1
+
+
+@dataclass
+class InheritingSub:
+    level: Annotated[int, cappa.Arg(long=True)] = 1
+
+
+@cappa.command(env_prefix="TOOL_")
+@dataclass
+class Tool:
+    host: Annotated[str, cappa.Arg(long=True)]
+    port: Annotated[int, cappa.Arg(long=True)] = 80
+    explicit: Annotated[str, cappa.Arg(long=True, default=cappa.Env("EXPLICIT"))] = (
+        "explicit"
+    )
+    sub: cappa.Subcommands[Union[InheritingSub, OtherSub, None]] = None
+
+
+@backends
+def test_env_prefix_fulfills_options(backend: Backend):
+    env = {"TOOL_HOST": "example.com", "TOOL_PORT": "8080"}
+    with patch("os.environ", new=env):
+        test = parse(Tool, backend=backend)
+
+    assert test.host == "example.com"
+    assert test.port == 8080
+
+
+@backends
+def test_cli_value_takes_precedence(backend: Backend):
+    env = {"TOOL_HOST": "example.com", "TOOL_PORT": "8080"}
+    with patch("os.environ", new=env):
+        test = parse(Tool, "--host", "cli", "--port", "1", backend=backend)
+
+    assert test.host == "cli"
+    assert test.port == 1
+
+
+@backends
+def test_static_default_fallback(backend: Backend):
+    with patch.dict("os.environ", clear=True):
+        test = parse(Tool, "--host", "cli", backend=backend)
+
+    assert test.port == 80
+
+
+@backends
+def test_still_required_without_env(backend: Backend):
+    with patch.dict("os.environ", clear=True):
+        with pytest.raises(cappa.Exit) as e:
+            parse(Tool, backend=backend)
+
+    assert e.value.code == 2
+
+
+@backends
+def test_explicit_env_untouched(backend: Backend):
+    env = {"TOOL_HOST": "host", "TOOL_EXPLICIT": "nope", "EXPLICIT": "yes"}
+    with patch("os.environ", new=env):
+        test = parse(Tool, backend=backend)
+
+    assert test.explicit == "yes"
+
+
+@backends
+def test_positional_untouched(backend: Backend):
+    with patch("os.environ", new={"TOOL_POSITIONAL": "nope"}):
+        test = parse(Positional, backend=backend)
+
+    assert test.positional is None
+
+
+@backends
+def test_subcommand_inherits_prefix(backend: Backend):
+    env = {"TOOL_HOST": "host", "TOOL_LEVEL": "4", "OTHER_LEVEL": "5"}
+    with patch("os.environ", new=env):
+        test = parse(Tool, "inheriting-sub", backend=backend)
+        assert isinstance(test.sub, InheritingSub)
+        assert test.sub.level == 4
+
+        test = parse(Tool, "other-sub", backend=backend)
+        assert isinstance(test.sub, OtherSub)
+        assert test.sub.level == 5
+
+
+@backends
+def test_no_prefix(backend: Backend):
+    with patch("os.environ", new={"TOOL_LEVEL": "4"}):
+        test = parse(InheritingSub, backend=backend)
+
+    assert test.level == 1
+
+
+@backends
+def test_help_shows_env(backend: Backend, capsys: Any):
+    with terminal_width(), pytest.raises(cappa.HelpExit):
+        parse(Sub, "--help", backend=backend)
+
+    output = CapsysOutput.from_capsys(capsys)
+    assert "(Env: TOOL_LEVEL) (Default: 1)" in output.stdout
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from tests.utils import CapsysOutput, invoke, invoke_async, parse
+
+
+class Client:
+    pass
+
+
+clients: list[Client] = []
+
+
+def create_client() -> Client:
+    client = Client()
+    clients.append(client)
+    return client
+
+
+@dataclass
+class Fetch:
+    urls: Annotated[List[str], cappa.Arg(fanout=True)]
+    retries: Annotated[int, cappa.Arg(long=True)] = 0
+
+    def __call__(self, client: Annotated[Client, cappa.Dep(create_client)]):
+        (url,) = self.urls
+        if url == "bad":
+            raise cappa.Exit(f"Failed to fetch {url}", code=3)
+        return (url, self.retries, client)
+
+
+def test_invoked_per_value():
+    clients.clear()
+    result = invoke(Fetch, "a", "b", "c", "--retries", "2")
+
+    assert [(url, retries) for url, retries, _ in result] == [
+        ("a", 2),
+        ("b", 2),
+        ("c", 2),
+    ]
+
+    # Explicit deps are resolved per invocation.
+    assert len(clients) == 3
+    assert [client for _, _, client in result] == clients
+
+
+def test_global_deps_shared():
+    clients.clear()
+    result = invoke(Fetch, "a", "b", deps=[create_client])
+
+    assert len(clients) == 1
+    assert {client for _, _, client in result} == set(clients)
+
+
+def test_parse_unaffected():
+    result = parse(Fetch, "a", "b", "-j", "2")
+    assert result == Fetch(urls=["a", "b"])
+
+
+def test_failure_aggregated(capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(cappa.Exit) as e:
+        invoke(Fetch, "a", "bad", "c", "bad")
+
+    assert e.value.code == 3
+
+    err = CapsysOutput.from_capsys(capsys).stderr
+    assert err.count("Failed to fetch bad") == 2
+    assert "2 of 4 invocations failed." in err
+
+
+barrier = threading.Barrier(4, timeout=5)
+
+
+@dataclass
+class Concurrent:
+    values: Annotated[Tuple[int, ...], cappa.Arg(fanout=True)]
+
+    def __call__(self):
+        # Only completes if all 4 invocations are running at once.
+        barrier.wait()
+        return self.values, threading.get_ident()
+
+
+@dataclass
+class Serial:
+    values: Annotated[Tuple[int, ...], cappa.Arg(fanout=True)] = ()
+
+    def __call__(self):
+        return self.values, threading.get_ident()
+
+
+def test_jobs():
+    result = invoke(Concurrent, "1", "2", "3", "4", "--jobs", "4")
+    assert [values for values, _ in result] == [(1,), (2,), (3,), (4,)]
+    assert len({thread for _, thread in result}) == 4
+
+
+@pytest.mark.parametrize("jobs", ["-1", "x"])
+def test_invalid_jobs(jobs: str, capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(cappa.Exit) as e:
+        invoke(Serial, "1", "2", "--jobs", jobs)
+
+    assert e.value.code == 2
+    assert "Invalid value for '-j, --jobs'" in str(e.value.message)
+
+
+def test_serial_by_default():
+    result = invoke(Serial, "1", "2", "3")
+    assert [values for values, _ in result] == [(1,), (2,), (3,)]
+    assert len({thread for _, thread in result}) == 1
+
+
+def test_no_values():
+    result = invoke(Serial)
+    assert result == []
+
+
+@dataclass
+class Root:
+    subcommand: cappa.Subcommands[Serial | Fetch]
+
+
+def test_subcommand(capsys: pytest.CaptureFixture[str]):
+    result = invoke(Root, "serial", "1", "2", "-j", "0")
+    assert [values for values, _ in result] == [(1,), (2,)]
+
+    with pytest.raises(cappa.HelpExit):
+        parse(Root, "serial", "--help")
+
+    out = CapsysOutput.from_capsys(capsys).stdout
+    assert "-j, --jobs JOBS" in out
+    assert "The number of values to process concurrently" in out
+
+    with pytest.raises(cappa.HelpExit):
+        parse(Root, "--help")
+
+    out = CapsysOutput.from_capsys(capsys).stdout
+    assert "--jobs" not in out
+
+
+@dataclass
+class AsyncFetch:
+    urls: Annotated[List[str], cappa.Arg(fanout=True)]
+
+    async def __call__(self):
+        return self.urls
+
+
+def test_async():
+    result = asyncio.run(invoke_async(AsyncFetch, "a", "b", "-j", "2"))
+    assert result == [["a"], ["b"]]
+
+
+def test_requires_sequence():
+    @dataclass
+    class Command:
+        value: Annotated[str, cappa.Arg(fanout=True)]
+
+    with pytest.raises(ValueError) as e:
+        parse(Command, "a")
+
+    assert str(e.value) == "`Arg.fanout` requires a sequence argument."
+
+
+def test_single_fanout_argument():
+    @dataclass
+    class Command:
+        a: Annotated[List[str], cappa.Arg(fanout=True, long=True)]
+        b: Annotated[List[str], cappa.Arg(fanout=True, long=True)]
+
+    with pytest.raises(ValueError) as e:
+        parse(Command)
+
+    assert "Only one argument may set `Arg.fanout`" in str(e.value)
+
+
+parsed: list[str] = []
+
+
+def parse_name(value: str) -> str:
+    parsed.append(value)
+    return value
+
+
+def default_token() -> str:
+    parsed.append("default")
+    return "token"
+
+
+@dataclass
+class Shared:
+    values: Annotated[List[str], cappa.Arg(fanout=True)]
+    name: Annotated[str, cappa.Arg(long=True, parse=parse_name)] = ""
+    token: Annotated[
+        str, cappa.Arg(long=True, default=cappa.ValueFrom(default_token))
+    ] = ""
+
+    def __call__(self):
+        return self.values, self.name, self.token
+
+
+def test_shared_fields_resolved_once():
+    parsed.clear()
+    result = invoke(Shared, "a", "b", "c", "--name", "n")
+
+    assert result == [
+        (["a"], "n", "token"),
+        (["b"], "n", "token"),
+        (["c"], "n", "token"),
+    ]
+    assert sorted(parsed) == ["default", "n"]
+
+
+def test_jobs_names_taken():
+    @dataclass
+    class Short:
+        values: Annotated[List[str], cappa.Arg(fanout=True)]
+        json: Annotated[bool, cappa.Arg(short="-j")] = False
+
+        def __call__(self):
+            return self.values, self.json
+
+    assert invoke(Short, "a", "b", "-j", "--jobs", "2") == [
+        (["a"], True),
+        (["b"], True),
+    ]
+
+    @dataclass
+    class Both:
+        values: Annotated[List[str], cappa.Arg(fanout=True)]
+        jobs: Annotated[int, cappa.Arg(short="-j", long="--jobs")] = 0
+
+        def __call__(self):
+            return self.values, self.jobs
+
+    assert invoke(Both, "a", "b", "-j", "5") == [(["a"], 5), (["b"], 5)]
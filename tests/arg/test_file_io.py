@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 import io
+import sys
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, BinaryIO, TextIO
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, TextIO
 from unittest.mock import mock_open, patch
 
 import pytest
 from typing_extensions import Annotated
 
 import cappa
-from tests.utils import Backend, backends, parse
+from tests.utils import Backend, backends, invoke, parse
 
 
 @contextmanager
@@ -190,3 +192,125 @@ def test_open_oserror(backend: Backend):
         e.value.message
         == "Cannot open thisshouldneverexist.py: [Errno 2] No such file or directory: 'thisshouldneverexist.py'"
     )
+
+
+@backends
+def test_line_stream(backend: Backend, tmp_path: Path):
+    @dataclass
+    class Foo:
+        bar: Annotated[Iterator[str], cappa.FileMode()]
+
+    path = tmp_path / "foo.txt"
+    path.write_text("one\ntwo\nthree\n")
+
+    test = parse(Foo, str(path), backend=backend)
+    assert list(test.bar) == ["one\n", "two\n", "three\n"]
+
+
+@backends
+def test_chunk_stream_binary(backend: Backend, tmp_path: Path):
+    @dataclass
+    class Foo:
+        bar: Annotated[Iterator[bytes], cappa.FileMode("rb", chunk_size=4)]
+
+    path = tmp_path / "foo.bin"
+    path.write_bytes(b"0123456789")
+
+    test = parse(Foo, str(path), backend=backend)
+    assert list(test.bar) == [b"0123", b"4567", b"89"]
+
+
+@backends
+def test_chunk_stream_binary_inferred(backend: Backend, tmp_path: Path):
+    @dataclass
+    class Foo:
+        bar: Annotated[Iterator[bytes], cappa.FileMode(chunk_size=4)]
+
+    path = tmp_path / "foo.bin"
+    path.write_bytes(b"0123456789")
+
+    test = parse(Foo, str(path), backend=backend)
+    assert list(test.bar) == [b"0123", b"4567", b"89"]
+
+
+@backends
+def test_stream_binary_mode_conflict(backend: Backend):
+    @dataclass
+    class Foo:
+        bar: Annotated[Iterator[str], cappa.FileMode("rb")]
+
+    with pytest.raises(ValueError) as e:
+        parse(Foo, "-", backend=backend)
+
+    assert "conflicts with an `Iterator[str]` annotation" in str(e.value)
+
+
+@backends
+def test_chunk_stream_text(backend: Backend, tmp_path: Path):
+    @dataclass
+    class Foo:
+        bar: Annotated[Iterator[str], cappa.FileMode(chunk_size=3)]
+
+    path = tmp_path / "foo.txt"
+    path.write_text("abcdefg")
+
+    test = parse(Foo, str(path), backend=backend)
+    assert list(test.bar) == ["abc", "def", "g"]
+
+
+@backends
+def test_stream_stdin(backend: Backend):
+    @dataclass
+    class Foo:
+        bar: Annotated[Iterator[bytes], cappa.FileMode("rb", chunk_size=2)]
+
+    with stdin("wat"):
+        test = parse(Foo, "-", backend=backend)
+        assert list(test.bar) == [b"wa", b"t"]
+
+
+@backends
+def test_stream_closed_by_invoke(backend: Backend, tmp_path: Path):
+    streams: list[Any] = []
+
+    @dataclass
+    class Foo:
+        bar: Annotated[Iterator[str], cappa.FileMode()]
+
+        def __call__(self):
+            streams.append(self.bar)
+            return next(self.bar)
+
+    path = tmp_path / "foo.txt"
+    path.write_text("one\ntwo\n")
+
+    result = invoke(Foo, str(path), backend=backend)
+    assert result == "one\n"
+    assert streams[0].file.closed
+
+
+@backends
+def test_stream_leaves_stdin_open(backend: Backend):
+    @dataclass
+    class Foo:
+        bar: Annotated[Iterator[str], cappa.FileMode()]
+
+        def __call__(self):
+            return list(self.bar)
+
+    with stdin("one\ntwo"):
+        result = invoke(Foo, "-", backend=backend)
+        assert result == ["one\n", "two"]
+        assert not sys.stdin.closed
+
+
+@backends
+def test_iterator_requires_file_mode(backend: Backend):
+    @dataclass
+    class Foo:
+        bar: Iterator[str]
+
+    with pytest.raises(cappa.Exit) as e:
+        parse(Foo, "foo.py", backend=backend)
+
+    assert str(e.value.message).startswith("Invalid value for 'bar'")
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.default import LazyDefault, LazyDefaultError
+from tests.utils import Backend, backends, invoke, parse
+
+calls: list[str] = []
+
+
+def expensive() -> int:
+    calls.append("expensive")
+    return 7
+
+
+@dataclass
+class Command:
+    value: Annotated[
+        int, cappa.Arg(long=True, default=cappa.ValueFrom(expensive), lazy_default=True)
+    ]
+    env: Annotated[
+        int, cappa.Arg(long=True, default=cappa.Env("ENV"), lazy_default=True)
+    ] = 4
+    untouched: Annotated[int, cappa.Arg(long=True, lazy_default=True)] = 5
+
+
+@backends
+def test_deferred_until_access(backend: Backend):
+    calls.clear()
+
+    result = parse(Command, backend=backend)
+    assert calls == []
+    assert isinstance(result.__dict__["value"], LazyDefault)
+
+    assert result.value == 7
+    assert result.value == 7
+    assert calls == ["expensive"]
+    assert result.__dict__["value"] == 7
+
+
+@backends
+def test_supplied_value_not_lazy(backend: Backend):
+    calls.clear()
+
+    result = parse(Command, "--value", "3", backend=backend)
+    assert result.value == 3
+    assert result.__dict__["value"] == 3
+    assert calls == []
+
+
+@backends
+def test_static_default(backend: Backend):
+    result = parse(Command, backend=backend)
+    assert result.untouched == 5
+    assert Command.untouched == 5
+
+
+@backends
+def test_late_validation_error(backend: Backend):
+    with patch("os.environ", new={"ENV": "nope"}):
+        result = parse(Command, backend=backend)
+
+    # An ordinary exception, such that e.x. a `repr` cannot exit the process.
+    with pytest.raises(LazyDefaultError) as e:
+        repr(result)
+
+    assert e.value.exit.code == 2
+    assert "Invalid value for '--env'" in str(e.value)
+
+
+@dataclass
+class Invoked:
+    value: Annotated[int, cappa.Arg(default=cappa.Env("ENV"), lazy_default=True)] = 0
+    other: Annotated[int, cappa.Arg(long=True)] = 0
+
+    def __call__(self):
+        if self.other:
+            return self.other
+        return self.value
+
+
+@backends
+def test_invoke_unread_field(backend: Backend):
+    with patch("os.environ", new={"ENV": "nope"}):
+        assert invoke(Invoked, "--other", "1", backend=backend) == 1
+
+        with pytest.raises(cappa.Exit) as e:
+            invoke(Invoked, backend=backend)
+        assert e.value.code == 2
+
+
+@dataclass
+class Slotted:
+    __slots__ = ("value",)
+    value: Annotated[int, cappa.Arg(lazy_default=True)]
+
+
+def test_slots_unsupported():
+    with pytest.raises(ValueError) as e:
+        parse(Slotted)
+
+    assert "requires a dataclass without `__slots__`" in str(e.value)
+
+
+async def async_default() -> int:
+    return 1
+
+
+@dataclass
+class Async:
+    value: Annotated[
+        int, cappa.Arg(default=cappa.ValueFrom(async_default), lazy_default=True)
+    ]
+
+
+def test_async_unsupported():
+    result: Any = parse(Async)
+    with pytest.raises(ValueError) as e:
+        result.value
+
+    assert "does not support async" in str(e.value)
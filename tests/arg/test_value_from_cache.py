@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from typing_extensions import Annotated
+
+import cappa
+from cappa.cache import DiskCache, default_cache_dir
+from cappa.default import ValueFrom
+from tests.utils import Backend, backends, parse
+
+calls: list[str] = []
+
+
+def expensive(name: str = "default") -> str:
+    calls.append(name)
+    return f"computed-{name}"
+
+
+def empty():
+    calls.append("empty")
+    return cappa.Empty
+
+
+@dataclass
+class Command:
+    value: Annotated[str, cappa.Arg(default=ValueFrom.cached(DiskCache(), expensive))]
+
+
+@backends
+def test_cached_across_invocations(backend: Backend, tmp_path: Path):
+    calls.clear()
+
+    with patch.dict("os.environ", {"XDG_CACHE_HOME": str(tmp_path)}):
+        assert parse(Command, backend=backend).value == "computed-default"
+        assert parse(Command, backend=backend).value == "computed-default"
+        assert calls == ["default"]
+
+        assert parse(Command, "cli", backend=backend).value == "cli"
+        assert calls == ["default"]
+
+    assert len(list((tmp_path / "cappa").iterdir())) == 1
+
+
+def test_keyed_by_kwargs(tmp_path: Path):
+    calls.clear()
+    cache = DiskCache(directory=tmp_path)
+
+    assert ValueFrom.cached(cache, expensive, name="a")() == "computed-a"
+    assert ValueFrom.cached(cache, expensive, name="b")() == "computed-b"
+    assert ValueFrom.cached(cache, expensive, name="a")() == "computed-a"
+    assert calls == ["a", "b"]
+
+
+def test_cache_kwarg_is_passed_through(tmp_path: Path):
+    def fetch(cache: str) -> str:
+        return cache
+
+    assert ValueFrom(fetch, cache="value")() == "value"
+    assert ValueFrom.cached(DiskCache(directory=tmp_path), fetch, cache="value")() == (
+        "value"
+    )
+
+
+def test_unstable_kwargs_not_cached(tmp_path: Path):
+    class Opaque:
+        pass
+
+    calls: list[Any] = []
+
+    def fetch(value: Any) -> str:
+        calls.append(value)
+        return "result"
+
+    cache = DiskCache(directory=tmp_path)
+    for value in (Opaque(), {"a", "b"}, float("nan")):
+        assert cache.key(fetch, {"value": value}) is None
+        assert ValueFrom.cached(cache, fetch, value=value)() == "result"
+        assert ValueFrom.cached(cache, fetch, value=value)() == "result"
+
+    assert len(calls) == 6
+    assert list(tmp_path.iterdir()) == []
+
+    # Paths (and JSON-like values) key stably.
+    key = cache.key(fetch, {"value": [Path("a"), {"b": (1, None)}]})
+    assert key == cache.key(fetch, {"value": ["a", {"b": [1, None]}]})
+
+
+def test_ttl(tmp_path: Path):
+    calls.clear()
+    default = ValueFrom.cached(DiskCache(ttl=10, directory=tmp_path), expensive)
+
+    with patch("time.time", return_value=100):
+        default()
+    with patch("time.time", return_value=105):
+        default()
+    assert calls == ["default"]
+
+    with patch("time.time", return_value=111):
+        default()
+    assert calls == ["default", "default"]
+
+
+def test_depends_on(tmp_path: Path):
+    calls.clear()
+    manifest = tmp_path / "manifest"
+    manifest.write_text("1")
+
+    cache = DiskCache(depends_on=[manifest], directory=tmp_path / "cache")
+    default = ValueFrom.cached(cache, expensive)
+
+    default()
+    default()
+    assert calls == ["default"]
+
+    stat = manifest.stat()
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    default()
+    assert calls == ["default", "default"]
+
+
+def test_json_serializer(tmp_path: Path):
+    calls.clear()
+    default = ValueFrom.cached(
+        DiskCache(directory=tmp_path, serializer="json"), expensive
+    )
+
+    assert default() == "computed-default"
+    assert default() == "computed-default"
+    assert calls == ["default"]
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_empty_not_cached(tmp_path: Path):
+    calls.clear()
+    default = ValueFrom.cached(DiskCache(directory=tmp_path), empty)
+
+    assert default() is cappa.Empty
+    assert default() is cappa.Empty
+    assert calls == ["empty", "empty"]
+
+
+def test_corrupt_entry_recomputed(tmp_path: Path):
+    calls.clear()
+    default = ValueFrom.cached(DiskCache(directory=tmp_path), expensive)
+
+    default()
+    (entry,) = tmp_path.iterdir()
+    entry.write_bytes(b"garbage")
+
+    assert default() == "computed-default"
+    assert calls == ["default", "default"]
+
+
+def test_eviction(tmp_path: Path):
+    cache = DiskCache(directory=tmp_path, max_entries=2)
+
+    for name in "abc":
+        ValueFrom.cached(cache, expensive, name=name)()
+
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_unwritable_directory_ignored(tmp_path: Path):
+    calls.clear()
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+
+    default = ValueFrom.cached(DiskCache(directory=blocker / "cache"), expensive)
+    assert default() == "computed-default"
+    assert default() == "computed-default"
+    assert calls == ["default", "default"]
+
+
+def test_default_cache_dir():
+    with patch.dict("os.environ", {"XDG_CACHE_HOME": "/xdg"}):
+        assert default_cache_dir() == Path("/xdg/cappa")
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List, Union
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.output import Exit
+from cappa.subcommand import LazyCommands
+
+
+@dataclass
+class Good:
+    """Works."""
+
+    value: Annotated[int, cappa.Arg(long=True)] = 0
+
+
+@dataclass
+class Broken:
+    """Fails to collect."""
+
+    a: Annotated[List[int], cappa.Arg(long=True, fanout=True)]
+    b: Annotated[List[int], cappa.Arg(long=True, fanout=True)]
+
+
+@dataclass
+class Group:
+    sub: cappa.Subcommands[Union[Good, Broken]]
+
+
+@dataclass
+class Tool:
+    sub: cappa.Subcommands[Union[Group, Good]]
+
+
+def test_version_is_not_collected(capsys: Any):
+    with pytest.raises(Exit) as e:
+        cappa.parse(Broken, argv=["--version"], version="1.2.3")
+
+    assert e.value.code == 0
+    assert capsys.readouterr().out == "1.2.3\n"
+
+    # Elsewhere, the version requires the command to be collected (and so, fails to).
+    with pytest.raises(ValueError, match="Only one argument may set"):
+        cappa.parse(Broken, argv=["--a", "1", "--version"], version="1.2.3")
+
+
+def test_help_collects_only_its_path(capsys: Any):
+    with pytest.raises(Exit) as e:
+        cappa.parse(Tool, argv=["group", "good", "--help"])
+
+    assert e.value.code == 0
+    assert "--value" in capsys.readouterr().out
+
+    # Without a meta action, the whole tree is collected (and so, fails to).
+    with pytest.raises(ValueError, match="Only one argument may set"):
+        cappa.parse(Tool, argv=["good"])
+
+
+def test_completion_generate(capsys: Any, monkeypatch: Any):
+    monkeypatch.setenv("SHELL", "bash")
+    with pytest.raises(Exit) as e:
+        cappa.parse(Tool, argv=["--completion", "generate"])
+
+    assert e.value.code == 0
+    assert "tool_completion" in capsys.readouterr().out
+
+
+def test_lazy_commands():
+    command = cappa.collect(Tool, lazy=True)
+    subcommand = command.subcommand
+    assert subcommand is not None
+
+    options = subcommand.options
+    assert isinstance(options, LazyCommands)
+    assert "group" in options
+    assert subcommand.names() == ["group", "good"]
+    assert options.collected == {}
+
+    group = options["group"]
+    assert options.collected == {"group": group}
+    assert options["group"] is group
+
+    # Meta actions are applied to lazily collected subcommands, too.
+    assert any(
+        isinstance(arg, cappa.FinalArg) and arg.field_name == "help"
+        for arg in group.arguments
+    )
+
+
+@dataclass
+class Verbose:
+    verbose: Annotated[int, cappa.Arg(short="-v", count=True)] = 0
+
+
+def test_version_conflict_is_collected(capsys: Any):
+    with pytest.raises(Exit) as e:
+        cappa.parse(Verbose, argv=["-v"], version="1.0")
+
+    assert e.value.code == 2
+    assert e.value.message == "Conflicting option string: -v"
+    assert capsys.readouterr().out == ""
+
+    # Without the conflict, the version is output as normal.
+    version: cappa.Arg[str] = cappa.Arg("1.0", long=True)
+    with pytest.raises(Exit) as e:
+        cappa.parse(Verbose, argv=["--version"], version=version)
+
+    assert e.value.code == 0
+    assert capsys.readouterr().out == "1.0\n"
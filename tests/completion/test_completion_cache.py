@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Union
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from tests.utils import parse_completion
+
+calls: list[str] = []
+
+
+def branches(partial: str):
+    calls.append(partial)
+    names = ["main", "maint", "feature", "fix"]
+    return [cappa.Completion(n, help="branch") for n in names if n.startswith(partial)]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: Any):
+    calls.clear()
+    # `parse_completion` replaces `os.environ`, so `XDG_CACHE_HOME` cannot be used.
+    monkeypatch.setattr("cappa.cache.default_cache_dir", lambda: tmp_path)
+    return tmp_path
+
+
+@dataclass
+class Args:
+    branch: Annotated[
+        str, cappa.Arg(long=True, completion=branches, completion_cache=60)
+    ] = ""
+    expired: Annotated[
+        str,
+        cappa.Arg(
+            long=True,
+            completion=branches,
+            completion_cache=cappa.CompletionCache(ttl=0),
+        ),
+    ] = ""
+    cwd: Annotated[
+        str,
+        cappa.Arg(
+            long=True,
+            completion=branches,
+            completion_cache=cappa.CompletionCache(cwd=True),
+        ),
+    ] = ""
+    uncached: Annotated[str, cappa.Arg(long=True, completion=branches)] = ""
+
+
+def test_cached(cache_dir: Path):
+    result = parse_completion(Args, "--branch", "ma")
+    assert result == "main:branch\nmaint:branch"
+
+    result = parse_completion(Args, "--branch", "ma")
+    assert result == "main:branch\nmaint:branch"
+    assert calls == ["ma"]
+    assert list((cache_dir / "completion").iterdir())
+
+
+def test_uncached():
+    parse_completion(Args, "--uncached", "ma")
+    parse_completion(Args, "--uncached", "ma")
+    assert calls == ["ma", "ma"]
+
+
+def test_narrower_prefix_filters_broader_result():
+    result = parse_completion(Args, "--branch", "f")
+    assert result == "feature:branch\nfix:branch"
+
+    result = parse_completion(Args, "--branch", "fi")
+    assert result == "fix:branch"
+
+    # A broader prefix is not answerable from a narrower one.
+    result = parse_completion(Args, "--branch", "")
+    assert result == "main:branch\nmaint:branch\nfeature:branch\nfix:branch"
+    assert calls == ["f", ""]
+
+
+def test_expired():
+    parse_completion(Args, "--expired", "ma")
+    parse_completion(Args, "--expired", "ma")
+    assert calls == ["ma", "ma"]
+
+
+def test_keyed_by_arg():
+    parse_completion(Args, "--branch", "ma")
+    parse_completion(Args, "--cwd", "ma")
+    assert calls == ["ma", "ma"]
+
+
+def test_keyed_by_cwd(cache_dir: Path, monkeypatch: Any):
+    first = cache_dir / "first"
+    second = cache_dir / "second"
+    first.mkdir()
+    second.mkdir()
+
+    monkeypatch.chdir(first)
+    parse_completion(Args, "--cwd", "ma")
+    monkeypatch.chdir(second)
+    parse_completion(Args, "--cwd", "ma")
+    parse_completion(Args, "--cwd", "ma")
+    assert calls == ["ma", "ma"]
+
+
+@dataclass
+class Push:
+    branch: Annotated[str, cappa.Arg(completion=branches, completion_cache=60)]
+
+
+@dataclass
+class Pull:
+    branch: Annotated[str, cappa.Arg(completion=branches, completion_cache=60)]
+
+
+@dataclass
+class Git:
+    cmd: cappa.Subcommands[Union[Push, Pull]]
+
+
+def test_keyed_by_command_path():
+    parse_completion(Git, "push", "ma")
+    parse_completion(Git, "pull", "ma")
+    parse_completion(Git, "pull", "ma")
+    assert calls == ["ma", "ma"]
+
+
+def test_completion_cache_coerce():
+    assert cappa.CompletionCache.coerce(5) == cappa.CompletionCache(ttl=5)
+
+    cache = cappa.CompletionCache(cwd=True)
+    assert cappa.CompletionCache.coerce(cache) is cache
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.completion.runner import CompletionSource, run_completers
+from tests.utils import parse_completion
+
+release = threading.Event()
+events: list[str] = []
+
+
+@pytest.fixture(autouse=True)
+def reset(tmp_path: Path, monkeypatch: Any):
+    events.clear()
+    release.clear()
+    monkeypatch.setattr("cappa.cache.default_cache_dir", lambda: tmp_path)
+    yield
+    release.set()
+
+
+async def async_names(partial: str):
+    await asyncio.sleep(0)
+    return [cappa.Completion(n) for n in ["lucy", "bob"] if n.startswith(partial)]
+
+
+def sleepy_names(partial: str):
+    time.sleep(0.5)
+    return [cappa.Completion("sleepy")]
+
+
+def blocking_names(partial: str):
+    release.wait(5)
+    events.append("finished")
+    return [cappa.Completion("blocked")]
+
+
+async def slow_async_names(partial: str):
+    try:
+        await asyncio.sleep(5)
+    except asyncio.CancelledError:
+        events.append("cancelled")
+        raise
+    return [cappa.Completion("slow")]
+
+
+@cappa.command(completion_timeout=0.25)
+@dataclass
+class Args:
+    name: Annotated[str, cappa.Arg(long=True, completion=async_names)] = ""
+    blocking: Annotated[str, cappa.Arg(long=True, completion=blocking_names)] = ""
+    slow: Annotated[str, cappa.Arg(long=True, completion=slow_async_names)] = ""
+    cached: Annotated[
+        str,
+        cappa.Arg(
+            long=True,
+            completion=sleepy_names,
+            completion_cache=cappa.CompletionCache(background=True),
+        ),
+    ] = ""
+    cached_async: Annotated[
+        str, cappa.Arg(long=True, completion=async_names, completion_cache=60)
+    ] = ""
+
+
+@dataclass
+class NoTimeout:
+    name: Annotated[str, cappa.Arg(long=True, completion=async_names)] = ""
+
+
+def test_async_completion():
+    assert parse_completion(NoTimeout, "--name", "l") == "lucy:"
+    assert parse_completion(Args, "--name", "") == "lucy:\nbob:"
+
+
+def test_cached_async_completion():
+    assert parse_completion(Args, "--cached-async", "l") == "lucy:"
+    assert parse_completion(Args, "--cached-async", "lu") == "lucy:"
+
+
+def test_sync_straggler_is_abandoned():
+    start = time.monotonic()
+    assert parse_completion(Args, "--blocking", "") is None
+    assert time.monotonic() - start < 2
+
+
+def test_async_straggler_is_cancelled():
+    assert parse_completion(Args, "--slow", "") is None
+
+    deadline = time.monotonic() + 2
+    while not events and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert events == ["cancelled"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_background_straggler_populates_cache(tmp_path: Path):
+    start = time.monotonic()
+    assert parse_completion(Args, "--cached", "") is None
+    assert time.monotonic() - start < 0.5
+
+    # The straggler finishes in a child process, which outlives the completion request.
+    deadline = time.monotonic() + 5
+    while not list(tmp_path.glob("completion/*.json")):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+    assert parse_completion(Args, "--cached", "") == "sleepy:"
+
+
+def test_run_completers_preserves_order():
+    def slow():
+        time.sleep(0.02)
+        return [cappa.Completion("a")]
+
+    sources = [
+        CompletionSource(slow),
+        CompletionSource(lambda: [cappa.Completion("b")]),
+        CompletionSource(lambda: slow_async_names("")),
+    ]
+    result = run_completers(sources, timeout=0.5)
+    assert result == [cappa.Completion("a"), cappa.Completion("b")]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Union
+
+import pytest
+from typing_extensions import Annotated, Literal
+
+import cappa
+from cappa.completion.completers import ChoiceCompleter
+from cappa.completion.index import PrefixIndex
+from cappa.parser import backend
+from tests.utils import parse, parse_completion
+
+
+def test_search_preserves_given_order():
+    index = PrefixIndex(["b2", "a", "b1", "ab", "b"])
+    assert index.search("b") == ["b2", "b1", "b"]
+    assert index.search("a") == ["a", "ab"]
+    assert index.search("") == ["b2", "a", "b1", "ab", "b"]
+    assert index.search("c") == []
+    assert len(index) == 5
+
+
+def test_search_pages():
+    index = PrefixIndex([f"name{i}" for i in range(10)])
+    assert index.search("name", limit=3) == ["name0", "name1", "name2"]
+    assert index.search("name", limit=3, offset=9) == ["name9"]
+    assert index.search("name", offset=20) == []
+
+
+def test_search_pages_match_unlimited():
+    names = [f"{i * 7919 % 1000:03}" for i in range(1000)]
+    index = PrefixIndex(names)
+    for prefix in ["", "1", "12", "999", "5"]:
+        expected = index.search(prefix)
+        assert expected == [name for name in names if name.startswith(prefix)]
+        for offset in [0, 1, 7, 50]:
+            page = index.search(prefix, limit=10, offset=offset)
+            assert page == expected[offset : offset + 10]
+
+
+def test_limited_search_visits_only_the_page():
+    index = PrefixIndex([*[f"svc-{i}" for i in range(50_000)][::-1], "other"])
+    calls: list[tuple[int, int]] = []
+    range_min = index.range_min
+
+    def counted(lo: int, hi: int) -> tuple[int, int]:
+        calls.append((lo, hi))
+        return range_min(lo, hi)
+
+    index.range_min = counted  # type: ignore[method-assign]
+    assert index.search("svc-", limit=2, offset=1) == ["svc-49998", "svc-49997"]
+    assert len(calls) <= 7
+
+
+def test_search_non_ascii():
+    index = PrefixIndex(["über", "u", "ü"])
+    assert index.search("ü") == ["über", "ü"]
+
+
+def test_choice_completer_limit():
+    completer = ChoiceCompleter([f"svc-{i}" for i in range(50_000)], limit=2)
+    assert [c.value for c in completer("svc-4999")] == ["svc-4999", "svc-49990"]
+
+
+@dataclass
+class Args:
+    value: Annotated[str, cappa.Arg(choices=["alpha", "beta", "alphabet"])]
+
+
+def test_choices_complete_by_prefix():
+    assert parse_completion(Args, "alp") == "alpha:\nalphabet:"
+
+    # Choices are matched by prefix, rather than anywhere within the choice.
+    assert parse_completion(Args, "bet") == "beta:"
+
+
+@dataclass
+class Push:
+    pass
+
+
+@dataclass
+class Pull:
+    pass
+
+
+@dataclass
+class Git:
+    cmd: cappa.Subcommands[Union[Push, Pull]]
+    verbose: Annotated[bool, cappa.Arg(long=True)] = False
+    version: Annotated[Literal["1", "2"], cappa.Arg(long=True)] = "1"
+
+
+def test_subcommands_complete_by_prefix():
+    assert parse_completion(Git, "pu") == "push:\npull:"
+
+    # Subcommands are matched by prefix, rather than anywhere within the name.
+    assert parse_completion(Git, "ll") is None
+
+
+def test_subcommand_suggestions():
+    with pytest.raises(cappa.Exit) as e:
+        parse(Git, "pu", backend=backend)
+
+    message = str(e.value.message)
+    assert "Did you mean" in message
+    assert message.index("push") < message.index("pull")
+
+
+def test_option_suggestions():
+    with pytest.raises(cappa.Exit) as e:
+        parse(Git, "--ver", backend=backend)
+
+    message = "Unrecognized arguments: --ver (Did you mean: --verbose, --version)"
+    assert e.value.message == message
+
+
+def test_option_index_is_built_once():
+    command = cappa.collect(Git, backend=backend)
+    index = command.option_index(["--verbose", "--version"])
+    assert command.option_index([]) is index
@@ -53,3 +53,12 @@ def test_no_help_value_name():
 
     result = parse_completion(Args, "--a")
     assert result == "--apple:<apple>"
+
+
+def test_markdown_help_is_plain_text():
+    @dataclass
+    class Args:
+        apple: Annotated[str, cappa.Arg(long=True, help="The **best** `fruit`.")]
+
+    result = parse_completion(Args, "--a")
+    assert result == "--apple:The best fruit."
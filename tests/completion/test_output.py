@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.help import HelpFormatter
+from cappa.parser import backend
+
+long_help = " ".join(["word"] * 40)
+
+
+def test_completions_are_not_wrapped(capsys: Any):
+    @dataclass
+    class Args:
+        apple: Annotated[str, cappa.Arg(long=True, help=long_help)]
+
+    env = {"COMPLETION_LINE": "test.py --a", "COMPLETION_LOCATION": "2"}
+    with patch("os.environ", new=env):
+        with pytest.raises(cappa.Exit) as e:
+            cappa.parse(Args, argv=["--completion", "complete"], backend=backend)
+
+    assert e.value.code == 0
+    assert capsys.readouterr().out == f"--apple:{long_help}\n"
+
+
+def test_completions_do_not_render_help():
+    @dataclass
+    class Args:
+        apple: Annotated[str, cappa.Arg(long=True)]
+
+    env = {"COMPLETION_LINE": "test.py --a", "COMPLETION_LOCATION": "2"}
+    with patch("os.environ", new=env):
+        with patch.object(HelpFormatter, "long") as long:
+            with pytest.raises(cappa.Exit):
+                cappa.parse(Args, argv=["--completion", "complete"], backend=backend)
+
+    long.assert_not_called()
+
+
+def test_exit_fields():
+    output = cappa.Output(error_format="{prog}: {message} {short_help.x}")
+    assert output.exit_fields(0) == {"message"}
+    assert output.exit_fields(1) == {"prog", "message", "short_help"}
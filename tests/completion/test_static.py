@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Union
+from unittest.mock import patch
+
+import pytest
+from typing_extensions import Annotated, Literal
+
+import cappa
+from cappa.completion.static import collect_records
+from cappa.parser import backend
+from tests.utils import parse
+
+
+def names(partial: str):
+    return [cappa.Completion(n) for n in ["lucy", "bob"] if n.startswith(partial)]
+
+
+@dataclass
+class Add:
+    """Add a remote."""
+
+    name: Annotated[str, cappa.Arg(completion=names)]
+    url: str
+    mode: Annotated[Literal["fetch", "push"], cappa.Arg(long=True)] = "fetch"
+
+
+@dataclass
+class Remove:
+    """Remove remotes."""
+
+    names: list[str]
+
+
+@cappa.command(aliases=["r"])
+@dataclass
+class Remote:
+    """Manage remotes.
+
+    With a long description.
+    """
+
+    cmd: cappa.Subcommands[Union[Add, Remove]]
+
+
+@dataclass
+class Tool:
+    verbose: Annotated[bool, cappa.Arg(short=True, long=True, help="Be loud.")] = False
+    cmd: cappa.Subcommands[Union[Remote, None]] = None
+
+
+def generate(shell: str, capsys: Any) -> str:
+    with patch("os.environ", new={"SHELL": shell}):
+        with pytest.raises(cappa.Exit) as e:
+            parse(Tool, "--completion", "generate-static", backend=backend)
+
+    assert e.value.code == 0
+    assert e.value.message is None
+    return capsys.readouterr().out
+
+
+def test_records():
+    command = cappa.collect(Tool, backend=backend, completion=False)
+    records = collect_records(command)
+
+    assert records == [
+        (".", "opt", "-v", "flag", "Be loud."),
+        (".", "opt", "--verbose", "flag", "Be loud."),
+        (".", "opt", "-h", "flag", "Show this message and exit."),
+        (".", "opt", "--help", "flag", "Show this message and exit."),
+        (".", "cmd", "remote", "remote", "Manage remotes."),
+        (".", "cmd", "r", "remote", "Manage remotes."),
+        (". remote", "opt", "-h", "flag", "Show this message and exit."),
+        (". remote", "opt", "--help", "flag", "Show this message and exit."),
+        (". remote", "cmd", "add", "add", "Add a remote."),
+        (". remote add", "opt", "--mode", "choices", ""),
+        (". remote add", "val:--mode", "fetch", "-", ""),
+        (". remote add", "val:--mode", "push", "-", ""),
+        (". remote add", "opt", "-h", "flag", "Show this message and exit."),
+        (". remote add", "opt", "--help", "flag", "Show this message and exit."),
+        (". remote add", "pos", "0", "dynamic", ""),
+        (". remote add", "pos", "1", "file", ""),
+        (". remote", "cmd", "remove", "remove", "Remove remotes."),
+        (". remote remove", "opt", "-h", "flag", "Show this message and exit."),
+        (". remote remove", "opt", "--help", "flag", "Show this message and exit."),
+        (". remote remove", "pos", "0", "file", ""),
+        (". remote remove", "pos", "+", "file", ""),
+    ]
+
+
+@cappa.command(hidden=True, aliases=[cappa.Alias("older")])
+@dataclass
+class Old:
+    pass
+
+
+@dataclass
+class Legacy:
+    cmd: cappa.Subcommands[Old]
+
+
+def test_hidden_commands_are_not_offered():
+    command = cappa.collect(Legacy, backend=backend, help=False, completion=False)
+    assert collect_records(command) == [
+        (".", "alias", "old", "old", ""),
+        (".", "alias", "older", "old", ""),
+    ]
+
+
+@pytest.mark.parametrize("shell", ["bash", "zsh", "fish"])
+def test_generate_static(shell: str, capsys: Any):
+    script = generate(shell, capsys)
+
+    assert "_tool_completion" in script
+    assert "--completion=complete" in script
+    assert ".\tcmd\tremote\tremote\tManage remotes." in script
+
+    # Unlike the dynamic script, the tab-separated table is not wrapped by rich.
+    assert ". remote add\tval:--mode\tfetch\t-\t\n" in script
+
+
+def test_static_is_a_completion_choice(capsys: Any):
+    # A positional `--static` (or one preceding `--completion`) is not the static mode.
+    with patch("os.environ", new={"SHELL": "bash"}):
+        with pytest.raises(cappa.Exit) as e:
+            parse(Tool, "--completion", "generate", "--static", backend=backend)
+
+    assert e.value.code == 0
+    assert "\tcmd\t" not in str(e.value.message)
+
+    with pytest.raises(cappa.HelpExit):
+        parse(Tool, "--help", backend=backend)
+
+    assert "generate-static" in capsys.readouterr().out
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="requires bash")
+@pytest.mark.parametrize(
+    "words, expected",
+    [
+        (["tool", ""], ["remote", "r"]),
+        (["tool", "--v"], ["--verbose"]),
+        (["tool", "-v", "r", ""], ["add", "remove"]),
+        (["tool", "remote", "add", "--mode", ""], ["fetch", "push"]),
+        (["tool", "remote", "add", "--mode", "=", "p"], ["push"]),
+        (["tool", "remote", "add", "--mode", "push", "--"], ["--mode", "--help"]),
+        (["tool", "remote", "remove", "a", "b", ""], []),
+    ],
+)
+def test_bash_static_completion(
+    words: list[str], expected: list[str], capsys: Any, tmp_path: Path
+):
+    script = tmp_path / "completion.bash"
+    script.write_text(generate("bash", capsys))
+
+    words_arg = " ".join(f"'{w}'" for w in words)
+    driver = f"""
+        compopt() {{ :; }}
+        source {script}
+        COMP_WORDS=({words_arg})
+        COMP_CWORD={len(words) - 1}
+        _tool_completion tool
+        printf '%s\\n' "${{COMPREPLY[@]}}"
+    """
+    bash = shutil.which("bash")
+    assert bash
+    result = subprocess.run(  # noqa: S603
+        [bash, "-c", driver], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == expected
@@ -21,5 +21,7 @@ def test_string_group(capsys: Any):
 
     out = capsys.readouterr().out
 
-    options = re.findall(r"Valid\s+options:\s+generate,\s+complete", out, re.MULTILINE)
+    options = re.findall(
+        r"Valid\s+options:\s+generate,\s+generate-static,\s+complete", out, re.MULTILINE
+    )
     assert len(options) == 1
@@ -42,6 +42,6 @@ def test_argument_name(capsys: Any):
             [-h, --help]               Show this message and exit.
             [--completion COMPLETION]  Use --completion generate to print shell-specific
                                        completion source. Valid options: generate,
-                                       complete.
+                                       generate-static, complete.
         """
     )
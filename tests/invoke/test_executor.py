@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from dataclasses import dataclass
+from typing import Generator
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+
+events: list[str] = []
+
+
+def thread_name() -> str:
+    return threading.current_thread().name
+
+
+def process_id() -> int:
+    return os.getpid()
+
+
+def connection() -> Generator[str, None, None]:
+    events.append(f"enter:{thread_name()}")
+    yield "conn"
+    events.append(f"exit:{thread_name()}")
+
+
+unblocked = threading.Event()
+
+
+def blocking() -> bool:
+    # Only returns `True` if the event loop is free to run `unblock` meanwhile.
+    return unblocked.wait(timeout=5)
+
+
+async def unblock():
+    await asyncio.sleep(0)
+    unblocked.set()
+
+
+@dataclass
+class Blocking:
+    async def __call__(
+        self, value: Annotated[bool, cappa.Dep(blocking, executor="thread")]
+    ):
+        return value
+
+
+def test_does_not_block_event_loop():
+    unblocked.clear()
+
+    async def main():
+        return await asyncio.gather(
+            cappa.invoke_async(Blocking, argv=[]),
+            unblock(),
+        )
+
+    result, _ = asyncio.run(main())
+    assert result is True
+
+
+@dataclass
+class ThreadDep:
+    async def __call__(
+        self, name: Annotated[str, cappa.Dep(thread_name, executor="thread")]
+    ):
+        return name, thread_name()
+
+
+def test_dep_thread():
+    dep, handler = asyncio.run(cappa.invoke_async(ThreadDep, argv=[]))
+    assert dep.startswith("cappa")
+    assert handler == "MainThread"
+
+
+@cappa.command(invoke=thread_name, executor="thread")
+@dataclass
+class ThreadCommand:
+    pass
+
+
+def test_sync_invoke_ignores_executor():
+    result = cappa.invoke(ThreadCommand, argv=[])
+    assert result == "MainThread"
+
+
+def test_command_thread():
+    result = asyncio.run(cappa.invoke_async(ThreadCommand, argv=[]))
+    assert result.startswith("cappa")
+
+
+@cappa.command(invoke=process_id, executor="process")
+@dataclass
+class ProcessCommand:
+    pass
+
+
+def test_command_process():
+    result = asyncio.run(cappa.invoke_async(ProcessCommand, argv=[]))
+    assert result != os.getpid()
+
+
+@dataclass
+class Generic:
+    def __call__(
+        self,
+        conn: Annotated[str, cappa.Dep(connection)],
+        name: Annotated[str, cappa.Dep(thread_name)],
+    ):
+        return conn, name, thread_name()
+
+
+def test_default_executor():
+    events.clear()
+    conn, dep, handler = asyncio.run(
+        cappa.invoke_async(Generic, argv=[], executor="thread")
+    )
+    assert conn == "conn"
+    assert dep.startswith("cappa")
+    assert handler.startswith("cappa")
+
+    enter, exit = events
+    assert enter.startswith("enter:cappa")
+    assert exit.startswith("exit:cappa")
+
+
+def test_no_executor():
+    events.clear()
+    result = asyncio.run(cappa.invoke_async(Generic, argv=[]))
+    assert result == ("conn", "MainThread", "MainThread")
+
+
+def test_default_process_executor():
+    # Context manager deps fall back to a thread, rather than failing.
+    events.clear()
+    conn, dep, handler = asyncio.run(
+        cappa.invoke_async(Generic, argv=[], executor="process")
+    )
+    assert conn == "conn"
+    assert dep == handler == "MainThread"
+
+    enter, exit = events
+    assert enter.startswith("enter:cappa")
+    assert exit.startswith("exit:cappa")
+
+
+@dataclass
+class ProcessGenerator:
+    def __call__(
+        self, conn: Annotated[str, cappa.Dep(connection, executor="process")]
+    ):  # pragma: no cover
+        return conn
+
+
+def test_generator_process_executor():
+    with pytest.raises(ValueError) as e:
+        asyncio.run(cappa.invoke_async(ProcessGenerator, argv=[]))
+
+    assert "cannot use the 'process' executor" in str(e.value)
+
+
+def test_dep_override():
+    assert cappa.Dep(thread_name, executor="thread").key() == cappa.Dep(thread_name)
+
+    # Overriding the dep still applies, despite the annotation's `executor`.
+    result = asyncio.run(
+        cappa.invoke_async(ThreadDep, argv=[], deps={thread_name: "override"})
+    )
+    assert result == ("override", "MainThread")
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Generator
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.batch import BatchResult
+
+events: list[str] = []
+
+
+class Client:
+    pass
+
+
+def create_client() -> Generator[Client, None, None]:
+    events.append("connect")
+    yield Client()
+    events.append("disconnect")
+
+
+@dataclass
+class Command:
+    value: int
+    fail: Annotated[bool, cappa.Arg(long=True)] = False
+
+    def __call__(self, client: Annotated[Client, cappa.Dep(create_client)]):
+        if self.fail:
+            raise cappa.Exit("failed!", code=3)
+        return (self.value * 2, id(client), os.getpid())
+
+
+def test_results_in_order():
+    events.clear()
+    results = list(
+        cappa.invoke_many(Command, [["1"], ["2"], ["3"]], deps=[create_client])
+    )
+
+    assert [r.value[0] for r in results] == [2, 4, 6]
+    assert [r.argv for r in results] == [["1"], ["2"], ["3"]]
+    assert all(r.code == 0 and r.exit is None for r in results)
+
+    # The dep is resolved once, and shared by each invocation.
+    assert events == ["connect", "disconnect"]
+    assert len({r.value[1] for r in results}) == 1
+
+
+def test_failures_captured(capsys: pytest.CaptureFixture[str]):
+    results = list(
+        cappa.invoke_many(
+            Command, [["1", "--fail"], ["nope"], ["--help"], ["4"]], color=False
+        )
+    )
+
+    codes = [r.code for r in results]
+    assert codes == [3, 2, 0, 0]
+
+    failed = results[0].exit
+    assert isinstance(failed, cappa.Exit)
+    assert failed.message == "failed!"
+    assert isinstance(results[2].exit, cappa.HelpExit)
+    assert results[3].value[0] == 8
+
+    err = capsys.readouterr().err
+    assert "failed!" in err
+    assert "Invalid value for 'value'" in err
+
+
+def test_consumed_lazily():
+    consumed: list[int] = []
+
+    def argvs():
+        for i in range(100):
+            consumed.append(i)
+            yield [str(i)]
+
+    results = cappa.invoke_many(Command, argvs())
+    first = next(results)
+
+    assert first.value[0] == 0
+    assert consumed == [0]
+
+
+def test_process_pool():
+    argvs = [[str(i)] for i in range(20)] + [["1", "--fail"]]
+    results = list(
+        cappa.invoke_many(
+            Command, argvs, deps=[create_client], jobs=2, chunksize=3, color=False
+        )
+    )
+
+    assert [r.value[0] for r in results[:-1]] == [i * 2 for i in range(20)]
+    assert all(r.value[2] != os.getpid() for r in results[:-1])
+
+    failed = results[-1]
+    assert isinstance(failed, BatchResult)
+    assert failed.code == 3
+    assert isinstance(failed.exit, cappa.Exit)
+    assert failed.exit.message == "failed!"
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import cappa
+from cappa import argparse
+from cappa.invoke import base as invoke_base
+from cappa.invoke.types import InvokeResolutionError
+from tests.utils import invoke, parse_completion
+
+module_source = """
+import threading
+
+imported_by = threading.current_thread().name
+
+
+def run():
+    return imported_by
+"""
+
+
+@pytest.fixture
+def modules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    for name in ("prefetch_target", "preload_target"):
+        (tmp_path / f"{name}.py").write_text(module_source)
+
+    monkeypatch.syspath_prepend(str(tmp_path))  # pyright: ignore
+    yield
+    for name in ("prefetch_target", "preload_target"):
+        sys.modules.pop(name, None)
+
+
+@cappa.command(invoke="prefetch_target.run", preload=["preload_target"])
+@dataclass
+class Sub:
+    value: int = 0
+
+
+@dataclass
+class Root:
+    subcommand: cappa.Subcommands[Sub]
+
+
+@pytest.fixture
+def prefetched(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, list[str]]]:
+    calls: list[tuple[str, list[str]]] = []
+    original = invoke_base.import_modules
+
+    def record(module_names: list[str]):
+        calls.append((threading.current_thread().name, module_names))
+        original(module_names)
+
+    monkeypatch.setattr(invoke_base, "import_modules", record)
+    return calls
+
+
+def test_invoke_target_prefetched(
+    modules: None, prefetched: list[tuple[str, list[str]]]
+):
+    result = invoke(Root, "sub")
+    assert result in {"cappa-prefetch", "MainThread"}
+
+    assert prefetched == [("cappa-prefetch", ["preload_target", "prefetch_target"])]
+
+
+def test_not_prefetched_for_completions(
+    modules: None, prefetched: list[tuple[str, list[str]]]
+):
+    completions = parse_completion(Root, "sub", "--")
+    assert completions and "--help" in completions
+    assert prefetched == []
+    assert "prefetch_target" not in sys.modules
+
+
+def test_argparse_not_prefetched(
+    modules: None, prefetched: list[tuple[str, list[str]]]
+):
+    result = invoke(Root, "sub", backend=argparse.backend)
+    assert result == "MainThread"
+    assert prefetched == []
+
+
+def test_missing_module():
+    @cappa.command(invoke="missing_prefetch_target.run")
+    @dataclass
+    class Command:
+        pass
+
+    with pytest.raises(InvokeResolutionError) as e:
+        invoke(Command)
+
+    assert "No module 'missing_prefetch_target'" in str(e.value.__cause__)
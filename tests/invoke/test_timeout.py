@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import selectors
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Coroutine
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.base import timeout_exit_code
+
+
+class FakeClockSelector(selectors.DefaultSelector):
+    """Advance the fake clock to the next scheduled timer, rather than sleeping."""
+
+    def __init__(self, loop: FakeClockLoop):
+        super().__init__()
+        self.loop = loop
+
+    def select(self, timeout: float | None = None):
+        if timeout:
+            self.loop.now += timeout
+            timeout = 0
+        return super().select(timeout)
+
+
+class FakeClockLoop(asyncio.SelectorEventLoop):
+    def __init__(self):
+        self.now = 0.0
+        super().__init__(FakeClockSelector(self))
+
+    def time(self) -> float:
+        return self.now
+
+
+def run(coroutine: Coroutine[Any, Any, Any]) -> tuple[Any, float]:
+    loop = FakeClockLoop()
+    try:
+        return loop.run_until_complete(coroutine), loop.now
+    finally:
+        loop.close()
+
+
+events: list[str] = []
+
+
+async def slow_dep() -> AsyncGenerator[str, None]:
+    events.append("enter")
+    try:
+        yield "dep"
+    finally:
+        await asyncio.sleep(5)
+        events.append("exit")
+
+
+async def hanging_dep():
+    try:
+        await asyncio.sleep(1000)
+    finally:
+        events.append("cancelled")
+
+
+@dataclass
+class Sleep:
+    seconds: int = 60
+
+    async def __call__(self, dep: Annotated[str, cappa.Dep(slow_dep)]):
+        await asyncio.sleep(self.seconds)
+        return dep
+
+
+def test_no_timeout():
+    events.clear()
+    result, now = run(cappa.invoke_async(Sleep, argv=[]))
+    assert result == "dep"
+    assert now == 65
+    assert events == ["enter", "exit"]
+
+
+def test_timeout(capsys: pytest.CaptureFixture[str]):
+    events.clear()
+    with pytest.raises(cappa.Exit) as e:
+        run(cappa.invoke_async(Sleep, argv=[], timeout=30))
+
+    assert e.value.code == timeout_exit_code == 124
+    assert e.value.message == "Command timed out after 30s."
+    assert "Command timed out after 30s." in capsys.readouterr().err
+
+    # The dependency is still torn down.
+    assert events == ["enter", "exit"]
+
+
+def test_within_timeout():
+    result, now = run(cappa.invoke_async(Sleep, argv=["10"], timeout=30))
+    assert result == "dep"
+    assert now == 15
+
+
+@cappa.command(timeout=2.5)
+@dataclass
+class Hanging:
+    async def __call__(self, dep: Annotated[None, cappa.Dep(hanging_dep)]):
+        return dep
+
+
+def test_command_timeout_cancels_dependency_resolution():
+    events.clear()
+    with pytest.raises(cappa.Exit) as e:
+        run(cappa.invoke_async(Hanging, argv=[], timeout=60))
+
+    assert e.value.code == 124
+    assert e.value.message == "Command timed out after 2.5s."
+    assert events == ["cancelled"]
+
+
+@dataclass
+class Root:
+    subcommand: cappa.Subcommands[Hanging | Sleep]
+
+
+def test_subcommand_timeout():
+    with pytest.raises(cappa.Exit) as e:
+        run(cappa.invoke_async(Root, argv=["hanging"]))
+    assert e.value.code == 124
+
+    result, _ = run(cappa.invoke_async(Root, argv=["sleep"]))
+    assert result == "dep"
+
+
+def test_teardown_timeout():
+    events.clear()
+    with pytest.raises(cappa.Exit) as e:
+        run(cappa.invoke_async(Sleep, argv=["10"], teardown_timeout=1))
+
+    assert e.value.code == 124
+    assert e.value.message == "Teardown timed out after 1s."
+    assert events == ["enter"]
+
+
+def test_timeout_teardown_grace():
+    events.clear()
+    with pytest.raises(cappa.Exit) as e:
+        run(cappa.invoke_async(Sleep, argv=[], timeout=30, teardown_timeout=1))
+
+    assert e.value.code == 124
+    assert e.value.message == "Command timed out after 30s."
+    assert events == ["enter"]
+
+
+@dataclass
+class RaisesTimeout:
+    async def __call__(self):
+        raise asyncio.TimeoutError()
+
+
+def test_command_timeout_error_propagates():
+    with pytest.raises(asyncio.TimeoutError):
+        run(cappa.invoke_async(RaisesTimeout, argv=[], timeout=30))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Union
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.trie import Trie
+from tests.utils import Backend, backends, parse, parse_completion
+
+
+@cappa.command(allow_abbrev=True)
+@dataclass
+class Args:
+    verbose: Annotated[bool, cappa.Arg(long=True)] = False
+    version: Annotated[bool, cappa.Arg(long=True)] = False
+    colour: Annotated[str, cappa.Arg(long=["--colour", "--color"])] = ""
+
+
+@backends
+def test_unique_prefix(backend: Backend):
+    assert parse(Args, "--verb", backend=backend) == Args(verbose=True)
+    assert parse(Args, "--vers", backend=backend) == Args(version=True)
+
+
+@backends
+def test_ambiguous_prefix(backend: Backend):
+    with pytest.raises(cappa.Exit) as e:
+        parse(Args, "--ver", backend=backend)
+    assert e.value.code == 2
+
+
+def test_prefix_of_aliases_of_one_option():
+    assert parse(Args, "--col=red", backend=None) == Args(colour="red")
+    assert parse(Args, "--col", "red", backend=None) == Args(colour="red")
+
+
+@dataclass
+class Strict:
+    verbose: Annotated[bool, cappa.Arg(long=True)] = False
+
+
+def test_disabled_by_default():
+    with pytest.raises(cappa.Exit) as e:
+        parse(Strict, "--verb", backend=None)
+    assert e.value.message == "Unrecognized arguments: --verb (Did you mean: --verbose)"
+
+
+@dataclass
+class Push:
+    force: Annotated[bool, cappa.Arg(long=True)] = False
+
+
+@dataclass
+class Pull:
+    pass
+
+
+@cappa.command(aliases=[cappa.Alias("st", deprecated=True)])
+@dataclass
+class Status:
+    pass
+
+
+@cappa.command(allow_abbrev=True)
+@dataclass
+class Git:
+    cmd: cappa.Subcommands[Union[Push, Pull, Status]]
+
+
+def test_subcommand_prefix():
+    assert parse(Git, "pus", "--force", backend=None) == Git(Push(force=True))
+    assert parse(Git, "sta", backend=None) == Git(Status())
+
+
+def test_ambiguous_subcommand_prefix():
+    with pytest.raises(cappa.Exit) as e:
+        parse(Git, "pu", backend=None)
+    assert "Invalid command 'pu'" in str(e.value.message)
+
+
+def test_subcommand_prefix_of_deprecated_alias(capsys: pytest.CaptureFixture[str]):
+    # `st` is itself a name, so is not an abbreviation of `status`.
+    assert parse(Git, "st", backend=None) == Git(Status())
+    assert "deprecated" in capsys.readouterr().err
+
+
+def test_completion_is_not_abbreviated():
+    assert str(parse_completion(Args, "--verb")).startswith("--verbose:")
+    assert parse_completion(Git, "pu") == "push:\npull:"
+
+
+def test_trie_first_match():
+    trie = Trie([("a", "-a"), ("bc", "-bc")])
+    assert trie.first_match("abc", 1) == "bc"
+    assert trie.first_match("b") is None
+    assert trie.first_match("x") is None
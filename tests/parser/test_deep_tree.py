@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Any, Optional
+
+from typing_extensions import Annotated
+
+import cappa
+from tests.utils import parse
+
+
+def deep_tree(depth: int) -> Any:
+    """Produce a chain of `depth` nested subcommands, `level0 > level1 > ...`.
+
+    The root propagates `--root`, and the middle level propagates `--middle`.
+    """
+    command: Any = dataclasses.make_dataclass(f"Level{depth}", [])
+    for level in reversed(range(depth)):
+        fields: list[Any] = [
+            (
+                "sub",
+                Annotated[Optional[command], cappa.Subcommand],
+                dataclasses.field(default=None),
+            )
+        ]
+        if level == 0:
+            root: Any = Annotated[int, cappa.Arg(long="--root", propagate=True)]
+            fields.insert(0, ("root", root, dataclasses.field(default=0)))
+        if level == depth // 2:
+            mid: Any = Annotated[int, cappa.Arg(long="--middle", propagate=True)]
+            fields.insert(0, ("mid", mid, dataclasses.field(default=0)))
+
+        command = dataclasses.make_dataclass(f"Level{level}", fields)
+        command = cappa.command(command, name=f"level{level}")
+    return command
+
+
+def test_deeply_nested_subcommands():
+    depth = 100
+    tree = deep_tree(depth)
+
+    argv = [f"level{level}" for level in range(1, depth + 1)]
+    result = parse(tree, *argv, "--root=1", "--middle=2")
+    assert result.root == 1
+
+    node = result
+    for _ in range(depth // 2):
+        node = node.sub
+    assert node.mid == 2
+
+    for _ in range(depth - depth // 2):
+        node = node.sub
+    assert node is not None
+
+
+def test_propagated_options_route_to_their_owner():
+    tree = deep_tree(4)
+
+    result = parse(tree, "level1", "--root=1", "level2", "level3", "--middle=3")
+    assert result.root == 1
+    assert result.sub.sub.mid == 3
+
+    # Later links (and levels above the owner) never see the middle level's option.
+    result = parse(tree, "level1", "--root=2")
+    assert result.root == 2
+    assert result.sub.sub is None
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Generator, Union
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa import argparse, parser
+from cappa.base import parse_command
+from cappa.types import ParseResult
+from tests.utils import invoke, invoke_async, parse, parse_completion
+
+events: list[str] = []
+
+
+class Client:
+    pass
+
+
+def create_client() -> Generator[Client, None, None]:
+    events.append("connect")
+    yield Client()
+    events.append("disconnect")
+
+
+@dataclass
+class Fetch:
+    source: str
+
+    def __call__(self, tool: Tool, client: Annotated[Client, cappa.Dep(create_client)]):
+        events.append(f"fetch {self.source} {tool.verbose} {id(client)}")
+        return "fetched"
+
+
+@dataclass
+class Publish:
+    target: str
+    force: Annotated[bool, cappa.Arg(long=True)] = False
+
+    def __call__(self, client: Annotated[Client, cappa.Dep(create_client)]):
+        events.append(f"publish {self.target} {self.force} {id(client)}")
+        return "published"
+
+
+@cappa.command(chain="+")
+@dataclass
+class Tool:
+    cmd: cappa.Subcommands[Union[Fetch, Publish]]
+    verbose: Annotated[bool, cappa.Arg(short=True)] = False
+
+
+def test_links_invoked_in_order():
+    events.clear()
+
+    result = invoke(Tool, "-v", "fetch", "a", "+", "publish", "b", "--force")
+    assert result == "published"
+
+    connect, fetch, publish, disconnect = events
+    assert connect == "connect"
+    assert fetch.startswith("fetch a True ")
+    assert publish.startswith("publish b True ")
+    assert disconnect == "disconnect"
+
+    # The dep is constructed once, and shared by both links.
+    assert fetch.split()[-1] == publish.split()[-1]
+
+
+def test_unchained():
+    events.clear()
+
+    result = invoke(Tool, "fetch", "a")
+    assert result == "fetched"
+    assert len(events) == 3
+
+
+def test_global_deps_resolved_once():
+    events.clear()
+
+    invoke(Tool, "fetch", "a", "+", "fetch", "b", deps=[create_client])
+    assert events.count("connect") == 1
+
+
+def test_invoke_async():
+    events.clear()
+
+    result = asyncio.run(invoke_async(Tool, "fetch", "a", "+", "publish", "b"))
+    assert result == "published"
+
+    fetch, publish = [e for e in events if e.startswith(("fetch", "publish"))]
+    assert fetch.split()[-1] == publish.split()[-1]
+
+
+def test_parse_returns_first_link():
+    result = parse(Tool, "fetch", "a", "+", "publish", "b")
+    assert result.cmd == Fetch("a")
+
+
+def test_invalid_link_aborts_chain(capsys: pytest.CaptureFixture[str]):
+    events.clear()
+
+    with pytest.raises(cappa.Exit) as e:
+        invoke(Tool, "fetch", "a", "+", "publish")
+    assert e.value.code == 2
+    assert events == []
+
+    with pytest.raises(cappa.Exit) as e:
+        invoke(Tool, "fetch", "a", "+")
+    assert e.value.code == 2
+    assert "A command is required" in str(e.value.message)
+
+
+def test_completion_of_final_link():
+    result = parse_completion(Tool, "fetch", "a", "+", "pu")
+    assert result == "publish:"
+
+    result = parse_completion(Tool, "fetch", "a", "+", "publish", "b", "--f")
+    assert result is not None
+    assert result.startswith("--force:")
+
+
+def test_argparse_unsupported():
+    with pytest.raises(cappa.Exit) as e:
+        parse(Tool, "fetch", "a", backend=argparse.backend)
+    assert "only supported by the native cappa parser" in str(e.value.message)
+
+
+@cappa.command(chain="+")
+@dataclass
+class NoSubcommands:
+    value: str
+
+
+def test_requires_subcommands():
+    with pytest.raises(ValueError) as e:
+        parse(NoSubcommands, "a")
+    assert "`chain` requires the command to have subcommands" in str(e.value)
+
+
+def default_name() -> str:
+    events.append("default")
+    return "default"
+
+
+@cappa.command(chain="+")
+@dataclass
+class Defaulted:
+    cmd: cappa.Subcommands[Union[Fetch, Publish]]
+    name: Annotated[str, cappa.Arg(long=True, default=cappa.ValueFrom(default_name))]
+
+
+def test_root_mapped_once():
+    events.clear()
+
+    argv = ["fetch", "a", "+", "publish", "b", "+", "fetch", "c"]
+    result: ParseResult[Defaulted, Any] = parse_command(Defaulted, argv=argv)
+    assert len(result.chain) == 2
+    assert events == ["default"]
+
+
+def test_link_root_options():
+    events.clear()
+
+    argv = ["--name", "first", "fetch", "a", "+", "--name", "second", "publish", "b"]
+    argv += ["+", "fetch", "c"]
+    result: ParseResult[Defaulted, Any] = parse_command(Defaulted, argv=argv)
+
+    # Each link's own root options apply to it, and otherwise those of the first link.
+    names = [link.instance.call().name for link in [result, *result.chain]]
+    assert names == ["first", "second", "first"]
+    assert events == []
+
+
+def test_split_chain_stops_at_double_dash():
+    command = cappa.collect(Tool)
+    assert parser.split_chain(command, ["fetch", "a", "+", "fetch", "--", "+"]) == [
+        ["fetch", "a"],
+        ["fetch", "--", "+"],
+    ]
+
+    events.clear()
+    invoke(Tool, "fetch", "a", "+", "publish", "--", "+")
+    assert events[2].startswith("publish + False ")
@@ -47,3 +47,65 @@ def test_no_possible_values():
 
     expected_message = "Invalid command 'bad'"
     assert expected_message == e.value.message
+
+
+@cappa.command(
+    aliases=[cappa.Alias("co"), cappa.Alias("chk", hidden=True)],
+)
+@dataclass
+class Checkout:
+    pass
+
+
+@cappa.command(aliases=[cappa.Alias("ci", deprecated=True)])
+@dataclass
+class Commit:
+    pass
+
+
+@dataclass
+class Git:
+    subcommand: cappa.Subcommands[Union[Checkout, Commit]]
+
+
+def test_suggests_mistyped_names():
+    with pytest.raises(cappa.Exit) as e:
+        parse(Git, "chekcout", backend=None)
+
+    expected_message = (
+        "Invalid command 'chekcout' (Did you mean: "
+        "[cappa.subcommand]checkout[/cappa.subcommand])"
+    )
+    assert e.value.message == expected_message
+
+
+def test_suggests_prefixes_before_mistyped_names():
+    with pytest.raises(cappa.Exit) as e:
+        parse(Git, "com", backend=None)
+
+    # "commit" shares the prefix, while "co" is within an edit.
+    expected_message = (
+        "Invalid command 'com' (Did you mean: "
+        "[cappa.subcommand]commit[/cappa.subcommand], "
+        "[cappa.subcommand]co[/cappa.subcommand])"
+    )
+    assert e.value.message == expected_message
+
+
+def test_deprecated_aliases_are_suggested():
+    with pytest.raises(cappa.Exit) as e:
+        parse(Git, "cj", backend=None)
+
+    expected_message = (
+        "Invalid command 'cj' (Did you mean: "
+        "[cappa.subcommand]co[/cappa.subcommand], "
+        "[cappa.subcommand]ci[/cappa.subcommand])"
+    )
+    assert e.value.message == expected_message
+
+
+def test_hidden_aliases_are_not_suggested():
+    with pytest.raises(cappa.Exit) as e:
+        parse(Git, "chkk", backend=None)
+
+    assert e.value.message == "Invalid command 'chkk'"
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generator
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.repl import Shell
+
+events: list[str] = []
+
+
+class Pool:
+    pass
+
+
+def create_pool() -> Generator[Pool, None, None]:
+    events.append("connect")
+    yield Pool()
+    events.append("disconnect")
+
+
+@dataclass
+class Query:
+    """Run a query."""
+
+    sql: str
+    limit: Annotated[int, cappa.Arg(long=True, choices=["1", "10"])] = 10
+
+    def __call__(self, pool: Annotated[Pool, cappa.Dep(create_pool)]):
+        if self.sql == "crash":
+            raise RuntimeError("boom")
+        events.append(f"{self.sql}:{self.limit}:{id(pool)}")
+
+
+@dataclass
+class Load:
+    path: Annotated[str, cappa.Arg(long=True)] = ""
+
+    def __call__(self):
+        events.append(f"load:{self.path}")
+
+
+@dataclass
+class Root:
+    subcommand: cappa.Subcommands[Query | Load]
+
+
+def run_shell(text: str, capsys: pytest.CaptureFixture[str]) -> tuple[str, str]:
+    cappa.shell(Root, deps=[create_pool], input=io.StringIO(text), color=False)
+    out = capsys.readouterr()
+    return out.out, out.err
+
+
+def test_runs_each_line(capsys: pytest.CaptureFixture[str]):
+    events.clear()
+    run_shell("query one\n\nquery 'two words' --limit 1\nload --path x\n", capsys)
+
+    connect, first, second, load, disconnect = events
+    assert connect == "connect"
+    assert first.startswith("one:10:")
+    assert second.startswith("two words:1:")
+    assert load == "load:x"
+    assert disconnect == "disconnect"
+
+
+def test_deps_shared_across_lines(capsys: pytest.CaptureFixture[str]):
+    events.clear()
+    run_shell("query a\nquery b\n", capsys)
+
+    assert events.count("connect") == 1
+    assert events[1].split(":")[-1] == events[2].split(":")[-1]
+
+
+def test_errors_do_not_end_session(capsys: pytest.CaptureFixture[str]):
+    events.clear()
+    _, err = run_shell(
+        "query --limit 5 x\nquery crash\nquery 'unclosed\nquery ok\n", capsys
+    )
+
+    assert "Invalid choice: '5'" in err
+    assert "RuntimeError: boom" in err
+    assert "Invalid input" in err
+    assert events[-2].startswith("ok:")
+
+
+def test_help_does_not_end_session(capsys: pytest.CaptureFixture[str]):
+    events.clear()
+    out, _ = run_shell("--help\nquery ok\n", capsys)
+
+    assert "Usage: root" in out
+    assert events[-2].startswith("ok:")
+
+
+def test_exit(capsys: pytest.CaptureFixture[str]):
+    events.clear()
+    run_shell("query a\nexit\nquery b\n", capsys)
+
+    assert events == ["connect", events[1], "disconnect"]
+
+
+@pytest.fixture
+def session() -> Shell:
+    command = cappa.collect(Root, completion=False)
+    return Shell(command, cappa.Output())
+
+
+def test_complete_subcommands(session: Shell):
+    assert session.complete("") == ["query", "load"]
+    assert session.complete("q") == ["query"]
+
+
+def test_complete_options(session: Shell):
+    assert session.complete("query --l") == ["--limit"]
+    assert session.complete("query x --limit ") == ["1", "10"]
+
+
+def test_complete_files(
+    session: Shell, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data.csv").write_text("")
+
+    assert session.complete("load --path da") == ["data.csv"]
+
+
+def create_client(
+    pool: Annotated[Pool, cappa.Dep(create_pool)],
+) -> Generator[str, None, None]:
+    events.append("open-client")
+    yield f"client:{id(pool)}"
+    events.append("close-client")
+
+
+def create_cursor(query: cappa.Self[Fetch]) -> str:
+    events.append(f"cursor:{query.sql}")
+    return query.sql
+
+
+@dataclass
+class Fetch:
+    sql: str
+
+    def __call__(
+        self,
+        client: Annotated[str, cappa.Dep(create_client)],
+        cursor: Annotated[str, cappa.Dep(create_cursor)],
+    ):
+        events.append(f"fetch:{cursor}:{client}")
+
+
+def test_command_deps_shared_across_lines(capsys: pytest.CaptureFixture[str]):
+    events.clear()
+    cappa.shell(Fetch, input=io.StringIO("a\nb\n"), color=False)
+
+    connect, open_client, cursor_a, fetch_a, cursor_b, fetch_b, *teardown = events
+    assert (connect, open_client) == ("connect", "open-client")
+
+    # The client (and its pool) is shared by both lines, and torn down with the session.
+    assert fetch_a.startswith("fetch:a:client:")
+    assert fetch_b == fetch_a.replace(":a:", ":b:")
+    assert teardown == ["close-client", "disconnect"]
+
+    # Whereas the cursor depends upon each line's command instance.
+    assert (cursor_a, cursor_b) == ("cursor:a", "cursor:b")
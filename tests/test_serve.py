@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+
+if sys.platform == "win32":  # pragma: no cover
+    pytest.skip(
+        "Unix domain sockets are unavailable on windows.", allow_module_level=True
+    )
+
+from cappa.serve import (
+    CommandServer,
+    ForkingCommandServer,
+    create_server,
+    request,
+    write_client,
+)
+
+requests_handled: list[str] = []
+
+
+class Pool:
+    instances = 0
+
+    def __init__(self):
+        Pool.instances += 1
+
+
+def get_pool() -> Pool:
+    raise NotImplementedError()
+
+
+@dataclass
+class Echo:
+    value: str = "-"
+    greeting: Annotated[str, cappa.Arg(long=True, default=cappa.Env("GREETING"))] = (
+        "hello"
+    )
+    code: Annotated[int, cappa.Arg(long=True)] = 0
+
+    def __call__(self, pool: Annotated[Pool, cappa.Dep(get_pool)]):
+        if self.code:
+            raise cappa.Exit("failed!", code=self.code)
+
+        if self.value == "-":
+            value = sys.stdin.read().strip()
+        elif self.value == "crash":
+            raise RuntimeError("boom")
+        else:
+            value = Path(self.value).read_text().strip()
+
+        requests_handled.append(value)
+        print(f"{self.greeting} {value} {id(pool)}")
+
+
+def subcommand_target():
+    print("subcommand")
+
+
+@cappa.command(invoke="tests.test_serve.subcommand_target")
+@dataclass
+class Sub: ...
+
+
+@dataclass
+class Tree:
+    sub: cappa.Subcommands[Sub]
+
+
+@pytest.fixture
+def socket_path() -> Iterator[Path]:
+    # Unix socket paths are length-limited, so avoid potentially long `tmp_path`s.
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory) / "cli.sock"
+
+
+@pytest.fixture(params=[False, True], ids=["inline", "fork"])
+def server(request: pytest.FixtureRequest, socket_path: Path):
+    server = create_server(
+        Echo,
+        socket_path,
+        deps={get_pool: Pool()},
+        backend=cappa.backend,
+        color=False,
+        fork=request.param,
+    )
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+class Client:
+    def __init__(self, socket_path: Path, tmp_path: Path):
+        self.socket_path = socket_path
+        self.tmp_path = tmp_path
+
+    def __call__(
+        self, *argv: str, stdin: str = "", env: dict[str, str] | None = None
+    ) -> tuple[int, str, str]:
+        stdin_path = self.tmp_path / "stdin"
+        stdin_path.write_text(stdin)
+
+        with open(stdin_path) as stdin_file, open(
+            self.tmp_path / "stdout", "w+"
+        ) as stdout, open(self.tmp_path / "stderr", "w+") as stderr:
+            code = request(
+                self.socket_path,
+                list(argv),
+                cwd=str(self.tmp_path),
+                env=env or {},
+                stdin=stdin_file,
+                stdout=stdout,
+                stderr=stderr,
+            )
+            stdout.seek(0)
+            stderr.seek(0)
+            return code, stdout.read(), stderr.read()
+
+
+@pytest.fixture
+def client(server: CommandServer, socket_path: Path, tmp_path: Path):
+    return Client(socket_path, tmp_path)
+
+
+def test_forwards_stdio_env_and_cwd(client: Client, tmp_path: Path):
+    code, stdout, _ = client(stdin="from stdin\n", env={"GREETING": "hi"})
+    assert code == 0
+    assert stdout.startswith("hi from stdin ")
+
+    (tmp_path / "file.txt").write_text("from file")
+    code, stdout, _ = client("file.txt", "--greeting", "hey")
+    assert code == 0
+    assert stdout.startswith("hey from file ")
+
+
+def test_deps_shared_between_requests(client: Client):
+    instances = Pool.instances
+    _, first, _ = client(stdin="a")
+    _, second, _ = client(stdin="b")
+
+    assert first.split()[-1] == second.split()[-1]
+    assert Pool.instances == instances
+
+
+def test_exit_codes(client: Client):
+    code, _, stderr = client("--code", "3")
+    assert code == 3
+    assert "failed!" in stderr
+
+    code, _, stderr = client("--code", "not-a-number")
+    assert code == 2
+    assert "Invalid value for '--code'" in stderr
+
+    code, stdout, _ = client("--help")
+    assert code == 0
+    assert "Usage: echo" in stdout
+
+
+def test_unhandled_exception(client: Client):
+    code, _, stderr = client("crash")
+    assert code == 1
+    assert "RuntimeError: boom" in stderr
+
+    # The server survives the failed request.
+    code, stdout, _ = client(stdin="still alive")
+    assert code == 0
+    assert "still alive" in stdout
+
+
+def test_server_process_state_restored(client: Client):
+    cwd = os.getcwd()
+    environ = dict(os.environ)
+    streams = (sys.stdin, sys.stdout, sys.stderr)
+
+    client(stdin="x", env={"GREETING": "hi"})
+
+    assert os.getcwd() == cwd
+    assert dict(os.environ) == environ
+    assert (sys.stdin, sys.stdout, sys.stderr) == streams
+
+
+def test_fork_isolates_requests(server: CommandServer, client: Client):
+    requests_handled.clear()
+    code, _, _ = client(stdin="isolated")
+    assert code == 0
+
+    if isinstance(server, ForkingCommandServer):
+        assert requests_handled == []
+    else:
+        assert requests_handled == ["isolated"]
+
+
+def test_fork_warms_and_freezes(socket_path: Path):
+    with patch("cappa.invoke.base.resolve_callable_reference") as resolve, patch(
+        "gc.freeze"
+    ) as freeze, patch("gc.unfreeze") as unfreeze:
+        server = create_server(Tree, socket_path, fork=True)
+        server.server_close()
+
+    resolve.assert_called_once_with("tests.test_serve.subcommand_target")
+    freeze.assert_called_once_with()
+    unfreeze.assert_called_once_with()
+
+
+def test_standalone_client(server: CommandServer, socket_path: Path, tmp_path: Path):
+    script = write_client(tmp_path / "cli", socket_path)
+    (tmp_path / "file.txt").write_text("from file")
+
+    # The client is run with `-I -S`, so it cannot import cappa (or anything but the
+    # standard library) at all.
+    result = subprocess.run(  # noqa: S603
+        [str(script), "file.txt", "--greeting", "hey"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0
+    assert result.stdout.startswith("hey from file ")
+
+    import cappa.serve_client
+
+    result = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-I",
+            "-S",
+            cappa.serve_client.__file__,
+            str(socket_path),
+            "--code",
+            "3",
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 3
+    assert "failed!" in result.stderr
+
+
+def test_client_payload_is_json():
+    from cappa.serve_client import _dumps  # pyright: ignore[reportPrivateUsage]
+
+    payload = {
+        "argv": ['"quoted"', "back\\slash", "new\nline\x00\x7f", "é😀"],
+        "cwd": "/home/user",
+        "env": {"UNDECODABLE": "\udcff", "EMPTY": ""},
+    }
+    assert json.loads(_dumps(payload).encode()) == payload
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import random
+import string
+from dataclasses import dataclass
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.suggest import SuggestionIndex, damerau_levenshtein, suggest
+from tests.utils import parse
+
+
+@pytest.mark.parametrize(
+    "a, b, distance",
+    [
+        ("", "", 0),
+        ("", "abc", 3),
+        ("abc", "abc", 0),
+        ("abc", "abd", 1),
+        ("abc", "acb", 1),
+        ("commit", "comit", 1),
+        ("ca", "abc", 2),
+    ],
+)
+def test_damerau_levenshtein(a: str, b: str, distance: int):
+    assert damerau_levenshtein(a, b) == distance
+    assert damerau_levenshtein(b, a) == distance
+
+
+def test_index_matches_linear_scan():
+    rng = random.Random(0)  # noqa: S311
+    names = [
+        "".join(
+            rng.choice(string.ascii_lowercase[:6]) for _ in range(rng.randint(1, 8))
+        )
+        for _ in range(500)
+    ]
+    index = SuggestionIndex(names)
+
+    for query in names[:20]:
+        for max_distance in (1, 2):
+            expected = {
+                n for n in names if damerau_levenshtein(query, n) <= max_distance
+            }
+            assert set(index.search(query, max_distance)) == expected
+
+
+def test_index_orders_by_distance_then_position():
+    index = SuggestionIndex(["stash", "stats", "status", "start"])
+    assert index.search("statsu", 2) == ["stats", "status", "stash"]
+
+
+def test_suggest_scales_distance_with_length():
+    index = SuggestionIndex(["--verbose", "--version", "-v"])
+    assert suggest("--verbos", [], index) == ["--verbose"]
+    assert suggest("-x", [], index) == ["-v"]
+
+
+@dataclass
+class Args:
+    verbose: Annotated[bool, cappa.Arg(long=True)] = False
+    dry_run: Annotated[bool, cappa.Arg(long=True)] = False
+
+
+def test_suggests_mistyped_options():
+    with pytest.raises(cappa.Exit) as e:
+        parse(Args, "--dyr-run", backend=None)
+
+    assert (
+        e.value.message == "Unrecognized arguments: --dyr-run (Did you mean: --dry-run)"
+    )
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional, TextIO, Union
+from unittest.mock import patch
+
+import pytest
+from typing_extensions import Annotated
+
+import cappa
+from cappa.validate import Diagnostic
+
+events: list[str] = []
+
+
+def record_default() -> str:
+    events.append("default")
+    return "from-default"
+
+
+def even(value: str) -> int:
+    result = int(value)
+    if result % 2:
+        raise ValueError("must be even")
+    return result
+
+
+@dataclass
+class Add:
+    name: str
+    count: Annotated[int, cappa.Arg(long=True, parse=even)] = 2
+    tags: Annotated[List[int], cappa.Arg(long=True)] = field(default_factory=lambda: [])
+    old: Annotated[bool, cappa.Arg(long=True, deprecated="use --new")] = False
+
+    def __call__(self):  # pragma: no cover
+        events.append("invoked")
+
+
+@dataclass
+class Cat:
+    file: Annotated[Optional[TextIO], cappa.Arg(long=True)] = None
+
+
+@cappa.command(name="tool")
+@dataclass
+class Tool:
+    sub: cappa.Subcommands[Union[Add, Cat]]
+    token: Annotated[
+        str, cappa.Arg(long=True, default=cappa.ValueFrom(record_default))
+    ] = ""
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    events.clear()
+
+
+def test_valid():
+    result = cappa.validate(Tool, ["add", "foo", "--count", "4", "--tags", "1"])
+    assert result.ok
+    assert result.diagnostics == ()
+
+    # Defaults are never evaluated, and nothing is invoked.
+    assert events == []
+
+
+def test_parse_errors():
+    result = cappa.validate(Tool, ["remove"])
+    assert not result.ok
+    (diagnostic,) = result.diagnostics
+    assert diagnostic.message == "Invalid command 'remove'"
+    assert diagnostic.prog == "tool"
+    assert diagnostic.value == "remove"
+
+    result = cappa.validate(Tool, ["add"])
+    assert [d.message for d in result.diagnostics] == [
+        "Option 'name' requires an argument"
+    ]
+
+
+def test_value_errors():
+    result = cappa.validate(Tool, ["add", "foo", "--count", "3", "--tags", "x"])
+    assert result.diagnostics == (
+        Diagnostic(
+            "Invalid value for '--count': must be even",
+            prog="tool add",
+            arg="--count",
+            value="3",
+        ),
+        Diagnostic(
+            "Invalid value for '--tags': invalid literal for int() with base 10: 'x'",
+            prog="tool add",
+            arg="--tags",
+            value=["x"],
+        ),
+    )
+
+
+def test_warnings(capsys: Any):
+    result = cappa.validate(Tool, ["add", "foo", "--old"])
+    assert result.ok
+    assert result.diagnostics == (
+        Diagnostic(
+            "Option `--old` is deprecated: use --new", prog="tool add", level="warning"
+        ),
+    )
+    assert capsys.readouterr().err == ""
+
+
+def test_meta_actions_are_not_executed(capsys: Any):
+    result = cappa.validate(Tool, ["add", "--help"])
+    assert result.ok
+    assert capsys.readouterr().out == ""
+
+
+def test_files_are_not_opened(tmp_path: Path):
+    missing = str(tmp_path / "missing.txt")
+    assert cappa.validate(Tool, ["cat", "--file", missing]).ok
+    assert not os.path.exists(missing)
+
+
+def test_config_is_not_read(tmp_path: Path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"host": "config"}))
+
+    @dataclass
+    class Remote:
+        host: Annotated[str, cappa.Arg(long=True)]
+        port: Annotated[int, cappa.Arg(long=True)] = 0
+
+    command = cappa.Command(Remote, config=cappa.ConfigSource(path))
+    with patch.object(cappa.ConfigSource, "load") as load:
+        for _ in range(3):
+            assert cappa.validate(command, ["--port", "1"]).ok
+
+    assert load.call_count == 0
+
+
+def test_validate_many():
+    argvs = [["add", "a"], ["add", "b", "--count", "1"], ["cat"], ["nope"]]
+    results = list(cappa.validate_many(Tool, iter(argvs)))
+    assert [r.argv for r in results] == argvs
+    assert [r.ok for r in results] == [True, False, True, False]
+
+
+def test_validate_many_jobs():
+    argvs = [["add", str(i), "--count", str(i)] for i in range(10)]
+    results = list(cappa.validate_many(Tool, argvs, jobs=2, chunksize=3))
+    assert [r.argv for r in results] == argvs
+    assert [r.ok for r in results] == [i % 2 == 0 for i in range(10)]